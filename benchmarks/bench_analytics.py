@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Compare ResultFrame aggregations with looping over PolicyResult objects.
+
+Usage:
+    python benchmarks/bench_analytics.py --rows 1000000
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+from tavoai.sdk import PolicyResult
+from tavoai.sdk.analytics import ResultFrame, HAS_NUMPY
+
+POLICIES = [f"policy_{i}" for i in range(20)]
+CATEGORIES = ["pii", "advice", "toxicity", "jailbreak", "medical", "legal"]
+
+
+def timed(label, function):
+    """Run a function and print its duration."""
+    started = time.perf_counter()
+    result = function()
+    print(f"{label:<40} {time.perf_counter() - started:>8.3f} s")
+    return result
+
+
+def main():
+    """Run the analytics benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    rows = []
+    for i in range(args.rows):
+        allowed = rng.random() < 0.8
+        reasons = [] if allowed else [
+            {"category": category, "reason": category} for category in rng.sample(CATEGORIES, rng.randint(1, 2))
+        ]
+        rows.append((rng.choice(POLICIES), PolicyResult(allowed, reasons), f"req-{i}", float(i)))
+    
+    print(f"{args.rows} rows, NumPy {'enabled' if HAS_NUMPY else 'not installed'}")
+    
+    def build():
+        frame = ResultFrame()
+        for policy_name, result, request_id, timestamp in rows:
+            frame.append_result(policy_name, result, request_id, timestamp)
+        return frame
+    
+    frame = timed("ResultFrame build", build)
+    
+    def loop_counts():
+        evaluations, rejected, categories = Counter(), Counter(), Counter()
+        for policy_name, result, _, _ in rows:
+            evaluations[policy_name] += 1
+            if not result.allowed:
+                rejected[policy_name] += 1
+            for reason in result.rejection_reasons:
+                categories[(policy_name, reason["category"])] += 1
+        return evaluations, rejected, categories
+    
+    timed("loop over PolicyResult objects", loop_counts)
+    timed("ResultFrame.counts_by_policy", frame.counts_by_policy)
+    timed("ResultFrame.category_counts(by_policy)", lambda: frame.category_counts(by_policy=True))
+    timed("ResultFrame.rejection_timeline", lambda: frame.rejection_timeline(3600))
+    timed("ResultFrame.diff", lambda: frame.diff(POLICIES[0], POLICIES[1]))
+
+
+if __name__ == "__main__":
+    main()
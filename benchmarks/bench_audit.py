@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Benchmark AuditSink throughput with the JSONL and SQLite writers.
+
+Each run reports the submission throughput seen by callers, then the
+end-to-end rate including the time to write every queued record.
+
+Usage:
+    python benchmarks/bench_audit.py --concurrency 1 8 --save audit_baseline.json
+    python benchmarks/bench_audit.py --concurrency 1 8 --compare audit_baseline.json
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from tavoai.sdk.audit import AuditSink, JsonlAuditWriter, SqliteAuditWriter
+from tavoai.sdk.benchmark import run_benchmark, save_results, load_results, compare_results
+
+WRITERS = {
+    "jsonl": lambda directory: JsonlAuditWriter(os.path.join(directory, "audit.jsonl")),
+    "sqlite": lambda directory: SqliteAuditWriter(os.path.join(directory, "audit.db")),
+}
+
+
+def audit_record(i):
+    """Return a representative audit record."""
+    return {
+        "timestamp": time.time(),
+        "request_id": f"req-{i}",
+        "policy": "financial_advice_input",
+        "content_type": "input",
+        "allowed": i % 10 != 0,
+        "rejection_reasons": [] if i % 10 else [{"category": "advice", "reason": "Specific investment advice"}],
+        "degraded_mode": None,
+        "error": None,
+    }
+
+
+def main():
+    """Run the audit sink benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--operations", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--writers", nargs="+", choices=sorted(WRITERS), default=sorted(WRITERS))
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare results with this baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+    
+    results = []
+    for writer_name in args.writers:
+        for concurrency in args.concurrency:
+            with tempfile.TemporaryDirectory() as directory:
+                sink = AuditSink(
+                    WRITERS[writer_name](directory),
+                    max_queue_size=args.operations,
+                    batch_size=args.batch_size,
+                    overflow="block"
+                )
+                started = time.perf_counter()
+                result = run_benchmark(
+                    f"audit.record[{writer_name}]",
+                    lambda i: sink.record(audit_record(i)),
+                    concurrency=concurrency,
+                    operations=args.operations,
+                    warmup=0
+                )
+                sink.flush()
+                elapsed = time.perf_counter() - started
+                stats = sink.stats()
+                sink.close()
+            
+            print(result)
+            print(f"{'':<40} {stats['written'] / elapsed:>10.1f} records/s written  dropped {stats['dropped']}")
+            results.append(result)
+    
+    if args.save:
+        save_results(results, args.save)
+    
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), results, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Benchmark TavoAIClient and TavoAIGuardrail against the in-process stub server.
+
+Usage:
+    python benchmarks/bench_client.py --concurrency 1 8 32 --save baseline.json
+    python benchmarks/bench_client.py --concurrency 1 8 32 --compare baseline.json
+"""
+
+import argparse
+import logging
+import sys
+
+from tavoai.sdk import TavoAIClient, TavoAIGuardrail
+from tavoai.sdk.benchmark import run_benchmark, save_results, load_results, compare_results
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+
+
+def build_scenarios(server_url, micro_batching):
+    """Return (name, client, operation) tuples to benchmark."""
+    client = TavoAIClient(
+        api_base_url=server_url,
+        log_level=logging.WARNING,
+        micro_batching=micro_batching
+    )
+    guardrail = TavoAIGuardrail(client=client, metadata={"jurisdiction": "US"})
+    
+    @guardrail("bench_input", "bench_output")
+    def answer(query):
+        return f"Answer to: {query}"
+    
+    suffix = "[batched]" if micro_batching else ""
+    return client, [
+        (
+            f"client.evaluate_input{suffix}",
+            lambda i: client.evaluate_input(f"What is question {i}?", "bench_input")
+        ),
+        (
+            f"guardrail{suffix}",
+            lambda i: answer(f"What is question {i}?")
+        ),
+    ]
+
+
+def main():
+    """Run the client benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="stub server latency per evaluation")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub evaluations failing")
+    parser.add_argument("--micro-batching", action="store_true", help="also benchmark micro-batched clients")
+    parser.add_argument("--trace-memory", action="store_true", help="trace allocations (slows runs down)")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare results with this baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+    
+    policy = StubPolicy(latency=args.latency_ms / 1000, error_rate=args.error_rate)
+    results = []
+    
+    with StubPolicyServer(default=policy) as server:
+        for micro_batching in ([False, True] if args.micro_batching else [False]):
+            client, scenarios = build_scenarios(server.url, micro_batching)
+            for name, operation in scenarios:
+                for concurrency in args.concurrency:
+                    result = run_benchmark(
+                        name,
+                        operation,
+                        concurrency=concurrency,
+                        operations=args.operations,
+                        trace_memory=args.trace_memory
+                    )
+                    print(result)
+                    results.append(result)
+            client.close()
+    
+    if args.save:
+        save_results(results, args.save)
+    
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), results, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
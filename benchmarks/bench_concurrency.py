@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Show adaptive concurrency converging as the stub server's capacity changes.
+
+The stub server serves `capacity` requests at once, queues up to
+`--max-queue` more and rejects the rest with HTTP 503. Load comes from
+`--threads` callers evaluating in a loop. For each capacity phase, the
+benchmark prints the limiter's limit, throughput, latency percentiles
+and errors, for a client with a fixed concurrency and an adaptive one.
+
+Usage:
+    python benchmarks/bench_concurrency.py --capacities 16 4 24 --phase-seconds 5
+"""
+
+import argparse
+import logging
+import threading
+import time
+
+from tavoai.sdk import TavoAIClient
+from tavoai.sdk.benchmark import BenchmarkResult
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+
+
+def run_phase(client, threads, seconds):
+    """Evaluate from `threads` callers for `seconds`; return latencies and errors."""
+    stop = time.monotonic() + seconds
+    latencies = [[] for _ in range(threads)]
+    errors = [0] * threads
+    
+    def worker(slot):
+        i = 0
+        while time.monotonic() < stop:
+            started = time.perf_counter()
+            try:
+                client.evaluate_input(f"question {slot}-{i}", "bench_input")
+                latencies[slot].append(time.perf_counter() - started)
+            except Exception:
+                errors[slot] += 1
+            i += 1
+    
+    workers = [threading.Thread(target=worker, args=(slot,), daemon=True) for slot in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return [latency for timings in latencies for latency in timings], sum(errors)
+
+
+def main():
+    """Run the adaptive concurrency benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--capacities", type=int, nargs="+", default=[16, 4, 24])
+    parser.add_argument("--phase-seconds", type=float, default=5.0)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="stub server latency per request")
+    parser.add_argument("--max-queue", type=int, default=16, help="requests queued before the stub rejects")
+    args = parser.parse_args()
+    
+    policy = StubPolicy(latency=args.latency_ms / 1000)
+    for adaptive in (False, True):
+        print("adaptive concurrency" if adaptive else "fixed concurrency")
+        with StubPolicyServer(default=policy, capacity=args.capacities[0], max_queue=args.max_queue) as server:
+            client = TavoAIClient(
+                api_base_url=server.url,
+                log_level=logging.CRITICAL,
+                pool_maxsize=args.threads,
+                adaptive_concurrency=adaptive,
+                max_concurrency=args.threads
+            )
+            for capacity in args.capacities:
+                server.capacity = capacity
+                phase_started = time.time()
+                latencies, errors = run_phase(client, args.threads, args.phase_seconds)
+                result = BenchmarkResult(f"capacity={capacity}", args.threads, latencies, errors, args.phase_seconds)
+                if adaptive:
+                    stats = client.stats()["concurrency"]
+                    limits = [limit for t, limit in stats["history"] if t >= phase_started] or [stats["limit"]]
+                    print(f"  limit {stats['limit']:>3} (phase range {min(limits)}-{max(limits)})  {result}")
+                else:
+                    print(f"  limit {args.threads:>3}  {result}")
+            client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Track the import-time cost of the TavoAI SDK with `python -X importtime`.
+
+Usage:
+    python benchmarks/bench_import.py --save import_baseline.json
+    python benchmarks/bench_import.py --compare import_baseline.json
+"""
+
+import argparse
+import json
+import sys
+
+from tavoai.sdk.benchmark import measure_import_time
+
+STATEMENTS = [
+    "import tavoai.sdk",
+    "from tavoai.sdk import TavoAIClient",
+    "from tavoai.sdk import TavoAIClient; TavoAIClient()",
+    "from tavoai.sdk import TavoAIGuardrail",
+]
+
+
+def main():
+    """Run the import-time benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare results with this baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    
+    results = []
+    for statement in STATEMENTS:
+        result = measure_import_time(statement, runs=args.runs)
+        results.append(result)
+        slowest = ", ".join(
+            f"{entry['module']} {entry['cumulative_ms']:.1f} ms" for entry in result["slowest_modules"][:3]
+        )
+        print(f"{statement:<55} {result['import_ms']:>7.2f} ms  ({slowest})")
+    
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {entry["statement"]: entry for entry in json.load(f)}
+        regressions = 0
+        for result in results:
+            previous = baseline.get(result["statement"])
+            if previous and result["import_ms"] > previous["import_ms"] * (1 + args.tolerance):
+                regressions += 1
+                print(
+                    f"REGRESSION {result['statement']}: {result['import_ms']:.2f} ms "
+                    f"(baseline {previous['import_ms']:.2f} ms)"
+                )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
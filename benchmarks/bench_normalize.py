@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Measure how content normalization and near-duplicate reuse extend cache hit rates.
+
+A synthetic workload draws prompts from a few templates, filled with
+random user names, order numbers and e-mail addresses, with random
+whitespace, casing and occasional one-word edits. For each configuration
+the benchmark prints the share of evaluations answered without the policy
+server, the server requests made, and the verdicts that differ from what
+the server would have answered for the original content (the stub policy
+rejects prompts mentioning a password).
+
+Usage:
+    python benchmarks/bench_normalize.py --operations 5000 --thresholds 0.85 0.9 0.95
+"""
+
+import argparse
+import logging
+import random
+
+from tavoai.sdk import TavoAIClient
+from tavoai.sdk.cache import VerdictCache
+from tavoai.sdk.normalize import COMMON_SLOTS, ContentNormalizer, NearDuplicateIndex
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+from tavoai.sdk.transport import InMemoryTransport
+
+TEMPLATES = [
+    "Hi, I am {name} and my order {number} has not arrived yet. Could you check the shipping status, "
+    "tell me when it is expected to reach {email}'s address, and whether I can still change the delivery "
+    "slot to an evening window because nobody is at home during the day this week",
+    "Please summarize the support history of customer {name} ({email}) for the last six months, highlight "
+    "every complaint about billing or refunds, list the tickets that are still open together with their "
+    "owners, and suggest how we should follow up on order {number} before the renewal call",
+    "I forgot the password of the account registered with {email}; my name is {name} and my last order was "
+    "{number}. Can you reset the password for me and send the new one in this chat so that I can log in "
+    "again before the sale ends tonight",
+]
+NAMES = ["Alice Martin", "Bob Chen", "Carla Diaz", "Dev Patel", "Emma Novak", "Femi Adeyemi"]
+EDITS = [("Could you", "Can you"), ("Please", "Kindly"), ("tonight", "today"), ("every", "each")]
+
+
+def is_allowed(content):
+    """Verdict of the stub policy."""
+    return "password" not in content.lower()
+
+
+def workload(operations, edit_rate, seed):
+    """Generate prompts of the synthetic workload."""
+    rng = random.Random(seed)
+    for _ in range(operations):
+        name = rng.choice(NAMES)
+        prompt = rng.choice(TEMPLATES).format(
+            name=name,
+            number=rng.randrange(10000, 99999),
+            email=name.split()[0].lower() + "@example.com"
+        )
+        if rng.random() < edit_rate:
+            prompt = prompt.replace(*rng.choice(EDITS))
+        if rng.random() < 0.5:
+            prompt = "  " + prompt.replace(" ", "  ", rng.randrange(1, 4)) + "\n"
+        if rng.random() < 0.2:
+            prompt = prompt.lower()
+        yield prompt
+
+
+def run(name, normalizer, prompts):
+    """Evaluate the prompts with a result cache and the given normalizer; print the outcome."""
+    server = StubPolicyServer({"guard": StubPolicy(lambda input_data: {"allow": is_allowed(input_data["content"])})})
+    client = TavoAIClient(
+        transport=InMemoryTransport(server),
+        log_level=logging.CRITICAL,
+        result_cache=VerdictCache(max_size=100000),
+        normalizers={"guard": normalizer} if normalizer else None
+    )
+    wrong = sum(client.evaluate_input(prompt, "guard").allowed != is_allowed(prompt) for prompt in prompts)
+    stats = client.stats()
+    client.close()
+    
+    reused = stats["cache_hits"] + stats["near_duplicate_hits"]
+    print(
+        f"{name:<24} hit rate {reused / stats['evaluations']:6.1%}  "
+        f"(exact {stats['cache_hits']:>5}, near-duplicate {stats['near_duplicate_hits']:>5})  "
+        f"server requests {server.evaluation_count:>5}  wrong verdicts {wrong}"
+    )
+    if normalizer and normalizer.near_duplicates:
+        index = normalizer.near_duplicates.stats()
+        print(
+            f"{'':<24} threshold {index['threshold']} (max {index['max_distance']} differing bits), "
+            f"mean hit similarity {index['mean_hit_similarity'] or 0:.3f}"
+        )
+
+
+def main():
+    """Run the normalization benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operations", type=int, default=5000, help="evaluations per run")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.85, 0.9, 0.95])
+    parser.add_argument("--edit-rate", type=float, default=0.3, help="share of prompts with a one-word edit")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    prompts = list(workload(args.operations, args.edit_rate, args.seed))
+    run("exact", None, prompts)
+    run("normalized", ContentNormalizer(), prompts)
+    run("normalized+slots", ContentNormalizer(casefold=True, slots=COMMON_SLOTS), prompts)
+    for threshold in args.thresholds:
+        normalizer = ContentNormalizer(
+            casefold=True,
+            slots=COMMON_SLOTS,
+            near_duplicates=NearDuplicateIndex(threshold=threshold)
+        )
+        run(f"near-duplicate@{threshold}", normalizer, prompts)
+
+
+if __name__ == "__main__":
+    main()
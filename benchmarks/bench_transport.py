@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Compare the client transports at high concurrency.
+
+For every transport and concurrency level, callers evaluate against a
+stub server with a fixed latency, and the benchmark prints throughput,
+latency percentiles, errors, and the number of connections the server
+accepted (in total and at most at once). Synchronous clients run one
+thread per caller; `--async` also runs AsyncTavoAIClient with one task
+per caller. The HTTP/2 transports need httpx (`pip install 'tavoai-sdk[http2]'`).
+
+Usage:
+    python benchmarks/bench_transport.py --concurrency 16 64 256 --async
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from tavoai.sdk import AsyncTavoAIClient, TavoAIClient
+from tavoai.sdk.benchmark import BenchmarkResult, run_benchmark
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+from tavoai.sdk.transport import HAS_HTTPX, HTTP1, HTTP2, REQUESTS
+
+
+def run_async(server, transport, concurrency, operations, pool_maxsize):
+    """Evaluate from `concurrency` tasks of one AsyncTavoAIClient."""
+    async def scenario():
+        async with AsyncTavoAIClient(
+            api_base_url=server.url,
+            transport=transport,
+            log_level=logging.CRITICAL,
+            pool_maxsize=pool_maxsize,
+            max_concurrency=concurrency
+        ) as client:
+            await client.evaluate_input("warmup", "bench_input")
+            counter = iter(range(operations))
+            latencies = []
+            errors = 0
+            
+            async def worker():
+                nonlocal errors
+                for i in counter:
+                    started = time.perf_counter()
+                    try:
+                        await client.evaluate_input(f"question {i}", "bench_input")
+                        latencies.append(time.perf_counter() - started)
+                    except Exception:
+                        errors += 1
+            
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return latencies, errors, time.perf_counter() - started
+    
+    latencies, errors, duration = asyncio.run(scenario())
+    return BenchmarkResult(f"async-{transport}", concurrency, latencies, errors, duration)
+
+
+def run_sync(server, transport, concurrency, operations, pool_maxsize):
+    """Evaluate from `concurrency` threads sharing one TavoAIClient."""
+    client = TavoAIClient(
+        api_base_url=server.url,
+        transport=transport,
+        log_level=logging.CRITICAL,
+        pool_maxsize=pool_maxsize
+    )
+    try:
+        return run_benchmark(
+            transport,
+            lambda i: client.evaluate_input(f"question {i}", "bench_input"),
+            concurrency=concurrency,
+            operations=operations
+        )
+    finally:
+        client.close()
+
+
+def main():
+    """Run the transport benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--operations", type=int, default=2000, help="evaluations per run")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="stub server latency per request")
+    parser.add_argument("--pool-maxsize", type=int, default=32, help="connections of the HTTP/1.1 pools")
+    parser.add_argument("--async", dest="run_async", action="store_true", help="also run AsyncTavoAIClient")
+    args = parser.parse_args()
+    
+    transports = [REQUESTS, HTTP1] + ([HTTP2] if HAS_HTTPX else [])
+    if not HAS_HTTPX:
+        print("httpx is not installed; skipping the HTTP/2 transport")
+    runners = [run_sync] + ([run_async] if args.run_async else [])
+    
+    policy = StubPolicy(latency=args.latency_ms / 1000)
+    for concurrency in args.concurrency:
+        for runner in runners:
+            for transport in transports:
+                with StubPolicyServer(default=policy, http2=transport == HTTP2) as server:
+                    result = runner(server, transport, concurrency, args.operations, args.pool_maxsize)
+                    print(
+                        f"{result}  connections {server.connection_count:>4} "
+                        f"(peak {server.peak_connections})"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+Compare TCP loopback with Unix domain socket transports for a sidecar policy server.
+
+The stub server answers without added latency, so the figures reflect
+transport overhead: HTTP over TCP loopback, HTTP over a Unix domain
+socket, and the length-prefixed binary framing with JSON and (when
+installed) msgpack payloads. Besides throughput and latency percentiles,
+the benchmark prints the process CPU time per evaluation; client and
+stub server share the process, so it covers both ends.
+
+Usage:
+    python benchmarks/bench_unix.py --concurrency 1 8 32 --operations 5000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from tavoai.sdk import TavoAIClient
+from tavoai.sdk.benchmark import run_benchmark
+from tavoai.sdk.framing import HAS_MSGPACK, JSON, MSGPACK, FramedTransport
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+from tavoai.sdk.transport import HTTP1
+
+
+def main():
+    """Run the Unix domain socket benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--operations", type=int, default=5000, help="evaluations per run")
+    parser.add_argument("--content-size", type=int, default=512, help="characters of evaluated content")
+    args = parser.parse_args()
+    
+    socket_path = os.path.join(tempfile.mkdtemp(prefix="tavoai-bench-"), "policy.sock")
+    # name -> (server options, transport factory taking the server URL)
+    setups = {
+        "tcp-http": ({}, lambda url: HTTP1),
+        "unix-http": ({"unix_socket": socket_path}, lambda url: HTTP1),
+        "unix-framed-json": (
+            {"unix_socket": socket_path, "framed": True},
+            lambda url: FramedTransport(socket_path, codec=JSON)
+        ),
+    }
+    if HAS_MSGPACK:
+        setups["unix-framed-msgpack"] = (
+            {"unix_socket": socket_path, "framed": True},
+            lambda url: FramedTransport(socket_path, codec=MSGPACK)
+        )
+    else:
+        print("msgpack is not installed; skipping the msgpack codec")
+    
+    content = ("lorem ipsum " * args.content_size)[:args.content_size]
+    metadata = {"user_id": "u-123", "tenant": "acme", "tags": ["chat", "support"]}
+    for concurrency in args.concurrency:
+        for name, (server_options, transport) in setups.items():
+            with StubPolicyServer(default=StubPolicy(True), **server_options) as server:
+                client = TavoAIClient(
+                    api_base_url=server.url,
+                    log_level=logging.CRITICAL,
+                    transport=transport(server.url),
+                    pool_maxsize=concurrency
+                )
+                cpu_started = time.process_time()
+                result = run_benchmark(
+                    name,
+                    lambda i: client.evaluate_input(content, "bench_input", metadata=metadata),
+                    concurrency=concurrency,
+                    operations=args.operations
+                )
+                cpu_us = (time.process_time() - cpu_started) / max(result.operations, 1) * 1e6
+                client.close()
+            print(f"{result}  cpu/op {cpu_us:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
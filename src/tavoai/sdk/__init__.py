@@ -1,12 +1,61 @@
 """TavoAI SDK package for AI risk controls evaluation."""
 
-from tavoai.sdk.client import TavoAIClient
-from tavoai.sdk.models import PolicyResult, ContentType
-from tavoai.sdk.decorators import TavoAIGuardrail
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from tavoai.sdk.client import TavoAIClient
+    from tavoai.sdk.aio import AsyncTavoAIClient
+    from tavoai.sdk.models import PolicyResult, ContentType
+    from tavoai.sdk.decorators import TavoAIGuardrail
+    from tavoai.sdk.degradation import DegradationMode, DegradationPolicy
+    from tavoai.sdk.session import ConversationSession
+    from tavoai.sdk.pipeline import PolicyPipeline, PipelineStage
+    from tavoai.sdk.deadline import Deadline, deadline_scope
+
+# Public names and the modules defining them. Modules are imported on first
+# attribute access so that `import tavoai.sdk` does not pull in `requests`.
+_LAZY_ATTRIBUTES = {
+    "TavoAIClient": "tavoai.sdk.client",
+    "AsyncTavoAIClient": "tavoai.sdk.aio",
+    "PolicyResult": "tavoai.sdk.models",
+    "ContentType": "tavoai.sdk.models",
+    "TavoAIGuardrail": "tavoai.sdk.decorators",
+    "DegradationMode": "tavoai.sdk.degradation",
+    "DegradationPolicy": "tavoai.sdk.degradation",
+    "ConversationSession": "tavoai.sdk.session",
+    "PolicyPipeline": "tavoai.sdk.pipeline",
+    "PipelineStage": "tavoai.sdk.pipeline",
+    "Deadline": "tavoai.sdk.deadline",
+    "deadline_scope": "tavoai.sdk.deadline",
+}
 
 __all__ = [
     "TavoAIClient",
+    "AsyncTavoAIClient",
     "PolicyResult",
     "ContentType",
     "TavoAIGuardrail",
-] 
\ No newline at end of file
+    "DegradationMode",
+    "DegradationPolicy",
+    "ConversationSession",
+    "PolicyPipeline",
+    "PipelineStage",
+    "Deadline",
+    "deadline_scope",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,392 @@
+"""Asynchronous client for TavoAI regulatory guardrails."""
+
+import asyncio
+import inspect
+import time
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Callable, Sequence, Tuple, TypeVar, Union
+
+from tavoai.sdk.client import TavoAIClient
+from tavoai.sdk.deadline import Deadline, DeadlineSpec, resolve_deadline
+from tavoai.sdk.exceptions import (
+    ConcurrencyLimitError,
+    PolicyEvaluationError,
+    PolicyNotFoundError,
+    ServerConnectionError
+)
+from tavoai.sdk.models import PolicyResult, ContentType
+from tavoai.sdk.transport import HTTP1, AsyncTransport, create_async_transport
+
+if TYPE_CHECKING:
+    from tavoai.sdk.concurrency import AdaptiveLimiter
+
+# Longest wait between checks for a free concurrency slot; slots released
+# outside the event loop (e.g. by pre-warming threads) do not wake waiters
+_SLOT_POLL_INTERVAL = 0.05
+
+_T = TypeVar("_T")
+
+
+class AsyncTavoAIClient(TavoAIClient):
+    """
+    Client evaluating policies from asyncio code.
+    
+    `evaluate_input`, `evaluate_output`, `evaluate_batch` and
+    `evaluate_policies` are coroutines sending requests through an
+    asynchronous transport, so that many evaluations can be in flight
+    without a thread each. Caching, degradation, deadlines, auditing,
+    shadow evaluation, adaptive concurrency and policy version watching
+    behave as with TavoAIClient; background work (health probes, shadow
+    evaluations, pre-warming) keeps using a synchronous transport from
+    worker threads. Fallback evaluators, and audit sinks with the "block"
+    overflow policy, run in the event loop's default executor.
+    
+    The synchronous helpers built on TavoAIClient (TavoAIGuardrail,
+    ConversationSession, PolicyPipeline) need a TavoAIClient;
+    TavoAIGuardrail raises TypeError when given an AsyncTavoAIClient.
+    """
+    
+    def __init__(
+        self,
+        api_base_url: str = "http://localhost:5000",
+        transport: Union[str, AsyncTransport] = HTTP1,
+        **kwargs: Any
+    ):
+        """
+        Initialize the client.
+        
+        Args:
+            api_base_url: Base URL for the policy server API.
+            transport: "http1" (a bounded urllib3 pool used from `pool_maxsize` worker
+              threads), "http2" (multiplexed HTTP/2, requires httpx), "requests", or an
+              asynchronous transport instance such as AsyncHTTPTransport(url) or
+              ThreadedAsyncTransport(InMemoryTransport(server)).
+            **kwargs: Other TavoAIClient options, except `micro_batching`, which
+              asyncio callers do not need.
+        """
+        if kwargs.get("micro_batching"):
+            raise ValueError("AsyncTavoAIClient does not support micro_batching")
+        
+        self.async_transport = create_async_transport(transport, api_base_url, kwargs.get("pool_maxsize", 32))
+        # Share the wrapped transport when there is one, so both paths use one pool
+        super().__init__(
+            api_base_url,
+            transport=getattr(self.async_transport, "transport", transport if isinstance(transport, str) else HTTP1),
+            **kwargs
+        )
+        self._slot_freed: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Condition]] = None
+    
+    def _after_fork_in_child(self) -> None:
+        super()._after_fork_in_child()
+        reset = getattr(self.async_transport, "_after_fork_in_child", None)
+        if reset is not None:
+            reset()
+        self._slot_freed = None
+    
+    async def aclose(self) -> None:
+        """Close the asynchronous transport and stop background activity."""
+        await self.async_transport.aclose()
+        self.close()
+    
+    async def __aenter__(self) -> "AsyncTavoAIClient":
+        return self
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+    
+    async def _evaluate_policy_async(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate a policy against input data via REST API.
+        
+        Raises:
+            PolicyNotFoundError: If the policy is not found
+            ServerConnectionError: If connection to the server fails
+            PolicyEvaluationError: If evaluation fails for other reasons
+        """
+        try:
+            response = await self.async_transport.request(
+                "POST",
+                f"/policies/{policy_name}/evaluate",
+                {"input": input_data},
+                self.timeout if timeout is None else timeout
+            )
+            
+            self._check_status(policy_name, response.status_code, response.text)
+            
+            result: Dict[str, Any] = response.json()
+            return result
+        
+        except (ConnectionError, TimeoutError) as e:
+            raise self._connection_error(e)
+        except (PolicyNotFoundError, ServerConnectionError, PolicyEvaluationError):
+            raise
+        except Exception as e:
+            msg = f"Error evaluating policy: {str(e)}"
+            self.logger.error(msg)
+            raise PolicyEvaluationError(msg)
+    
+    def _slot_condition(self) -> asyncio.Condition:
+        """Condition notified when a concurrency slot is released, bound to the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._slot_freed is None or self._slot_freed[0] is not loop:
+            self._slot_freed = (loop, asyncio.Condition())
+        return self._slot_freed[1]
+    
+    async def _acquire_slot(self, limiter: "AdaptiveLimiter", wait: float) -> bool:
+        """Take a concurrency slot without blocking the event loop, waiting up to `wait` seconds."""
+        if limiter.try_acquire():
+            return True
+        
+        condition = self._slot_condition()
+        expires = time.monotonic() + wait
+        async with condition:
+            while not limiter.try_acquire():
+                remaining = expires - time.monotonic()
+                if remaining <= 0:
+                    # Counted as a rejection by the limiter, unless a slot just freed up
+                    return limiter.acquire(timeout=0)
+                try:
+                    await asyncio.wait_for(condition.wait(), min(remaining, _SLOT_POLL_INTERVAL))
+                except asyncio.TimeoutError:
+                    pass
+        return True
+    
+    async def _release_slot(self, limiter: "AdaptiveLimiter", latency: float, failed: bool) -> None:
+        """Give a concurrency slot back and wake a waiting evaluation."""
+        limiter.release(latency, failed)
+        condition = self._slot_condition()
+        async with condition:
+            condition.notify()
+    
+    async def _send_evaluation_async(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Send an evaluation to the server, through the concurrency limiter when enabled."""
+        self.counters.increment("server_requests")
+        limiter = self.limiter
+        if limiter is None:
+            return await self._evaluate_policy_async(policy_name, input_data, timeout)
+        
+        wait = self.timeout if timeout is None else timeout
+        if not await self._acquire_slot(limiter, wait):
+            raise ConcurrencyLimitError(f"No request slot to {self.api_base_url} freed up within {wait:.3f}s")
+        started = time.monotonic()
+        failed = True
+        try:
+            result = await self._evaluate_policy_async(policy_name, input_data, timeout)
+            failed = False
+            return result
+        except PolicyNotFoundError:
+            # A quick, valid answer; says nothing about load
+            failed = False
+            raise
+        finally:
+            await self._release_slot(limiter, time.monotonic() - started, failed)
+    
+    async def _call(self, blocking: bool, func: Callable[..., _T], *args: Any) -> _T:
+        """Call `func`, in the default executor when it may block the event loop."""
+        if not blocking:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+    
+    def _may_run_fallback(self, policy_name: str) -> bool:
+        """Whether a degraded verdict of the policy may come from a synchronous fallback evaluator."""
+        degradations = (self._degradation_for(policy_name), self.deadline_degradation)
+        return any(degradation is not None and degradation.fallback is not None for degradation in degradations)
+    
+    def _audit_may_block(self) -> bool:
+        """Whether recording an audit record may wait for room in the sink's queue."""
+        if self.audit_sink is None:
+            return False
+        from tavoai.sdk.audit import BLOCK
+        return self.audit_sink.overflow == BLOCK
+    
+    async def _resolve_verdict_async(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None
+    ) -> PolicyResult:
+        """Return the verdict for an input, as `_resolve_verdict` does."""
+        # Degraded verdicts may run fallback evaluators, which are synchronous
+        blocking = self._may_run_fallback(policy_name)
+        verdict, cache_key, timeout, degradation = await self._call(
+            blocking, self._verdict_without_server, policy_name, input_data, timeout, deadline
+        )
+        if verdict is not None:
+            return verdict
+        
+        try:
+            result = await self._send_evaluation_async(policy_name, input_data, timeout)
+        except ServerConnectionError as e:
+            return await self._call(
+                blocking, self._verdict_on_failure, policy_name, input_data, degradation, cache_key, deadline, e
+            )
+        
+        return self._store_verdict(policy_name, input_data, degradation, cache_key, result)
+    
+    async def _evaluate_content_async(
+        self,
+        content: str,
+        policy_name: str,
+        content_type: ContentType,
+        metadata: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        request_id: Optional[str] = None,
+        on_rejection: Optional[Callable[[PolicyResult], Any]] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[DeadlineSpec] = None
+    ) -> Union[PolicyResult, Any]:
+        """Evaluate content against a policy, as `_evaluate_content` does; handlers may be coroutine functions."""
+        input_data = self._build_input(content, policy_name, content_type, metadata, config, request_id)
+        deadline = resolve_deadline(deadline)
+        
+        # An audit sink with the "block" overflow policy would stall every coroutine
+        blocking = self._audit_may_block()
+        try:
+            policy_result = await self._resolve_verdict_async(policy_name, input_data, timeout, deadline)
+        except Exception as e:
+            await self._call(blocking, self._evaluation_failed, policy_name, input_data, e, deadline)
+            raise
+        
+        await self._call(blocking, self._record_verdict, policy_name, input_data, policy_result, deadline)
+        if not policy_result.allowed and on_rejection:
+            outcome = on_rejection(policy_result)
+            if inspect.isawaitable(outcome):
+                # Rejection handlers may be coroutine functions
+                outcome = await outcome
+            return outcome
+        return policy_result
+    
+    async def evaluate_input(  # type: ignore[override]
+        self,
+        content: str,
+        policy_name: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        request_id: Optional[str] = None,
+        on_rejection: Optional[Callable[[PolicyResult], Any]] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[DeadlineSpec] = None
+    ) -> Union[PolicyResult, Any]:
+        """
+        Evaluate input content against a policy.
+        
+        Takes the arguments of TavoAIClient.evaluate_input; `on_rejection` may
+        also be a coroutine function.
+        """
+        return await self._evaluate_content_async(
+            content, policy_name, ContentType.INPUT, metadata, config, request_id, on_rejection, timeout, deadline
+        )
+    
+    async def evaluate_output(  # type: ignore[override]
+        self,
+        content: str,
+        policy_name: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        request_id: Optional[str] = None,
+        on_rejection: Optional[Callable[[PolicyResult], Any]] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[DeadlineSpec] = None
+    ) -> Union[PolicyResult, Any]:
+        """
+        Evaluate output content against a policy.
+        
+        Takes the arguments of TavoAIClient.evaluate_output; `on_rejection` may
+        also be a coroutine function.
+        """
+        return await self._evaluate_content_async(
+            content, policy_name, ContentType.OUTPUT, metadata, config, request_id, on_rejection, timeout, deadline
+        )
+    
+    async def _evaluate_concurrently(
+        self,
+        evaluations: List[Tuple[str, str]],
+        content_type: ContentType,
+        metadata: Optional[Dict[str, Any]],
+        config: Optional[Dict[str, Any]],
+        request_ids: Sequence[Optional[str]],
+        deadline: Optional[DeadlineSpec],
+        return_exceptions: bool
+    ) -> List[Union[PolicyResult, Exception]]:
+        """Evaluate (content, policy_name) pairs as tasks, up to `max_concurrency` at once, in order."""
+        deadline = resolve_deadline(deadline)
+        running = asyncio.Semaphore(self.max_concurrency)
+        
+        async def evaluate(content: str, policy_name: str, request_id: Optional[str]) -> Any:
+            async with running:
+                return await self._evaluate_content_async(
+                    content, policy_name, content_type, metadata, config, request_id, deadline=deadline
+                )
+        
+        tasks = [
+            asyncio.ensure_future(evaluate(content, policy_name, request_id))
+            for (content, policy_name), request_id in zip(evaluations, request_ids)
+        ]
+        try:
+            return list(await asyncio.gather(*tasks, return_exceptions=return_exceptions))
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def evaluate_batch(  # type: ignore[override]
+        self,
+        contents: Sequence[str],
+        policy_name: str,
+        content_type: ContentType = ContentType.INPUT,
+        metadata: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        request_ids: Optional[Sequence[Optional[str]]] = None,
+        deadline: Optional[DeadlineSpec] = None,
+        return_exceptions: bool = False
+    ) -> List[Union[PolicyResult, Exception]]:
+        """
+        Evaluate many contents against one policy concurrently.
+        
+        Takes the arguments of TavoAIClient.evaluate_batch.
+        """
+        return await self._evaluate_concurrently(
+            [(content, policy_name) for content in contents],
+            content_type,
+            metadata,
+            config,
+            request_ids or [None] * len(contents),
+            deadline,
+            return_exceptions
+        )
+    
+    async def evaluate_policies(  # type: ignore[override]
+        self,
+        content: str,
+        policy_names: Sequence[str],
+        content_type: ContentType = ContentType.INPUT,
+        metadata: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        request_id: Optional[str] = None,
+        deadline: Optional[DeadlineSpec] = None,
+        return_exceptions: bool = False
+    ) -> Dict[str, Union[PolicyResult, Exception]]:
+        """
+        Evaluate one content against several policies concurrently.
+        
+        Takes the arguments of TavoAIClient.evaluate_policies.
+        """
+        outcomes = await self._evaluate_concurrently(
+            [(content, policy_name) for policy_name in policy_names],
+            content_type,
+            metadata,
+            config,
+            [request_id] * len(policy_names),
+            deadline,
+            return_exceptions
+        )
+        return dict(zip(policy_names, outcomes))
@@ -0,0 +1,514 @@
+"""Columnar storage and aggregation of evaluation results for offline runs."""
+
+import time
+from array import array
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+
+from tavoai.sdk.models import PolicyResult
+
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+def _view(values: Any) -> Any:
+    """Return a NumPy view of a typed array without copying it, or the array itself without NumPy."""
+    if HAS_NUMPY and isinstance(values, array):
+        if not len(values):
+            return numpy.zeros(0, dtype=values.typecode)
+        return numpy.frombuffer(values, dtype=values.typecode)
+    return values
+
+
+def _bincount(codes: Any, size: int, weights: Any = None) -> List[float]:
+    """Count occurrences of each code in `range(size)`, or sum the weights of each code."""
+    counts: List[float]
+    if HAS_NUMPY:
+        counts = numpy.bincount(_view(codes), weights=_view(weights), minlength=size).tolist()
+        return counts
+    
+    counts = [0] * size
+    if weights is None:
+        for code in codes:
+            counts[code] += 1
+    else:
+        for code, weight in zip(codes, weights):
+            counts[code] += weight
+    return counts
+
+
+class _Dictionary:
+    """Maps strings to dense integer codes."""
+    
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+    
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+    
+    def lookup(self, value: str) -> Optional[int]:
+        return self._codes.get(value)
+
+
+class ResultFrame:
+    """
+    Column-wise container of evaluation results.
+    
+    Each result is stored as one entry per column rather than as a
+    PolicyResult object: policy names and request IDs are dictionary-encoded
+    into integer codes, verdicts and timestamps are packed into typed arrays, and
+    rejection categories are stored in compressed sparse row form (one
+    offset per result into a flat array of category codes). Aggregations
+    run over these arrays, with NumPy when it is installed.
+    
+    Example:
+        frame = ResultFrame.from_audit_log(["audit.jsonl.1", "audit.jsonl"])
+        frame.counts_by_policy()
+        frame.category_counts(by_policy=True)
+        frame.rejection_timeline(3600, policy="pii_input")
+        frame.diff("pii_input", "pii_input_v2")
+        frame.to_parquet("results.parquet")
+    """
+    
+    def __init__(self) -> None:
+        """Initialize an empty frame."""
+        # -1 for results without a request ID
+        self.request_codes = array("q")
+        self.policy_codes = array("I")
+        self.timestamps = array("d")
+        self.allowed = array("B")
+        self.degraded = array("B")
+        # Rejection categories of result i are category_codes[reason_offsets[i]:reason_offsets[i + 1]]
+        self.reason_offsets = array("Q", [0])
+        self.category_codes = array("I")
+        self._policies = _Dictionary()
+        self._categories = _Dictionary()
+        self._request_ids = _Dictionary()
+    
+    @property
+    def policies(self) -> List[str]:
+        """Policy names, indexed by policy code."""
+        return self._policies.values
+    
+    @property
+    def categories(self) -> List[str]:
+        """Rejection categories, indexed by category code."""
+        return self._categories.values
+    
+    @property
+    def request_ids(self) -> List[Optional[str]]:
+        """Request ID of each result, or None; built on access from the request codes."""
+        values = self._request_ids.values
+        return [values[code] if code >= 0 else None for code in self.request_codes]
+    
+    def __len__(self) -> int:
+        return len(self.allowed)
+    
+    def append(
+        self,
+        policy_name: str,
+        allowed: bool,
+        categories: Iterable[str] = (),
+        request_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
+        degraded: bool = False
+    ) -> None:
+        """
+        Append one result.
+        
+        Args:
+            policy_name: Name of the evaluated policy.
+            allowed: Whether the content was allowed.
+            categories: Categories of the rejection reasons.
+            request_id: Optional request ID, used by `diff`.
+            timestamp: Evaluation time in seconds since the epoch, defaults to now.
+            degraded: Whether the verdict was produced in degraded mode.
+        """
+        self.request_codes.append(-1 if request_id is None else self._request_ids.code(request_id))
+        self.policy_codes.append(self._policies.code(policy_name))
+        self.timestamps.append(time.time() if timestamp is None else timestamp)
+        self.allowed.append(1 if allowed else 0)
+        self.degraded.append(1 if degraded else 0)
+        for category in categories:
+            self.category_codes.append(self._categories.code(category))
+        self.reason_offsets.append(len(self.category_codes))
+    
+    def append_result(
+        self,
+        policy_name: str,
+        result: PolicyResult,
+        request_id: Optional[str] = None,
+        timestamp: Optional[float] = None
+    ) -> None:
+        """
+        Append a PolicyResult; only its verdict and rejection categories are kept.
+        
+        Args:
+            policy_name: Name of the evaluated policy.
+            result: Evaluation result.
+            request_id: Optional request ID, used by `diff`.
+            timestamp: Evaluation time in seconds since the epoch, defaults to now.
+        """
+        self.append(
+            policy_name,
+            result.allowed,
+            [reason.get("category", "") for reason in result.rejection_reasons],
+            request_id,
+            timestamp,
+            result.degraded
+        )
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "ResultFrame":
+        """
+        Build a frame from audit records, see `tavoai.sdk.audit.AUDIT_FIELDS`.
+        
+        Records of failed evaluations, which have no verdict, are skipped.
+        
+        Args:
+            records: Audit records.
+        
+        Returns:
+            ResultFrame holding the records.
+        """
+        frame = cls()
+        for record in records:
+            if record.get("allowed") is None:
+                continue
+            frame.append(
+                record["policy"],
+                bool(record["allowed"]),
+                [reason.get("category", "") for reason in record.get("rejection_reasons") or ()],
+                record.get("request_id"),
+                record.get("timestamp"),
+                record.get("degraded_mode") is not None
+            )
+        return frame
+    
+    @classmethod
+    def from_audit_log(cls, paths: Sequence[str]) -> "ResultFrame":
+        """
+        Build a frame from JSONL audit logs written by JsonlAuditWriter.
+        
+        Args:
+            paths: Log files, oldest first.
+        
+        Returns:
+            ResultFrame holding the logged evaluations.
+        """
+        import json
+        
+        def records() -> Iterable[Dict[str, Any]]:
+            for path in paths:
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            yield json.loads(line)
+        
+        return cls.from_records(records())
+    
+    def _rejected(self) -> Any:
+        """1 for each rejected result and 0 for each allowed one."""
+        if HAS_NUMPY:
+            return 1 - _view(self.allowed)
+        return [1 - allowed for allowed in self.allowed]
+    
+    def counts_by_policy(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Count evaluations and rejections per policy.
+        
+        Returns:
+            Mapping of policy names to their evaluations, rejected and degraded
+            counts and rejection rate.
+        """
+        size = len(self.policies)
+        evaluations = _bincount(self.policy_codes, size)
+        rejected = _bincount(self.policy_codes, size, self._rejected())
+        degraded = _bincount(self.policy_codes, size, self.degraded)
+        return {
+            policy: {
+                "evaluations": int(evaluations[code]),
+                "rejected": int(rejected[code]),
+                "degraded": int(degraded[code]),
+                "rejection_rate": rejected[code] / evaluations[code] if evaluations[code] else 0.0,
+            }
+            for code, policy in enumerate(self.policies)
+        }
+    
+    def category_counts(self, by_policy: bool = False) -> Dict[Any, int]:
+        """
+        Count rejection reasons per category.
+        
+        Args:
+            by_policy: Whether to count per (policy, category) pair instead.
+        
+        Returns:
+            Mapping of categories, or of (policy, category) pairs, to counts; zero counts are omitted.
+        """
+        categories = self.categories
+        if not by_policy:
+            counts = _bincount(self.category_codes, len(categories))
+            return {category: int(count) for category, count in zip(categories, counts) if count}
+        
+        # Key each reason by (policy code, category code) of the result owning it
+        width = len(categories)
+        if HAS_NUMPY:
+            owners = numpy.repeat(_view(self.policy_codes), numpy.diff(_view(self.reason_offsets)).astype(numpy.int64))
+            keys = owners.astype(numpy.int64) * width + _view(self.category_codes)
+        else:
+            offsets = self.reason_offsets
+            keys = [
+                code * width + category
+                for index, code in enumerate(self.policy_codes)
+                for category in self.category_codes[offsets[index]:offsets[index + 1]]
+            ]
+        counts = _bincount(keys, len(self.policies) * width)
+        return {
+            (self.policies[key // width], categories[key % width]): int(count)
+            for key, count in enumerate(counts) if count
+        }
+    
+    def rejection_timeline(
+        self,
+        interval: float,
+        policy: Optional[str] = None
+    ) -> List[Tuple[float, int, int, float]]:
+        """
+        Compute rejection rates over fixed time buckets.
+        
+        Args:
+            interval: Bucket width in seconds.
+            policy: Optional policy to restrict the timeline to.
+        
+        Returns:
+            (bucket start time, evaluations, rejected, rejection rate) for each
+            bucket from the first to the last result, including empty buckets.
+        """
+        timestamps, rejected = _view(self.timestamps), self._rejected()
+        if policy is not None:
+            code = self._policies.lookup(policy)
+            if HAS_NUMPY:
+                selected = _view(self.policy_codes) == code
+                timestamps, rejected = timestamps[selected], rejected[selected]
+            else:
+                selected = [i for i, policy_code in enumerate(self.policy_codes) if policy_code == code]
+                timestamps, rejected = [timestamps[i] for i in selected], [rejected[i] for i in selected]
+        if not len(timestamps):
+            return []
+        
+        if HAS_NUMPY:
+            start = float(timestamps.min())
+            start -= start % interval
+            buckets = ((timestamps - start) // interval).astype(numpy.int64)
+            size = int(buckets.max()) + 1
+        else:
+            start = min(timestamps)
+            start -= start % interval
+            buckets = [int((timestamp - start) // interval) for timestamp in timestamps]
+            size = max(buckets) + 1
+        
+        evaluations = _bincount(buckets, size)
+        rejections = _bincount(buckets, size, rejected)
+        return [
+            (start + bucket * interval, int(count), int(rejections[bucket]), rejections[bucket] / count if count else 0.0)
+            for bucket, count in enumerate(evaluations)
+        ]
+    
+    def diff(self, policy_a: str, policy_b: str) -> Dict[str, Any]:
+        """
+        Compare the verdicts of two policies on the requests both evaluated.
+        
+        Results are matched by request ID; when a policy evaluated a request
+        several times, its last verdict is used.
+        
+        Args:
+            policy_a: First policy.
+            policy_b: Second policy.
+        
+        Returns:
+            Dictionary with the number of compared requests, how many both
+            allowed or both rejected, and under `only_a_rejected` and
+            `only_b_rejected` the request IDs rejected by only one of the
+            policies, in order of first appearance.
+        """
+        code_a, code_b = self._policies.lookup(policy_a), self._policies.lookup(policy_b)
+        if HAS_NUMPY:
+            both_allowed, both_rejected, only_a_codes, only_b_codes = self._diff_numpy(code_a, code_b)
+        else:
+            both_allowed, both_rejected, only_a_codes, only_b_codes = self._diff_python(code_a, code_b)
+        values = self._request_ids.values
+        only_a = [values[code] for code in only_a_codes]
+        only_b = [values[code] for code in only_b_codes]
+        
+        compared = both_allowed + both_rejected + len(only_a) + len(only_b)
+        return {
+            "compared": compared,
+            "both_allowed": both_allowed,
+            "both_rejected": both_rejected,
+            "agreement_rate": (both_allowed + both_rejected) / compared if compared else 0.0,
+            "only_a_rejected": only_a,
+            "only_b_rejected": only_b,
+        }
+    
+    def _last_verdicts(self, policy_code: int) -> Tuple[Any, Any]:
+        """Sorted request codes evaluated by a policy, and the allowed flag of each one's last result."""
+        requests = _view(self.request_codes)
+        rows = numpy.flatnonzero((_view(self.policy_codes) == policy_code) & (requests >= 0))
+        # numpy.unique keeps the first occurrence, so search the rows backwards
+        rows = rows[::-1]
+        codes, first = numpy.unique(requests[rows], return_index=True)
+        return codes, _view(self.allowed)[rows[first]]
+    
+    def _diff_numpy(self, code_a: Optional[int], code_b: Optional[int]) -> Tuple[int, int, List[int], List[int]]:
+        if code_a is None or code_b is None:
+            return 0, 0, [], []
+        requests_a, allowed_a = self._last_verdicts(code_a)
+        requests_b, allowed_b = self._last_verdicts(code_b)
+        common, index_a, index_b = numpy.intersect1d(requests_a, requests_b, assume_unique=True, return_indices=True)
+        allowed_a, allowed_b = allowed_a[index_a].astype(bool), allowed_b[index_b].astype(bool)
+        return (
+            int(numpy.count_nonzero(allowed_a & allowed_b)),
+            int(numpy.count_nonzero(~allowed_a & ~allowed_b)),
+            common[~allowed_a & allowed_b].tolist(),
+            common[allowed_a & ~allowed_b].tolist(),
+        )
+    
+    def _diff_python(self, code_a: Optional[int], code_b: Optional[int]) -> Tuple[int, int, List[int], List[int]]:
+        verdicts_a: Dict[int, int] = {}
+        verdicts_b: Dict[int, int] = {}
+        for request, code, allowed in zip(self.request_codes, self.policy_codes, self.allowed):
+            if request < 0:
+                continue
+            if code == code_a:
+                verdicts_a[request] = allowed
+            if code == code_b:
+                verdicts_b[request] = allowed
+        
+        both_allowed = both_rejected = 0
+        only_a: List[int] = []
+        only_b: List[int] = []
+        for request in sorted(verdicts_a.keys() & verdicts_b.keys()):
+            allowed_a, allowed_b = verdicts_a[request], verdicts_b[request]
+            if allowed_a and allowed_b:
+                both_allowed += 1
+            elif not allowed_a and not allowed_b:
+                both_rejected += 1
+            elif allowed_b:
+                only_a.append(request)
+            else:
+                only_b.append(request)
+        return both_allowed, both_rejected, only_a, only_b
+    
+    def to_csv(self, path: str, category_separator: str = ";") -> None:
+        """
+        Write the results as CSV, one row per result.
+        
+        With pyarrow, the columns of `to_arrow` are written by its CSV writer
+        without building a row per result.
+        
+        Args:
+            path: Destination file.
+            category_separator: Separator joining the rejection categories of a result.
+        """
+        try:
+            import pyarrow
+            import pyarrow.compute
+            import pyarrow.csv
+        except ImportError:
+            self._to_csv_python(path, category_separator)
+            return
+        
+        table = self.to_arrow()
+        categories = table.column("categories").cast(pyarrow.large_list(pyarrow.string()))
+        pyarrow.csv.write_csv(pyarrow.table({
+            "timestamp": table.column("timestamp"),
+            "request_id": table.column("request_id").cast(pyarrow.string()),
+            "policy": table.column("policy").cast(pyarrow.string()),
+            "allowed": table.column("allowed"),
+            "degraded": table.column("degraded"),
+            "categories": pyarrow.compute.binary_join(categories, category_separator),
+        }), path)
+    
+    def _to_csv_python(self, path: str, category_separator: str) -> None:
+        import csv
+        
+        # Build the columns one at a time, then write them side by side
+        policies, categories, offsets = self.policies, self.categories, self.reason_offsets
+        request_ids = [request_id or "" for request_id in self.request_ids]
+        policy_names = [policies[code] for code in self.policy_codes]
+        joined = [
+            category_separator.join(categories[code] for code in self.category_codes[start:end])
+            for start, end in zip(offsets, offsets[1:])
+        ]
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp", "request_id", "policy", "allowed", "degraded", "categories"])
+            writer.writerows(zip(self.timestamps, request_ids, policy_names, self.allowed, self.degraded, joined))
+    
+    def to_arrow(self) -> Any:
+        """
+        Return the results as a pyarrow Table.
+        
+        Policies, categories and request IDs are dictionary-encoded, and
+        categories form a large list column built directly from the 64-bit
+        CSR offsets.
+        
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow
+            import pyarrow.compute
+        except ImportError:
+            raise ImportError("pyarrow is required for Arrow and Parquet export: pip install pyarrow")
+        
+        def from_buffer(values: array, arrow_type: Any) -> Any:
+            return pyarrow.Array.from_buffers(arrow_type, len(values), [None, pyarrow.py_buffer(values)])
+        
+        policy = pyarrow.DictionaryArray.from_arrays(
+            from_buffer(self.policy_codes, pyarrow.uint32()),
+            pyarrow.array(self.policies, pyarrow.string())
+        )
+        category = pyarrow.DictionaryArray.from_arrays(
+            from_buffer(self.category_codes, pyarrow.uint32()),
+            pyarrow.array(self.categories, pyarrow.string())
+        )
+        # Results without a request ID (code -1) become nulls
+        request_codes = from_buffer(self.request_codes, pyarrow.int64())
+        request_id = pyarrow.DictionaryArray.from_arrays(
+            pyarrow.compute.if_else(pyarrow.compute.less(request_codes, 0), None, request_codes),
+            pyarrow.array(self._request_ids.values, pyarrow.string())
+        )
+        # Offsets never exceed the 2**63 - 1 of int64, so their buffer is shared as-is
+        categories = pyarrow.LargeListArray.from_arrays(from_buffer(self.reason_offsets, pyarrow.int64()), category)
+        
+        return pyarrow.table({
+            "timestamp": from_buffer(self.timestamps, pyarrow.float64()),
+            "request_id": request_id,
+            "policy": policy,
+            "allowed": from_buffer(self.allowed, pyarrow.uint8()),
+            "degraded": from_buffer(self.degraded, pyarrow.uint8()),
+            "categories": categories,
+        })
+    
+    def to_parquet(self, path: str) -> None:
+        """
+        Write the results as a Parquet file.
+        
+        Args:
+            path: Destination file.
+        
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        table = self.to_arrow()
+        import pyarrow.parquet
+        
+        pyarrow.parquet.write_table(table, path)
@@ -0,0 +1,411 @@
+"""Background audit log of evaluation results."""
+
+import atexit
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Dict, Any, List, Optional, Protocol
+
+from tavoai.sdk.multiprocess import register_fork_aware
+
+# Overflow policies, applied when the queue is full
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+
+# Columns of the audit records, in the order used by SqliteAuditWriter
+AUDIT_FIELDS = (
+    "timestamp",
+    "request_id",
+    "policy",
+    "content_type",
+    "allowed",
+    "rejection_reasons",
+    "degraded_mode",
+    "error",
+)
+
+
+class AuditWriter(Protocol):
+    """Interface of the audit record writers."""
+    
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        ...
+    
+    def close(self) -> None:
+        ...
+
+
+def _rotate(path: str, backup_count: int) -> None:
+    """Shift `path` to `path.1`, `path.1` to `path.2`, ..., keeping `backup_count` files."""
+    if backup_count <= 0:
+        os.remove(path)
+        return
+    for index in range(backup_count - 1, 0, -1):
+        source = f"{path}.{index}"
+        if os.path.exists(source):
+            os.replace(source, f"{path}.{index + 1}")
+    os.replace(path, f"{path}.1")
+
+
+class JsonlAuditWriter:
+    """
+    Writes audit records as JSON lines to a rotating file.
+    
+    Once the file exceeds `max_bytes`, it is renamed to `path.1` (shifting
+    older files up to `path.<backup_count>`) and a new file is started.
+    """
+    
+    def __init__(self, path: str, max_bytes: int = 100 * 1024 * 1024, backup_count: int = 5):
+        """
+        Initialize the writer.
+        
+        Args:
+            path: Path of the current log file.
+            max_bytes: Size at which the file is rotated; 0 disables rotation.
+            backup_count: Number of rotated files to keep.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file: Optional[Any] = None
+    
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        """Append records to the log file, rotating it when full."""
+        import json
+        
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write("".join(json.dumps(record, default=str) + "\n" for record in records))
+        self._file.flush()
+        
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self._file.close()
+            self._file = None
+            _rotate(self.path, self.backup_count)
+    
+    def close(self) -> None:
+        """Close the log file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def _after_fork_in_child(self) -> None:
+        # The child appends through its own file handle
+        self._file = None
+
+
+class SqliteAuditWriter:
+    """
+    Writes audit records to a rotating SQLite database.
+    
+    Records go to an `audit` table with one column per entry of AUDIT_FIELDS;
+    rejection reasons are stored as JSON. Once the database exceeds
+    `max_bytes`, it is rotated like JsonlAuditWriter files.
+    """
+    
+    def __init__(self, path: str, max_bytes: int = 100 * 1024 * 1024, backup_count: int = 5):
+        """
+        Initialize the writer.
+        
+        Args:
+            path: Path of the current database.
+            max_bytes: Size at which the database is rotated; 0 disables rotation.
+            backup_count: Number of rotated databases to keep.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._connection: Optional[Any] = None
+    
+    def _connect(self) -> Any:
+        import sqlite3
+        
+        # Only the sink's writer thread uses the connection, but it may be closed from another thread
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS audit ("
+            "timestamp REAL, request_id TEXT, policy TEXT, content_type TEXT, "
+            "allowed INTEGER, rejection_reasons TEXT, degraded_mode TEXT, error TEXT)"
+        )
+        return connection
+    
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        """Insert records in a single transaction, rotating the database when full."""
+        import json
+        
+        if self._connection is None:
+            self._connection = self._connect()
+        rows = [
+            tuple(
+                json.dumps(record.get(field)) if field == "rejection_reasons" else record.get(field)
+                for field in AUDIT_FIELDS
+            )
+            for record in records
+        ]
+        with self._connection:
+            self._connection.executemany(f"INSERT INTO audit VALUES ({', '.join('?' * len(AUDIT_FIELDS))})", rows)
+        
+        if self.max_bytes and os.path.getsize(self.path) >= self.max_bytes:
+            self.close()
+            _rotate(self.path, self.backup_count)
+    
+    def close(self) -> None:
+        """Close the database."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+    
+    def _after_fork_in_child(self) -> None:
+        # SQLite connections must not be used across a fork
+        self._connection = None
+
+
+# Sinks flushed when the interpreter exits
+_OPEN_SINKS: "weakref.WeakSet[AuditSink]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_sinks() -> None:
+    for sink in list(_OPEN_SINKS):
+        sink.close()
+
+
+class AuditSink:
+    """
+    Persists evaluation results from a background thread.
+    
+    `record` only appends to an in-memory queue; a writer thread drains it
+    in batches of up to `batch_size` records, at least every
+    `flush_interval` seconds. When the queue holds `max_queue_size` records,
+    the overflow policy applies: "drop_newest" discards the new record,
+    "drop_oldest" discards the oldest queued record, and "block" waits up to
+    `block_timeout` seconds for room before dropping the new record.
+    
+    Queued records are written when the sink is closed, including at
+    interpreter exit. The writer is closed by the writer thread once it
+    has written them, so a slow write never races with the close.
+    """
+    
+    def __init__(
+        self,
+        writer: AuditWriter,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow: str = DROP_NEWEST,
+        block_timeout: float = 1.0,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialize the audit sink.
+        
+        Args:
+            writer: Destination of the records, e.g. a JsonlAuditWriter or a SqliteAuditWriter.
+            max_queue_size: Maximum number of records waiting to be written.
+            batch_size: Maximum number of records per write.
+            flush_interval: Maximum time, in seconds, a record waits before being written.
+            overflow: "drop_newest", "drop_oldest" or "block".
+            block_timeout: Maximum time, in seconds, `record` blocks with the "block" policy.
+            logger: Optional logger.
+        """
+        if overflow not in (DROP_NEWEST, DROP_OLDEST, BLOCK):
+            raise ValueError(f"Invalid overflow policy: {overflow}")
+        
+        self.writer = writer
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.logger = logger
+        self._queue: "deque[Dict[str, Any]]" = deque()
+        # Guards the queue and `_closed`; notified when the writer thread frees room
+        self._cond = threading.Condition()
+        self._wakeup = threading.Event()
+        self._writing = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._counts_lock = threading.Lock()
+        self._counts = self._empty_counts()
+        _OPEN_SINKS.add(self)
+        register_fork_aware(self)
+    
+    @staticmethod
+    def _empty_counts() -> Dict[str, int]:
+        return {"submitted": 0, "dropped": 0, "written": 0, "batches": 0, "write_errors": 0}
+    
+    def _count(self, field: str, amount: int = 1) -> None:
+        with self._counts_lock:
+            self._counts[field] += amount
+    
+    def record(self, record: Dict[str, Any], timeout: Optional[float] = None) -> bool:
+        """
+        Queue an audit record.
+        
+        Args:
+            record: Record to write, normally with the keys of AUDIT_FIELDS.
+            timeout: Optional bound, in seconds, on the wait of the "block" policy,
+              in addition to `block_timeout`.
+        
+        Returns:
+            True if the record was queued, False if it was dropped.
+        """
+        if self._thread is None and not self._closed:
+            self._start()
+        
+        with self._cond:
+            # Checked under the lock so that no record lands after the final drain,
+            # and concurrent callers cannot overfill the queue
+            if self._closed:
+                self._count("dropped")
+                return False
+            if len(self._queue) >= self.max_queue_size:
+                if self.overflow == DROP_OLDEST:
+                    self._queue.popleft()
+                    self._count("dropped")
+                elif self.overflow == DROP_NEWEST or not self._wait_for_space(timeout):
+                    self._count("dropped")
+                    return False
+            self._queue.append(record)
+            queued = len(self._queue)
+        
+        self._count("submitted")
+        if queued >= self.batch_size:
+            self._wakeup.set()
+        return True
+    
+    def _wait_for_space(self, timeout: Optional[float]) -> bool:
+        # Must be called with the condition held
+        wait = self.block_timeout if timeout is None else min(self.block_timeout, timeout)
+        self._wakeup.set()
+        has_space = self._cond.wait_for(lambda: self._closed or len(self._queue) < self.max_queue_size, wait)
+        return has_space and not self._closed
+    
+    def _start(self) -> None:
+        with self._start_lock:
+            # A sink closed meanwhile has already written its records inline
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(target=self._work, name="tavoai-audit", daemon=True)
+            self._thread.start()
+    
+    def _work(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._drain()
+            if self._closed:
+                # Records queued before closing are still written, then the writer is closed
+                self._drain()
+                self._close_writer()
+                return
+    
+    def _drain(self) -> None:
+        """Write all queued records in batches."""
+        while True:
+            with self._cond:
+                if not self._queue:
+                    return
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._writing = True
+                self._cond.notify_all()
+            
+            try:
+                self.writer.write(batch)
+            except Exception as e:
+                self._count("write_errors", len(batch))
+                if self.logger:
+                    self.logger.error(f"Writing {len(batch)} audit records failed: {str(e)}")
+            else:
+                self._count("written", len(batch))
+                self._count("batches")
+            finally:
+                self._writing = False
+    
+    def _close_writer(self) -> None:
+        try:
+            self.writer.close()
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Closing the audit writer failed: {str(e)}")
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return audit statistics.
+        
+        Returns:
+            Dictionary with submitted, dropped, written and failed records, the
+            number of batches written and the queue depth.
+        """
+        with self._counts_lock:
+            stats: Dict[str, Any] = dict(self._counts)
+        stats["queued"] = len(self._queue)
+        return stats
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until queued records are written.
+        
+        Args:
+            timeout: Maximum time to wait, in seconds.
+        
+        Returns:
+            True if the queue was drained in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue or self._writing:
+            if self._thread is None:
+                self._start()
+            self._wakeup.set()
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+    
+    def _after_fork_in_child(self) -> None:
+        # Queued records and the writer thread belong to the parent process
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._wakeup = threading.Event()
+        self._writing = False
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._counts_lock = threading.Lock()
+        self._counts = self._empty_counts()
+        reset = getattr(self.writer, "_after_fork_in_child", None)
+        if reset is not None:
+            reset()
+    
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Write the queued records, stop the writer thread and close the writer.
+        
+        Records submitted after closing are dropped. If the writer thread is
+        still writing after `timeout`, it closes the writer itself once done.
+        
+        Args:
+            timeout: Maximum time to wait for the writer thread, in seconds.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            # Release callers blocked by the "block" policy
+            self._cond.notify_all()
+        _OPEN_SINKS.discard(self)
+        
+        with self._start_lock:
+            thread = self._thread
+        if thread is None:
+            self._drain()
+            self._close_writer()
+            return
+        self._wakeup.set()
+        thread.join(timeout=timeout)
+        if thread.is_alive() and self.logger:
+            self.logger.warning(f"Audit writer still busy after {timeout}s; it is closed once its records are written")
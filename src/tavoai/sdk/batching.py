@@ -0,0 +1,279 @@
+"""Adaptive micro-batching of concurrent policy evaluations."""
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Callable, Tuple, Union
+
+from tavoai.sdk.exceptions import DeadlineExceededError, PolicyEvaluationError, ServerConnectionError
+
+if TYPE_CHECKING:
+    from tavoai.sdk.concurrency import AdaptiveLimiter
+
+# Type for functions that send a batch of (policy_name, input_data) pairs with
+# an optional request timeout and return, for each pair, either the raw server
+# result or the exception to raise.
+BatchSender = Callable[
+    [List[Tuple[str, Dict[str, Any]]], Optional[float]],
+    List[Union[Dict[str, Any], Exception]]
+]
+
+
+class _PendingEvaluation:
+    """A single evaluation waiting to be sent in a batch."""
+    
+    __slots__ = ("policy_name", "input_data", "expires_at", "done", "result", "error")
+    
+    def __init__(self, policy_name: str, input_data: Dict[str, Any], expires_at: Optional[float]):
+        self.policy_name = policy_name
+        self.input_data = input_data
+        self.expires_at = expires_at
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[Exception] = None
+
+
+class MicroBatcher:
+    """
+    Collects concurrent evaluations and sends them as batched requests.
+    
+    Callers block in `submit` while dispatcher threads gather pending
+    evaluations for up to the current batching window or `max_batch_size`
+    items, send them with a single request, and route each result back to
+    its caller.
+    
+    The window adapts to load: it collapses to zero while batches contain a
+    single evaluation, so latency at low QPS is unchanged, and grows towards
+    `max_wait` while evaluations arrive concurrently.
+    
+    Evaluations whose caller stopped waiting before their batch left are not
+    sent and fail with DeadlineExceededError, since the time ran out in the
+    client's queue rather than at the server; a batch's request timeout is
+    the longest wait of its callers.
+    
+    With an AdaptiveLimiter, a dispatcher takes a slot before forming each
+    batch, so the limiter controls how many batches are in flight; while it
+    holds the limit down, evaluations accumulate into larger batches.
+    """
+    
+    def __init__(
+        self,
+        send_batch: BatchSender,
+        max_batch_size: int = 32,
+        max_wait: float = 0.005,
+        dispatchers: int = 4,
+        logger: Optional[logging.Logger] = None,
+        limiter: Optional["AdaptiveLimiter"] = None
+    ):
+        """
+        Initialize the batcher.
+        
+        Args:
+            send_batch: Function that sends one batch to the policy server.
+            max_batch_size: Maximum number of evaluations per batch.
+            max_wait: Upper bound of the batching window, in seconds.
+            dispatchers: Number of batches that may be in flight at once.
+            logger: Optional logger.
+            limiter: Optional adaptive limit on batches in flight, below `dispatchers`.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        
+        self.send_batch = send_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.dispatchers = dispatchers
+        self.logger = logger
+        self.limiter = limiter
+        self.window = 0.0
+        self.batches_sent = 0
+        self.evaluations_sent = 0
+        self.evaluations_expired = 0
+        self._pending: List[_PendingEvaluation] = []
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+    
+    def submit(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate a policy as part of the next batch.
+        
+        Args:
+            policy_name: Name of the policy to evaluate.
+            input_data: Input data to evaluate against the policy.
+            timeout: Optional maximum time to wait for the result, in seconds;
+              also bounds the time the evaluation may spend queued.
+        
+        Returns:
+            Policy evaluation result.
+        
+        Raises:
+            DeadlineExceededError: If `timeout` expires before the evaluation is sent
+            ServerConnectionError: If the result of the sent evaluation does not arrive
+              within `timeout`
+            The exception reported for this evaluation by the batch sender.
+        """
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        pending = _PendingEvaluation(policy_name, input_data, expires_at)
+        
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            if not self._threads:
+                self._start()
+            self._pending.append(pending)
+            self._cond.notify()
+        
+        if not pending.done.wait(timeout):
+            with self._cond:
+                queued = pending in self._pending
+                if queued:
+                    self._pending.remove(pending)
+                    self.evaluations_expired += 1
+            if queued:
+                raise DeadlineExceededError(f"Batched evaluation of '{policy_name}' expired while queued")
+            if not pending.done.is_set():
+                raise ServerConnectionError(f"Batched evaluation of '{policy_name}' timed out")
+        if pending.error is not None:
+            raise pending.error
+        if pending.result is None:
+            raise PolicyEvaluationError(f"Batched evaluation of '{policy_name}' returned no result")
+        return pending.result
+    
+    def _start(self) -> None:
+        for i in range(self.dispatchers):
+            thread = threading.Thread(
+                target=self._dispatch_loop,
+                name=f"tavoai-batcher-{i}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+    
+    def _next_batch(self) -> List[_PendingEvaluation]:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            
+            if self.window > 0 and not self._closed:
+                self._cond.wait_for(
+                    lambda: len(self._pending) >= self.max_batch_size or self._closed,
+                    timeout=self.window
+                )
+            
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            self._adapt(len(batch))
+            return batch
+    
+    def _adapt(self, batch_size: int) -> None:
+        # Must be called with the condition held
+        step = self.max_wait / 8
+        if batch_size <= 1:
+            self.window = self.window / 2 if self.window > step else 0.0
+        else:
+            self.window = min(self.max_wait, max(self.window * 2, step))
+    
+    def _dispatch_loop(self) -> None:
+        while True:
+            if self.limiter is None:
+                batch = self._next_batch()
+                if not batch:
+                    return
+                self._send(batch)
+                continue
+            
+            self.limiter.acquire()
+            batch = self._next_batch()
+            if not batch:
+                self.limiter.release()
+                return
+            started = time.monotonic()
+            failed = self._send(batch)
+            self.limiter.release(time.monotonic() - started, failed)
+    
+    def _send(self, batch: List[_PendingEvaluation]) -> bool:
+        """Send a batch and route its outcomes; returns whether the request as a whole failed."""
+        now = time.monotonic()
+        expired = [p for p in batch if p.expires_at is not None and p.expires_at <= now]
+        if expired:
+            # Their callers have already given up; sending them would only waste server work
+            for pending in expired:
+                pending.error = DeadlineExceededError(
+                    f"Batched evaluation of '{pending.policy_name}' expired while queued"
+                )
+                pending.done.set()
+            batch = [p for p in batch if p.expires_at is None or p.expires_at > now]
+            with self._cond:
+                self.evaluations_expired += len(expired)
+            if not batch:
+                return False
+        
+        expirations = [p.expires_at for p in batch if p.expires_at is not None]
+        timeout = max(expirations) - now if len(expirations) == len(batch) else None
+        
+        try:
+            outcomes = self.send_batch([(p.policy_name, p.input_data) for p in batch], timeout)
+            if len(outcomes) != len(batch):
+                raise ValueError(f"Expected {len(batch)} batch results, got {len(outcomes)}")
+            failed = False
+        except Exception as e:
+            outcomes = [e] * len(batch)
+            failed = True
+        
+        with self._cond:
+            self.batches_sent += 1
+            self.evaluations_sent += len(batch)
+        
+        for pending, outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                pending.error = outcome
+            else:
+                pending.result = outcome
+            pending.done.set()
+        return failed
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return batching statistics.
+        
+        Returns:
+            Dictionary with the batches and evaluations sent, the evaluations
+            dropped because they expired while queued, the average batch size
+            and the current batching window in seconds.
+        """
+        batches = self.batches_sent
+        return {
+            "batches_sent": batches,
+            "evaluations_sent": self.evaluations_sent,
+            "evaluations_expired": self.evaluations_expired,
+            "average_batch_size": self.evaluations_sent / batches if batches else 0.0,
+            "window": self.window,
+        }
+    
+    def _after_fork_in_child(self) -> None:
+        # Dispatcher threads and waiting callers belong to the parent process;
+        # dispatchers are restarted on the next submit
+        self._cond = threading.Condition()
+        self._pending = []
+        self._threads = []
+        self.window = 0.0
+        self.batches_sent = 0
+        self.evaluations_sent = 0
+        self.evaluations_expired = 0
+    
+    def close(self) -> None:
+        """Send any pending evaluations and stop the dispatcher threads."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            threads = list(self._threads)
+        
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=1.0)
@@ -0,0 +1,292 @@
+"""Load-testing harness for the TavoAI SDK."""
+
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Return a nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class BenchmarkResult:
+    """Throughput, latency and memory figures of one benchmark run."""
+    
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        latencies: List[float],
+        errors: int,
+        duration: float,
+        peak_traced_bytes: Optional[int] = None,
+        peak_rss_kb: Optional[int] = None
+    ):
+        """
+        Initialize the result.
+        
+        Args:
+            name: Benchmark name.
+            concurrency: Number of concurrent workers.
+            latencies: Per-operation latencies, in seconds.
+            errors: Number of operations that raised.
+            duration: Wall-clock duration of the run, in seconds.
+            peak_traced_bytes: Peak memory allocated during the run, if traced.
+            peak_rss_kb: Peak resident set size of the process, if available.
+        """
+        ordered = sorted(latencies)
+        self.name = name
+        self.concurrency = concurrency
+        self.operations = len(latencies)
+        self.errors = errors
+        self.duration = duration
+        self.throughput = self.operations / duration if duration > 0 else 0.0
+        self.p50_ms = _percentile(ordered, 0.50) * 1000
+        self.p95_ms = _percentile(ordered, 0.95) * 1000
+        self.p99_ms = _percentile(ordered, 0.99) * 1000
+        self.peak_traced_bytes = peak_traced_bytes
+        self.peak_rss_kb = peak_rss_kb
+    
+    @property
+    def key(self) -> str:
+        """Identifier used to match results across runs."""
+        return f"{self.name}@{self.concurrency}"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a JSON-serializable dictionary."""
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "operations": self.operations,
+            "errors": self.errors,
+            "duration": self.duration,
+            "throughput": self.throughput,
+            "p50_ms": self.p50_ms,
+            "p95_ms": self.p95_ms,
+            "p99_ms": self.p99_ms,
+            "peak_traced_bytes": self.peak_traced_bytes,
+            "peak_rss_kb": self.peak_rss_kb,
+        }
+    
+    def __str__(self) -> str:
+        memory = ""
+        if self.peak_traced_bytes is not None:
+            memory = f"  peak {self.peak_traced_bytes / 1024:.0f} KiB"
+        return (
+            f"{self.key:<40} {self.throughput:>10.1f} ops/s  "
+            f"p50 {self.p50_ms:>7.2f} ms  p95 {self.p95_ms:>7.2f} ms  "
+            f"p99 {self.p99_ms:>7.2f} ms  errors {self.errors}{memory}"
+        )
+
+
+def run_benchmark(
+    name: str,
+    operation: Callable[[int], Any],
+    concurrency: int = 1,
+    operations: int = 1000,
+    warmup: int = 10,
+    trace_memory: bool = False
+) -> BenchmarkResult:
+    """
+    Run an operation from several threads and measure it.
+    
+    Args:
+        name: Benchmark name.
+        operation: Callable receiving the operation index.
+        concurrency: Number of concurrent worker threads.
+        operations: Total number of operations across all workers.
+        warmup: Number of untimed operations run before measuring.
+        trace_memory: Whether to trace Python allocations with tracemalloc.
+          Tracing slows the run down, so timings are not comparable with untraced runs.
+    
+    Returns:
+        BenchmarkResult for the run.
+    """
+    for i in range(warmup):
+        operation(i)
+    
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    counter = iter(range(operations))
+    counter_lock = threading.Lock()
+    start_barrier = threading.Barrier(concurrency + 1)
+    
+    def worker(slot: int) -> None:
+        start_barrier.wait()
+        timings = latencies[slot]
+        while True:
+            with counter_lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            started = time.perf_counter()
+            try:
+                operation(index)
+            except Exception:
+                errors[slot] += 1
+            timings.append(time.perf_counter() - started)
+    
+    threads = [threading.Thread(target=worker, args=(slot,), daemon=True) for slot in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    
+    if trace_memory:
+        tracemalloc.start()
+    start_barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - started
+    
+    peak_traced = None
+    if trace_memory:
+        peak_traced = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if HAS_RESOURCE else None
+    
+    return BenchmarkResult(
+        name,
+        concurrency,
+        [latency for timings in latencies for latency in timings],
+        sum(errors),
+        duration,
+        peak_traced_bytes=peak_traced,
+        peak_rss_kb=peak_rss
+    )
+
+
+def save_results(results: List[BenchmarkResult], path: str) -> None:
+    """
+    Save benchmark results as JSON.
+    
+    Args:
+        results: Results to save.
+        path: Destination file.
+    """
+    with open(path, "w") as f:
+        json.dump([result.to_dict() for result in results], f, indent=2)
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load benchmark results saved with `save_results`.
+    
+    Args:
+        path: File to load.
+    
+    Returns:
+        Mapping of result keys (`name@concurrency`) to result dictionaries.
+    """
+    with open(path) as f:
+        return {f"{entry['name']}@{entry['concurrency']}": entry for entry in json.load(f)}
+
+
+def compare_results(
+    baseline: Dict[str, Dict[str, Any]],
+    results: List[BenchmarkResult],
+    tolerance: float = 0.10
+) -> List[str]:
+    """
+    Compare results against a baseline run.
+    
+    A regression is a throughput drop or a p99 latency increase larger than
+    `tolerance`, relative to the baseline.
+    
+    Args:
+        baseline: Baseline results, as returned by `load_results`.
+        results: Results of the current run.
+        tolerance: Allowed relative change.
+    
+    Returns:
+        Human-readable description of each regression; empty if none.
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.key)
+        if previous is None:
+            continue
+        
+        if previous["throughput"] and result.throughput < previous["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{result.key}: throughput {result.throughput:.1f} ops/s "
+                f"(baseline {previous['throughput']:.1f} ops/s)"
+            )
+        if previous["p99_ms"] and result.p99_ms > previous["p99_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{result.key}: p99 {result.p99_ms:.2f} ms (baseline {previous['p99_ms']:.2f} ms)"
+            )
+    return regressions
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, int, bool]]:
+    """
+    Parse `python -X importtime` output.
+    
+    Returns:
+        (module, cumulative microseconds, is top-level import) for each imported module
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented and already part of their parent's cumulative time
+        entries.append((name.strip(), int(cumulative), not name[1:].startswith(" ")))
+    return entries
+
+
+def measure_import_time(statement: str, runs: int = 5, top: int = 10) -> Dict[str, Any]:
+    """
+    Measure the import cost of a statement with `python -X importtime`.
+    
+    Each run happens in a fresh interpreter. Modules the interpreter imports
+    on its own at startup, found by running `pass`, are not counted.
+    
+    Args:
+        statement: Python statement to measure, e.g. "import tavoai.sdk".
+        runs: Number of interpreter runs; the median is reported.
+        top: Number of most expensive modules to report.
+    
+    Returns:
+        Dictionary with the statement, the median import time in milliseconds
+        and the most expensive modules of the last run.
+    """
+    def run(code: str) -> List[Tuple[str, int, bool]]:
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return _parse_importtime(completed.stderr)
+    
+    startup_modules = {name for name, _, _ in run("pass")}
+    totals = []
+    entries: List[Tuple[str, int, bool]] = []
+    for _ in range(runs):
+        entries = [entry for entry in run(statement) if entry[0] not in startup_modules]
+        totals.append(sum(cumulative for _, cumulative, top_level in entries if top_level))
+    
+    slowest = sorted(entries, key=lambda entry: entry[1], reverse=True)[:top]
+    
+    return {
+        "statement": statement,
+        "import_ms": statistics.median(totals) / 1000,
+        "slowest_modules": [{"module": name, "cumulative_ms": us / 1000} for name, us, _ in slowest],
+    }
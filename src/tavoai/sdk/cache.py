@@ -0,0 +1,139 @@
+"""Verdict caching for the TavoAI SDK."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Protocol, Tuple
+
+from tavoai.sdk.models import PolicyResult
+
+
+def verdict_cache_key(policy_name: str, input_data: Dict[str, Any], version: Optional[str] = None) -> str:
+    """
+    Build a cache key for a policy evaluation.
+    
+    The request ID is excluded so that identical content evaluated under
+    different requests maps to the same key. Keys include the policy version
+    when it is known, so verdicts of a previous version are never served.
+    
+    Args:
+        policy_name: Name of the policy.
+        input_data: Input data sent to the policy server.
+        version: Optional version of the policy.
+    
+    Returns:
+        `policy_name[@version]:` followed by a hex digest identifying the evaluation.
+    """
+    # Deferred so that importing the client does not load hashlib and json
+    import hashlib
+    import json
+    
+    keyed = {k: v for k, v in input_data.items() if k != "request_id"}
+    encoded = json.dumps(keyed, sort_keys=True, default=str).encode("utf-8")
+    prefix = policy_name if version is None else f"{policy_name}@{version}"
+    return prefix + ":" + hashlib.sha256(encoded).hexdigest()
+
+
+class VerdictStore(Protocol):
+    """Interface shared by the verdict caches."""
+    
+    def get(self, key: str) -> Optional[PolicyResult]:
+        ...
+    
+    def put(self, key: str, result: PolicyResult) -> None:
+        ...
+    
+    def clear(self) -> None:
+        ...
+
+
+class VerdictCache:
+    """
+    Thread-safe LRU cache of policy verdicts.
+    
+    Entries are evicted once the cache holds more than `max_size` verdicts,
+    and optionally expire after `ttl` seconds.
+    """
+    
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of verdicts to keep.
+            ttl: Optional time-to-live for entries, in seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, PolicyResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[PolicyResult]:
+        """
+        Look up a verdict.
+        
+        Args:
+            key: Cache key, see `verdict_cache_key`.
+        
+        Returns:
+            The cached PolicyResult, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            stored_at, result = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return result
+    
+    def put(self, key: str, result: PolicyResult) -> None:
+        """
+        Store a verdict.
+        
+        Args:
+            key: Cache key, see `verdict_cache_key`.
+            result: Verdict to store.
+        """
+        if self.max_size <= 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached verdicts."""
+        with self._lock:
+            self._entries.clear()
+    
+    def invalidate_policy(self, policy_name: str) -> int:
+        """
+        Remove the verdicts of one policy, whatever their version.
+        
+        Args:
+            policy_name: Name of the policy.
+        
+        Returns:
+            Number of verdicts removed.
+        """
+        prefixes = (policy_name + ":", policy_name + "@")
+        with self._lock:
+            stale = [key for key in self._entries if key.startswith(prefixes)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    def _after_fork_in_child(self) -> None:
+        # Entries inherited from the parent stay valid; only the lock is replaced
+        self._lock = threading.Lock()
@@ -1,18 +1,52 @@
 """Client for interacting with TavoAI regulatory guardrails."""
 
 import logging
-from typing import Dict, Any, Optional, Callable
-
-import requests
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Any, Iterable, List, Optional, Callable, Sequence, Tuple, TypeVar, Union
 
 from tavoai.sdk.models import PolicyResult, ContentType
 from tavoai.sdk.exceptions import (
+    ConcurrencyLimitError,
+    DeadlineExceededError,
     PolicyEvaluationError,
     PolicyNotFoundError,
-    ServerConnectionError
+    ServerConnectionError,
+    StageTimeoutError
 )
+from tavoai.sdk.cache import VerdictCache, VerdictStore, verdict_cache_key
+from tavoai.sdk.deadline import Deadline, DeadlineSpec, resolve_deadline
+from tavoai.sdk.degradation import DegradationPolicy, ServerHealthMonitor
+from tavoai.sdk.multiprocess import LocalStats, SharedStats, register_fork_aware
+from tavoai.sdk.transport import REQUESTS, Transport, create_transport, unix_socket_path
 from tavoai.sdk.utils import configure_logger
 
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+    from tavoai.sdk.audit import AuditSink
+    from tavoai.sdk.normalize import ContentNormalizer, NearDuplicateIndex
+    from tavoai.sdk.session import ConversationSession
+    from tavoai.sdk.shadow import ShadowDisagreement, ShadowEvaluator, ShadowPolicy
+
+# Name of the SDK logger; handlers are attached on first use
+LOGGER_NAME = "tavoai_sdk"
+
+# Type of the results of rejection handlers
+R = TypeVar("R")
+
+# Counters recorded by every client, see TavoAIClient.stats()
+STATS_FIELDS = (
+    "evaluations",
+    "server_requests",
+    "cache_hits",
+    "degraded",
+    "deadline_exceeded",
+    "errors",
+    "prewarmed",
+    "near_duplicate_hits",
+)
+
 
 class TavoAIClient:
     """
@@ -25,25 +59,369 @@ class TavoAIClient:
     def __init__(
         self, 
         api_base_url: str = "http://localhost:5000",
-        log_level: int = logging.INFO
+        log_level: int = logging.INFO,
+        timeout: float = 10.0,
+        degradation: Optional[Dict[str, DegradationPolicy]] = None,
+        default_degradation: Optional[DegradationPolicy] = None,
+        health_probe_interval: float = 5.0,
+        last_known_cache_size: int = 1024,
+        micro_batching: bool = False,
+        batch_max_size: int = 32,
+        batch_max_wait: float = 0.005,
+        pool_maxsize: int = 32,
+        result_cache: Optional[VerdictStore] = None,
+        last_known_cache: Optional[VerdictStore] = None,
+        shared_stats: Optional[SharedStats] = None,
+        shadow_policies: Optional[Dict[str, "ShadowPolicy"]] = None,
+        shadow_queue_size: int = 1000,
+        on_shadow_disagreement: Optional[Callable[["ShadowDisagreement"], Any]] = None,
+        audit_sink: Optional["AuditSink"] = None,
+        deadline_degradation: Optional[DegradationPolicy] = None,
+        min_call_budget: float = 0.0,
+        adaptive_concurrency: bool = False,
+        max_concurrency: int = 64,
+        watch_policy_versions: bool = False,
+        prewarm_size: int = 32,
+        transport: Union[str, Transport] = REQUESTS,
+        normalizers: Optional[Dict[str, "ContentNormalizer"]] = None,
+        default_normalizer: Optional["ContentNormalizer"] = None
     ):
         """
         Initialize the TavoAI client.
         
         Args:
-            api_base_url: Base URL for the policy server API.
+            api_base_url: Base URL for the policy server API, or unix:///path/to.sock for
+              a policy server listening on a Unix domain socket.
             log_level: Logging level.
+            timeout: Default timeout, in seconds, of requests to the policy server.
+            degradation: Optional mapping of policy names to the degradation policy
+              applied when the policy server is unreachable.
+            default_degradation: Degradation policy for policies not listed in `degradation`.
+              When neither is set, connection failures raise ServerConnectionError.
+            health_probe_interval: Seconds between health probes while the server is unreachable.
+            last_known_cache_size: Number of server verdicts kept for DegradationMode.LAST_KNOWN.
+            micro_batching: Whether to send concurrent evaluations as batched requests;
+              turned off if the server has no batch endpoint.
+            batch_max_size: Maximum number of evaluations per batched request.
+            batch_max_wait: Upper bound, in seconds, of the adaptive batching window.
+            pool_maxsize: Maximum number of pooled connections to the policy server.
+            result_cache: Optional cache serving repeated evaluations without a server
+              round trip, e.g. a VerdictCache with a TTL or a SharedVerdictCache.
+            last_known_cache: Optional store for DegradationMode.LAST_KNOWN verdicts,
+              replacing the in-process cache sized by `last_known_cache_size`.
+            shared_stats: Optional SharedStats created with STATS_FIELDS before forking,
+              so that counters of all worker processes can be aggregated.
+            shadow_policies: Optional mapping of primary policy names to shadow policies,
+              evaluated in the background on a sample of traffic without affecting verdicts.
+            shadow_queue_size: Maximum number of pending shadow evaluations; further
+              shadow evaluations are dropped.
+            on_shadow_disagreement: Optional callback called from a background thread
+              when a shadow verdict differs from the primary verdict.
+            audit_sink: Optional AuditSink receiving a record of every evaluation,
+              written from a background thread. The caller owns the sink and closes it.
+            deadline_degradation: Optional degradation policy producing the verdict when
+              an evaluation's deadline leaves no time for a server call, or its timeout
+              expires while it waits for a micro-batch. When unset, DeadlineExceededError
+              is raised.
+            min_call_budget: Smallest remaining budget, in seconds, worth spending on a
+              server call; with less time left the call is not made.
+            adaptive_concurrency: Whether to adapt the number of in-flight requests (or
+              batches, with micro-batching) to the latency and errors of the server.
+            max_concurrency: Upper bound on in-flight requests, and number of worker
+              threads of `evaluate_batch` and `evaluate_policies`.
+            watch_policy_versions: Whether to subscribe to the server's policy version
+              events. Cached verdicts of a policy are dropped when its version changes,
+              and cache keys include the version. Not available over Unix domain sockets.
+            prewarm_size: Number of recent inputs per policy re-evaluated in the
+              background after a version change, so that the cache is warm for the
+              new version; 0 disables pre-warming.
+            transport: How requests reach the policy server: "requests" (HTTP/1.1 through
+              a requests session), "http1" (HTTP/1.1 through a bounded urllib3 pool),
+              "http2" (multiplexed HTTP/2, requires httpx), "framed" (length-prefixed
+              binary messages over a unix:// socket, msgpack-encoded when installed), or
+              a transport instance such as an InMemoryTransport.
+            normalizers: Optional mapping of policy names to the ContentNormalizer
+              canonicalizing their content before evaluation and caching. The server
+              evaluates the normalized content, so only normalize policies whose
+              verdicts do not depend on what normalization removes. A normalizer with
+              a NearDuplicateIndex also reuses verdicts of similar content.
+            default_normalizer: Normalizer for policies not listed in `normalizers`.
+        
+        A client created before a fork (e.g. by a pre-fork server) rebuilds its
+        connection pool, locks and background threads in each child process.
         """
         self.api_base_url = api_base_url
-        self.logger = configure_logger("tavoai_sdk", log_level)
+        self.log_level = log_level
+        self.timeout = timeout
+        self._logger: Optional[logging.Logger] = None
+        self.degradation = dict(degradation or {})
+        self.default_degradation = default_degradation
+        self.normalizers = dict(normalizers or {})
+        self.default_normalizer = default_normalizer
+        self.health = ServerHealthMonitor(
+            self._probe_server,
+            probe_interval=health_probe_interval,
+            logger=logging.getLogger(LOGGER_NAME)
+        )
+        self.last_known = last_known_cache or VerdictCache(max_size=last_known_cache_size)
+        self.result_cache = result_cache
+        self.counters = shared_stats or LocalStats(STATS_FIELDS)
+        self.pool_maxsize = pool_maxsize
+        self.transport = create_transport(transport, api_base_url, pool_maxsize)
+        self.max_concurrency = max_concurrency
+        self._executor: Optional["ThreadPoolExecutor"] = None
+        self.limiter: Optional["AdaptiveLimiter"] = None
+        if adaptive_concurrency:
+            from tavoai.sdk.concurrency import AdaptiveLimiter
+            self.limiter = AdaptiveLimiter(
+                initial_limit=min(8, max_concurrency),
+                max_limit=max_concurrency
+            )
+        self.batcher: Optional["MicroBatcher"] = None
+        if micro_batching:
+            from tavoai.sdk.batching import MicroBatcher
+            self.batcher = MicroBatcher(
+                self._evaluate_policy_batch,
+                max_batch_size=batch_max_size,
+                max_wait=batch_max_wait,
+                dispatchers=max_concurrency if self.limiter else 4,
+                logger=logging.getLogger(LOGGER_NAME),
+                limiter=self.limiter
+            )
+        # Cleared when the server turns out not to implement the batch endpoint
+        self.batch_endpoint = True
+        self.shadow_policies: Dict[str, "ShadowPolicy"] = {}
+        self.shadow_queue_size = shadow_queue_size
+        self.on_shadow_disagreement = on_shadow_disagreement
+        self.shadow: Optional["ShadowEvaluator"] = None
+        self.audit_sink = audit_sink
+        self.deadline_degradation = deadline_degradation
+        self.min_call_budget = min_call_budget
+        for primary_policy, shadow_policy in (shadow_policies or {}).items():
+            self.add_shadow_policy(primary_policy, shadow_policy.policy_name, shadow_policy.sample_rate)
+        self.policy_versions: Dict[str, str] = {}
+        self.prewarm_size = prewarm_size
+        self._recent_inputs: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {}
+        self._recent_lock = threading.Lock()
+        self.watcher: Optional["PolicyVersionWatcher"] = None
+        if watch_policy_versions:
+            if unix_socket_path(api_base_url) is not None:
+                raise ValueError("Policy version events are not available over Unix domain sockets")
+            from tavoai.sdk.notifications import PolicyVersionWatcher
+            self.watcher = PolicyVersionWatcher(
+                api_base_url,
+                self._on_policy_version,
+                logger=logging.getLogger(LOGGER_NAME),
+                transport=self.transport
+            ).start()
+        register_fork_aware(self)
+    
+    @property
+    def logger(self) -> logging.Logger:
+        """SDK logger, configured on first use."""
+        if self._logger is None:
+            self._logger = configure_logger(LOGGER_NAME, self.log_level)
+        return self._logger
+    
+    @property
+    def http_session(self) -> Optional[Any]:
+        """Pooled HTTP session of the current process with the "requests" transport, None with others."""
+        return getattr(self.transport, "session", None)
+    
+    def _after_fork_in_child(self) -> None:
+        """Drop state inherited from the parent process so the child rebuilds its own."""
+        self._executor = None
+        self.health._after_fork_in_child()
+        if self.batcher:
+            self.batcher._after_fork_in_child()
+        if self.shadow:
+            self.shadow._after_fork_in_child()
+        # Sockets of the parent's connections must not be shared; the child opens its own
+        for component in (self.transport, self.last_known, self.result_cache, self.counters, self.limiter):
+            reset = getattr(component, "_after_fork_in_child", None)
+            if reset is not None:
+                reset()
+        self._recent_lock = threading.Lock()
+        if self.watcher:
+            # Known versions stay valid; the child subscribes to changes on its own
+            self.watcher._after_fork_in_child()
+            self.watcher.start()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return evaluation statistics.
+        
+        Returns:
+            Dictionary with the evaluation counters, summed across worker processes
+            when a SharedStats is used, and the statistics of the enabled components:
+            micro-batching, adaptive concurrency, shadow evaluation, auditing,
+            policy version events and content normalization (per policy, "*" for the
+            default normalizer).
+        """
+        stats: Dict[str, Any] = dict(self.counters.snapshot())
+        if self.batcher:
+            stats["batching"] = self.batcher.stats()
+        if self.limiter:
+            stats["concurrency"] = self.limiter.stats()
+        if self.shadow:
+            stats["shadow"] = self.shadow.stats()
+        if self.audit_sink:
+            stats["audit"] = self.audit_sink.stats()
+        if self.watcher:
+            stats["policy_versions"] = self.watcher.stats()
+        normalizers = dict(self.normalizers)
+        if self.default_normalizer is not None:
+            normalizers.setdefault("*", self.default_normalizer)
+        if normalizers:
+            stats["normalization"] = {policy: normalizer.stats() for policy, normalizer in normalizers.items()}
+        return stats
+    
+    def add_shadow_policy(self, primary_policy: str, shadow_policy: str, sample_rate: float = 1.0) -> None:
+        """
+        Evaluate a shadow policy alongside a primary policy.
+        
+        On a `sample_rate` fraction of the primary policy's evaluations, the
+        same input is queued for the shadow policy and evaluated by a background
+        worker. The caller always receives the primary verdict; disagreements
+        are recorded in `client.shadow.disagreements` and counted in `stats()`.
+        
+        Args:
+            primary_policy: Name of the policy whose verdicts are returned.
+            shadow_policy: Name of the candidate policy.
+            sample_rate: Fraction of evaluations to shadow.
+        """
+        from tavoai.sdk.shadow import ShadowPolicy
+        
+        self._shadow_evaluator()
+        self.shadow_policies[primary_policy] = ShadowPolicy(shadow_policy, sample_rate)
+    
+    def _shadow_evaluator(self) -> "ShadowEvaluator":
+        """Return the background evaluator of shadow policies, created on first use."""
+        if self.shadow is None:
+            from tavoai.sdk.shadow import ShadowEvaluator
+            
+            self.shadow = ShadowEvaluator(
+                self._evaluate_shadow,
+                queue_size=self.shadow_queue_size,
+                on_disagreement=self.on_shadow_disagreement,
+                logger=logging.getLogger(LOGGER_NAME)
+            )
+        return self.shadow
+    
+    def _evaluate_shadow(self, policy_name: str, input_data: Dict[str, Any]) -> PolicyResult:
+        """Evaluate a shadow policy, bypassing caches and degraded mode."""
+        return self._to_policy_result(self._send_evaluation(policy_name, input_data))
+    
+    def _probe_server(self) -> bool:
+        """
+        Check whether the policy server accepts connections.
+        
+        Any HTTP response counts as reachable; only connection failures and
+        timeouts count as unreachable.
+        
+        Returns:
+            True if the server responded.
+        """
+        try:
+            self.transport.request("GET", "/health", timeout=2)
+            return True
+        except (ConnectionError, TimeoutError):
+            return False
+    
+    def _degradation_for(self, policy_name: str) -> Optional[DegradationPolicy]:
+        """Return the degradation policy configured for a policy, if any."""
+        return self.degradation.get(policy_name, self.default_degradation)
+    
+    def _normalizer_for(self, policy_name: str) -> Optional["ContentNormalizer"]:
+        """Return the content normalizer configured for a policy, if any."""
+        return self.normalizers.get(policy_name, self.default_normalizer)
     
-    def _evaluate_policy(self, policy_name: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _near_duplicate_index(self, policy_name: str) -> Optional["NearDuplicateIndex"]:
+        """Return the near-duplicate index of a policy that declared verdict reuse safe, if any."""
+        normalizer = self._normalizer_for(policy_name)
+        return normalizer.near_duplicates if normalizer is not None else None
+    
+    def _near_duplicate_context(self, policy_name: str, input_data: Dict[str, Any]) -> str:
+        """Key of everything but the content that a reused verdict must share."""
+        context = {k: v for k, v in input_data.items() if k != "content"}
+        return verdict_cache_key(policy_name, context, self.policy_versions.get(policy_name))
+    
+    def _degrade(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        degradation: DegradationPolicy,
+        cache_key: str
+    ) -> PolicyResult:
+        """
+        Produce a degraded verdict for an evaluation the server could not serve.
+        
+        Raises:
+            ServerConnectionError: If the degradation policy is DegradationMode.RAISE
+        """
+        result = degradation.resolve(policy_name, input_data, self.last_known.get(cache_key))
+        if result is None:
+            raise ServerConnectionError(f"Policy server at {self.api_base_url} is unavailable")
+        
+        self.counters.increment("degraded")
+        self.logger.warning(
+            f"Degraded verdict for {policy_name} policy ({result.degraded_mode}): allowed={result.allowed}"
+        )
+        return result
+    
+    def _deadline_exceeded(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        cache_key: str
+    ) -> PolicyResult:
+        """
+        Produce the verdict for an evaluation whose deadline left no time for the server.
+        
+        Raises:
+            DeadlineExceededError: If no deadline degradation policy is configured,
+              or its mode is DegradationMode.RAISE
+        """
+        self.counters.increment("deadline_exceeded")
+        msg = f"Deadline exceeded before {policy_name} policy could be evaluated"
+        result = None
+        if self.deadline_degradation is not None:
+            last_known = self.last_known.get(cache_key) if cache_key else None
+            result = self.deadline_degradation.resolve(policy_name, input_data, last_known, cause="Deadline exceeded")
+        if result is None:
+            self.logger.error(msg)
+            raise DeadlineExceededError(msg)
+        
+        self.logger.warning(f"{msg}; returning {result.degraded_mode} verdict: allowed={result.allowed}")
+        return result
+    
+    def close(self) -> None:
+        """Stop background activity started by the client."""
+        if self.watcher:
+            self.watcher.close()
+        if self.shadow:
+            self.shadow.close()
+        if self.batcher:
+            self.batcher.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.health.close()
+        self.transport.close()
+    
+    def _evaluate_policy(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Evaluate a policy against input data via REST API.
         
         Args:
             policy_name: Name of the policy to evaluate.
             input_data: Input data to evaluate against the policy.
+            timeout: Optional request timeout in seconds, defaults to the client timeout.
             
         Returns:
             Policy evaluation result.
@@ -55,31 +433,20 @@ class TavoAIClient:
         """
         try:
             # Use the RESTful endpoint /policies/{policy_name}/evaluate
-            response = requests.post(
-                f"{self.api_base_url}/policies/{policy_name}/evaluate",
-                json={"input": input_data},
-                timeout=10
+            response = self.transport.request(
+                "POST",
+                f"/policies/{policy_name}/evaluate",
+                {"input": input_data},
+                self.timeout if timeout is None else timeout
             )
             
-            if response.status_code == 404:
-                msg = f"Policy '{policy_name}' not found"
-                self.logger.error(msg)
-                raise PolicyNotFoundError(msg)
-            elif response.status_code != 200:
-                msg = f"Policy evaluation failed: {response.text}"
-                self.logger.error(msg)
-                raise PolicyEvaluationError(msg)
+            self._check_status(policy_name, response.status_code, response.text)
             
-            return response.json()
+            result: Dict[str, Any] = response.json()
+            return result
             
-        except requests.exceptions.ConnectionError:
-            msg = f"Could not connect to server at {self.api_base_url}"
-            self.logger.error(msg)
-            raise ServerConnectionError(msg)
-        except requests.exceptions.Timeout:
-            msg = f"Connection to {self.api_base_url} timed out"
-            self.logger.error(msg)
-            raise ServerConnectionError(msg)
+        except (ConnectionError, TimeoutError) as e:
+            raise self._connection_error(e)
         except (PolicyNotFoundError, ServerConnectionError, PolicyEvaluationError):
             # Re-raise these specific exceptions
             raise
@@ -88,6 +455,351 @@ class TavoAIClient:
             self.logger.error(msg)
             raise PolicyEvaluationError(msg)
     
+    def _connection_error(self, error: OSError) -> ServerConnectionError:
+        """Log a transport failure and return the ServerConnectionError to raise."""
+        if isinstance(error, TimeoutError):
+            msg = f"Connection to {self.api_base_url} timed out"
+        else:
+            msg = f"Could not connect to server at {self.api_base_url}"
+        self.logger.error(msg)
+        return ServerConnectionError(msg)
+    
+    def _check_status(self, policy_name: str, status_code: int, text: str) -> None:
+        """
+        Raise the SDK exception matching a policy server status code.
+        
+        Raises:
+            PolicyNotFoundError: If the policy is not found
+            PolicyEvaluationError: If evaluation fails for other reasons
+        """
+        if status_code == 404:
+            msg = f"Policy '{policy_name}' not found"
+            self.logger.error(msg)
+            raise PolicyNotFoundError(msg)
+        elif status_code != 200:
+            msg = f"Policy evaluation failed: {text}"
+            self.logger.error(msg)
+            raise PolicyEvaluationError(msg)
+    
+    def _evaluate_policy_batch(
+        self,
+        evaluations: List[Tuple[str, Dict[str, Any]]],
+        timeout: Optional[float] = None
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Evaluate several policies with a single request to the batch endpoint.
+        
+        The endpoint receives `{"evaluations": [{"policy": ..., "input": ...}]}`
+        and answers `{"results": [{"status": ..., "result": ... | "error": ...}]}`
+        with one entry per evaluation, in order. Servers answering 404 do not
+        implement it: the batch is then evaluated one policy per request, and
+        later evaluations bypass the micro-batcher.
+        
+        Args:
+            evaluations: (policy_name, input_data) pairs to evaluate.
+            timeout: Optional request timeout in seconds, defaults to the client timeout.
+            
+        Returns:
+            For each evaluation, the policy evaluation result or the exception to raise.
+            
+        Raises:
+            ServerConnectionError: If connection to the server fails
+            PolicyEvaluationError: If the batch request fails as a whole
+        """
+        try:
+            response = self.transport.request(
+                "POST",
+                "/batch/evaluate",
+                {"evaluations": [
+                    {"policy": policy_name, "input": input_data}
+                    for policy_name, input_data in evaluations
+                ]},
+                self.timeout if timeout is None else timeout
+            )
+            
+            if response.status_code == 404:
+                self.logger.warning(
+                    f"Policy server at {self.api_base_url} has no batch endpoint; disabling micro-batching"
+                )
+                self.batch_endpoint = False
+                return self._evaluate_policies_singly(evaluations, timeout)
+            if response.status_code != 200:
+                msg = f"Batch policy evaluation failed: {response.text}"
+                self.logger.error(msg)
+                raise PolicyEvaluationError(msg)
+            
+            entries = response.json()["results"]
+            
+        except (ConnectionError, TimeoutError) as e:
+            raise self._connection_error(e)
+        except PolicyEvaluationError:
+            raise
+        except Exception as e:
+            msg = f"Error evaluating policy batch: {str(e)}"
+            self.logger.error(msg)
+            raise PolicyEvaluationError(msg)
+        
+        outcomes: List[Union[Dict[str, Any], Exception]] = []
+        for (policy_name, _), entry in zip(evaluations, entries):
+            try:
+                self._check_status(policy_name, entry.get("status", 200), entry.get("error", ""))
+                outcomes.append(entry["result"])
+            except (PolicyNotFoundError, PolicyEvaluationError) as e:
+                outcomes.append(e)
+            except KeyError:
+                outcomes.append(PolicyEvaluationError("Batch result is missing 'result'"))
+        return outcomes
+    
+    def _evaluate_policies_singly(
+        self,
+        evaluations: List[Tuple[str, Dict[str, Any]]],
+        timeout: Optional[float] = None
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Evaluate a batch one policy per request; returns what `_evaluate_policy_batch` would."""
+        outcomes: List[Union[Dict[str, Any], Exception]] = []
+        for policy_name, input_data in evaluations:
+            try:
+                outcomes.append(self._evaluate_policy(policy_name, input_data, timeout))
+            except (PolicyNotFoundError, ServerConnectionError, PolicyEvaluationError) as e:
+                outcomes.append(e)
+        return outcomes
+    
+    def _send_evaluation(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Send an evaluation to the server, through the micro-batcher or the concurrency limiter when enabled."""
+        self.counters.increment("server_requests")
+        if self.batcher and self.batch_endpoint:
+            return self.batcher.submit(policy_name, input_data, timeout)
+        if self.limiter is None:
+            return self._evaluate_policy(policy_name, input_data, timeout)
+        
+        wait = self.timeout if timeout is None else timeout
+        if not self.limiter.acquire(wait):
+            raise ConcurrencyLimitError(f"No request slot to {self.api_base_url} freed up within {wait:.3f}s")
+        started = time.monotonic()
+        failed = True
+        try:
+            result = self._evaluate_policy(policy_name, input_data, timeout)
+            failed = False
+            return result
+        except PolicyNotFoundError:
+            # A quick, valid answer; says nothing about load
+            failed = False
+            raise
+        finally:
+            self.limiter.release(time.monotonic() - started, failed)
+    
+    def _to_policy_result(self, result: Dict[str, Any]) -> PolicyResult:
+        """
+        Convert a raw policy server response into a PolicyResult.
+        
+        Args:
+            result: Policy server response.
+            
+        Returns:
+            PolicyResult object containing the evaluation result.
+        """
+        # Parse the result
+        allowed = result.get("allow", False)
+        rejection_reasons = result.get("rejection_reasons", [])
+        
+        # Log the result
+        self.logger.info(f"Policy evaluation result: {result}")
+        
+        return PolicyResult(allowed, rejection_reasons)
+    
+    def _resolve_verdict(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+        stage: Optional[str] = None
+    ) -> PolicyResult:
+        """
+        Obtain a verdict from the policy server, degrading if it is unreachable.
+        
+        Args:
+            policy_name: Name of the policy to evaluate.
+            input_data: Input data to evaluate against the policy.
+            timeout: Optional request timeout in seconds.
+            deadline: Optional deadline; the request timeout never exceeds the time left.
+            stage: Name of the pipeline stage whose own `timeout` this is, if any.
+            
+        Returns:
+            PolicyResult from the server, or a degraded PolicyResult.
+            
+        Raises:
+            DeadlineExceededError: If the deadline expires and no deadline verdict is configured
+            Various exceptions from _evaluate_policy
+        """
+        verdict, cache_key, timeout, degradation = self._verdict_without_server(
+            policy_name, input_data, timeout, deadline
+        )
+        if verdict is not None:
+            return verdict
+        
+        started = time.monotonic()
+        try:
+            result = self._send_evaluation(policy_name, input_data, timeout)
+        except DeadlineExceededError:
+            # Expired in the micro-batcher's queue: the server was never asked
+            return self._deadline_exceeded(policy_name, input_data, cache_key)
+        except ServerConnectionError as e:
+            error = e
+            if stage is not None and timeout is not None and not isinstance(e, ConcurrencyLimitError):
+                # A request that failed only once the stage's own timeout ran out timed out
+                if time.monotonic() - started >= timeout:
+                    error = StageTimeoutError(
+                        f"Stage '{stage}' got no verdict from '{policy_name}' within {timeout:.3f}s"
+                    )
+                    error.__cause__ = e
+            return self._verdict_on_failure(policy_name, input_data, degradation, cache_key, deadline, error)
+        
+        return self._store_verdict(policy_name, input_data, degradation, cache_key, result)
+    
+    def _verdict_without_server(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        timeout: Optional[float],
+        deadline: Optional[Deadline]
+    ) -> Tuple[Optional[PolicyResult], str, Optional[float], Optional[DegradationPolicy]]:
+        """
+        Resolve what can be decided before contacting the policy server.
+        
+        Returns:
+            (verdict, cache key, request timeout, degradation policy) tuple. The verdict
+            is set when it comes from the result cache, the deadline or degraded mode,
+            and is None when the server must be asked.
+        """
+        self.counters.increment("evaluations")
+        degradation = self._degradation_for(policy_name)
+        cache_key = ""
+        if degradation is not None or self.deadline_degradation is not None or self.result_cache is not None:
+            cache_key = verdict_cache_key(policy_name, input_data, self.policy_versions.get(policy_name))
+        
+        if self.result_cache is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                self.counters.increment("cache_hits")
+                return cached, cache_key, timeout, degradation
+        
+        index = self._near_duplicate_index(policy_name)
+        if index is not None:
+            match = index.lookup(self._near_duplicate_context(policy_name, input_data), input_data["content"])
+            if match is not None:
+                self.counters.increment("near_duplicate_hits")
+                return match[0], cache_key, timeout, degradation
+        
+        if deadline is not None:
+            remaining = deadline.remaining()
+            if remaining <= self.min_call_budget or remaining <= 0:
+                # Not enough time left for the server to answer; do not send work it would waste
+                return self._deadline_exceeded(policy_name, input_data, cache_key), cache_key, timeout, degradation
+            timeout = min(self.timeout if timeout is None else timeout, remaining)
+        
+        if degradation is not None and not self.health.healthy:
+            # Server is known to be down, skip the network round trip
+            return self._degrade(policy_name, input_data, degradation, cache_key), cache_key, timeout, degradation
+        
+        return None, cache_key, timeout, degradation
+    
+    def _verdict_on_failure(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        degradation: Optional[DegradationPolicy],
+        cache_key: str,
+        deadline: Optional[Deadline],
+        error: ServerConnectionError
+    ) -> PolicyResult:
+        """Return the verdict to use when the policy server could not be reached, or raise `error`."""
+        if deadline is not None and deadline.expired():
+            # The caller's budget ran out, which says nothing about the server's health
+            return self._deadline_exceeded(policy_name, input_data, cache_key)
+        if degradation is None:
+            raise error
+        # A full concurrency limit is client-side saturation, and a stage timeout a slow
+        # stage, not an unreachable server
+        if not isinstance(error, (ConcurrencyLimitError, StageTimeoutError)):
+            self.health.mark_unhealthy()
+        return self._degrade(policy_name, input_data, degradation, cache_key)
+    
+    def _store_verdict(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        degradation: Optional[DegradationPolicy],
+        cache_key: str,
+        result: Dict[str, Any]
+    ) -> PolicyResult:
+        """Convert a policy server result and remember it in the caches."""
+        policy_result = self._to_policy_result(result)
+        if degradation is not None or self.deadline_degradation is not None:
+            self.last_known.put(cache_key, policy_result)
+        if self.result_cache is not None:
+            self.result_cache.put(cache_key, policy_result)
+        index = self._near_duplicate_index(policy_name)
+        if index is not None:
+            index.add(self._near_duplicate_context(policy_name, input_data), input_data["content"], policy_result)
+        if self.watcher and cache_key and self.prewarm_size > 0:
+            self._remember_input(policy_name, cache_key, input_data)
+        return policy_result
+    
+    def _remember_input(self, policy_name: str, cache_key: str, input_data: Dict[str, Any]) -> None:
+        """Keep a recent input of a policy for pre-warming, deduplicated by its digest; its request ID is dropped."""
+        digest = cache_key.rpartition(":")[2]
+        with self._recent_lock:
+            recent = self._recent_inputs.setdefault(policy_name, OrderedDict())
+            recent[digest] = {k: v for k, v in input_data.items() if k != "request_id"}
+            recent.move_to_end(digest)
+            if len(recent) > self.prewarm_size:
+                recent.popitem(last=False)
+    
+    def _on_policy_version(self, policy_name: str, version: str) -> None:
+        """Drop the verdicts of a changed policy and pre-warm its new version."""
+        self.policy_versions[policy_name] = version
+        dropped = 0
+        for store in (self.result_cache, self.last_known):
+            # Stores that cannot invalidate per policy rely on the versioned keys
+            invalidate = getattr(store, "invalidate_policy", None)
+            if invalidate is not None:
+                dropped += invalidate(policy_name)
+        index = self._near_duplicate_index(policy_name)
+        if index is not None:
+            dropped += index.invalidate_policy(policy_name)
+        self.logger.info(f"Policy {policy_name} changed to version {version}; dropped {dropped} cached verdicts")
+        
+        with self._recent_lock:
+            recent = list(self._recent_inputs.get(policy_name, {}).values())
+        for input_data in recent:
+            self.executor.submit(self._prewarm, policy_name, version, input_data)
+    
+    def _prewarm(self, policy_name: str, version: str, input_data: Dict[str, Any]) -> None:
+        """Evaluate an input against a new policy version and cache the verdict."""
+        if self.policy_versions.get(policy_name) != version:
+            # Superseded by a newer version
+            return
+        # Pre-warming is a request of its own, tracked under a new request ID
+        request = dict(input_data, request_id="req-prewarm-" + str(hash((version, input_data["content"])))[:8])
+        try:
+            policy_result = self._to_policy_result(self._send_evaluation(policy_name, request))
+        except Exception as e:
+            self.logger.debug(f"Pre-warming {policy_name} version {version} failed: {str(e)}")
+            return
+        
+        cache_key = verdict_cache_key(policy_name, input_data, version)
+        if self._degradation_for(policy_name) is not None or self.deadline_degradation is not None:
+            self.last_known.put(cache_key, policy_result)
+        if self.result_cache is not None:
+            self.result_cache.put(cache_key, policy_result)
+        self.counters.increment("prewarmed")
+    
     def _evaluate_content(
         self,
         content: str,
@@ -96,8 +808,12 @@ class TavoAIClient:
         metadata: Optional[Dict[str, Any]] = None,
         config: Optional[Dict[str, Any]] = None,
         request_id: Optional[str] = None,
-        on_rejection: Optional[Callable[[PolicyResult], Any]] = None
-    ) -> PolicyResult:
+        on_rejection: Optional[Callable[[PolicyResult], R]] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[DeadlineSpec] = None,
+        stage: Optional[str] = None,
+        shadow: Optional["ShadowPolicy"] = None
+    ) -> Union[PolicyResult, R]:
         """
         Evaluate content against a specified policy.
         
@@ -109,6 +825,12 @@ class TavoAIClient:
             config: Optional configuration for policy evaluation.
             request_id: Optional request ID for tracking.
             on_rejection: Optional callback function called when content is not allowed.
+            timeout: Optional request timeout in seconds, defaults to the client timeout.
+            deadline: Optional Deadline, or budget in seconds, for the evaluation. The
+              earliest of this and the `deadline_scope` deadline bounds the request timeout.
+            stage: Name of the pipeline stage whose own `timeout` this is, if any.
+            shadow: Shadow policy of this evaluation only, used instead of the one
+              added for `policy_name`; requires the evaluator of `_shadow_evaluator`.
             
         Returns:
             PolicyResult object containing the evaluation result,
@@ -117,41 +839,98 @@ class TavoAIClient:
         Raises:
             Various exceptions from _evaluate_policy
         """
+        input_data = self._build_input(content, policy_name, content_type, metadata, config, request_id)
+        deadline = resolve_deadline(deadline)
+        
+        try:
+            # Evaluate the policy
+            policy_result = self._resolve_verdict(policy_name, input_data, timeout, deadline, stage)
+        except Exception as e:
+            self._evaluation_failed(policy_name, input_data, e, deadline)
+            # Re-raise the exception to be handled by the caller
+            raise
+        
+        self._record_verdict(policy_name, input_data, policy_result, deadline, shadow)
+        
+        # Call rejection handler if content is not allowed and a handler is provided;
+        # its exceptions are the caller's, not failed evaluations
+        if not policy_result.allowed and on_rejection:
+            return on_rejection(policy_result)
+        
+        return policy_result
+    
+    def _build_input(
+        self,
+        content: str,
+        policy_name: str,
+        content_type: ContentType,
+        metadata: Optional[Dict[str, Any]],
+        config: Optional[Dict[str, Any]],
+        request_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Construct the input data of an evaluation, normalizing the content if configured."""
         self.logger.info(f"Evaluating {content_type.value} content against {policy_name} policy")
+        normalizer = self._normalizer_for(policy_name)
+        if normalizer is not None:
+            content = normalizer.normalize(content)
         
-        # Construct the input data
-        input_data = {
+        return {
             "content_type": content_type.value,
             "content": content,
             "metadata": metadata or {},
             "config": config or {},
             "request_id": request_id or "req-" + str(hash(content))[:8]
         }
+    
+    def _record_verdict(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        policy_result: PolicyResult,
+        deadline: Optional[Deadline],
+        shadow: Optional["ShadowPolicy"] = None
+    ) -> None:
+        """Audit a verdict and queue its shadow evaluation, by default that of the policy's shadow policy."""
+        self._audit(policy_name, input_data, policy_result, deadline=deadline)
         
-        try:
-            # Evaluate the policy
-            result = self._evaluate_policy(policy_name, input_data)
-            
-            # Parse the result
-            allowed = result.get("allow", False)
-            rejection_reasons = result.get("rejection_reasons", [])
-            
-            # Log the result
-            self.logger.info(f"Policy evaluation result: {result}")
-            
-            # Create the PolicyResult
-            policy_result = PolicyResult(allowed, rejection_reasons)
-            
-            # Call rejection handler if content is not allowed and a handler is provided
-            if not allowed and on_rejection:
-                return on_rejection(policy_result)
-            
-            return policy_result
-        
-        except Exception as e:
-            self.logger.error(f"Policy evaluation failed: {str(e)}")
-            # Re-raise the exception to be handled by the caller
-            raise
+        # Queue a shadow evaluation; never blocks and never changes the verdict
+        shadow_policy = shadow or self.shadow_policies.get(policy_name)
+        if shadow_policy and self.shadow and not policy_result.degraded and shadow_policy.sampled():
+            self.shadow.submit(policy_name, shadow_policy.policy_name, input_data, policy_result)
+    
+    def _evaluation_failed(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        error: Exception,
+        deadline: Optional[Deadline]
+    ) -> None:
+        """Count, audit and log a failed evaluation."""
+        self.counters.increment("errors")
+        self._audit(policy_name, input_data, error=error, deadline=deadline)
+        self.logger.error(f"Policy evaluation failed: {str(error)}")
+    
+    def _audit(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        policy_result: Optional[PolicyResult] = None,
+        error: Optional[Exception] = None,
+        deadline: Optional[Deadline] = None
+    ) -> None:
+        """Queue an audit record of an evaluation, if auditing; a blocking sink waits at most until the deadline."""
+        if self.audit_sink is None:
+            return
+        self.audit_sink.record({
+            "timestamp": time.time(),
+            "request_id": input_data["request_id"],
+            "policy": policy_name,
+            "content_type": input_data["content_type"],
+            "allowed": policy_result.allowed if policy_result else None,
+            "rejection_reasons": policy_result.rejection_reasons if policy_result else [],
+            "degraded_mode": policy_result.degraded_mode if policy_result else None,
+            "error": str(error) if error else None,
+        }, timeout=deadline.remaining() if deadline is not None else None)
     
     def evaluate_input(
         self,
@@ -160,8 +939,10 @@ class TavoAIClient:
         metadata: Optional[Dict[str, Any]] = None,
         config: Optional[Dict[str, Any]] = None,
         request_id: Optional[str] = None,
-        on_rejection: Optional[Callable[[PolicyResult], Any]] = None
-    ) -> PolicyResult:
+        on_rejection: Optional[Callable[[PolicyResult], R]] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[DeadlineSpec] = None
+    ) -> Union[PolicyResult, R]:
         """
         Evaluate input content against a policy.
         
@@ -172,6 +953,9 @@ class TavoAIClient:
             config: Optional configuration for policy evaluation.
             request_id: Optional request ID for tracking.
             on_rejection: Optional callback function called when content is not allowed.
+            timeout: Optional request timeout in seconds, defaults to the client timeout.
+            deadline: Optional Deadline, or budget in seconds, for the evaluation. The
+              earliest of this and the `deadline_scope` deadline bounds the request timeout.
             
         Returns:
             PolicyResult object containing the evaluation result,
@@ -184,7 +968,9 @@ class TavoAIClient:
             metadata, 
             config, 
             request_id, 
-            on_rejection
+            on_rejection,
+            timeout,
+            deadline
         )
     
     def evaluate_output(
@@ -194,8 +980,10 @@ class TavoAIClient:
         metadata: Optional[Dict[str, Any]] = None,
         config: Optional[Dict[str, Any]] = None,
         request_id: Optional[str] = None,
-        on_rejection: Optional[Callable[[PolicyResult], Any]] = None
-    ) -> PolicyResult:
+        on_rejection: Optional[Callable[[PolicyResult], R]] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[DeadlineSpec] = None
+    ) -> Union[PolicyResult, R]:
         """
         Evaluate output content against a policy.
         
@@ -206,6 +994,9 @@ class TavoAIClient:
             config: Optional configuration for policy evaluation.
             request_id: Optional request ID for tracking.
             on_rejection: Optional callback function called when content is not allowed.
+            timeout: Optional request timeout in seconds, defaults to the client timeout.
+            deadline: Optional Deadline, or budget in seconds, for the evaluation. The
+              earliest of this and the `deadline_scope` deadline bounds the request timeout.
             
         Returns:
             PolicyResult object containing the evaluation result,
@@ -218,5 +1009,163 @@ class TavoAIClient:
             metadata, 
             config, 
             request_id, 
-            on_rejection
-        ) 
\ No newline at end of file
+            on_rejection,
+            timeout,
+            deadline
+        )
+    
+    @property
+    def executor(self) -> "ThreadPoolExecutor":
+        """Worker threads of the parallel evaluation methods, created on first use."""
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="tavoai-evaluate"
+            )
+        return self._executor
+    
+    def _evaluate_parallel(
+        self,
+        evaluations: List[Tuple[str, str]],
+        content_type: ContentType,
+        metadata: Optional[Dict[str, Any]],
+        config: Optional[Dict[str, Any]],
+        request_ids: Sequence[Optional[str]],
+        deadline: Optional[DeadlineSpec],
+        return_exceptions: bool
+    ) -> List[Union[PolicyResult, Exception]]:
+        """Evaluate (content, policy_name) pairs on the executor, in order."""
+        # Worker threads do not inherit the caller's context, so the deadline is passed explicitly
+        deadline = resolve_deadline(deadline)
+        futures = [
+            self.executor.submit(
+                self._evaluate_content,
+                content,
+                policy_name,
+                content_type,
+                metadata,
+                config,
+                request_id,
+                deadline=deadline
+            )
+            for (content, policy_name), request_id in zip(evaluations, request_ids)
+        ]
+        
+        outcomes: List[Union[PolicyResult, Exception]] = []
+        for future in futures:
+            try:
+                outcomes.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                outcomes.append(e)
+        return outcomes
+    
+    def evaluate_batch(
+        self,
+        contents: Sequence[str],
+        policy_name: str,
+        content_type: ContentType = ContentType.INPUT,
+        metadata: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        request_ids: Optional[Sequence[Optional[str]]] = None,
+        deadline: Optional[DeadlineSpec] = None,
+        return_exceptions: bool = False
+    ) -> List[Union[PolicyResult, Exception]]:
+        """
+        Evaluate many contents against one policy in parallel.
+        
+        Up to `max_concurrency` evaluations run at once; with adaptive
+        concurrency, the limiter decides how many reach the server.
+        
+        Args:
+            contents: Contents to evaluate.
+            policy_name: Name of the policy to evaluate against.
+            content_type: Type of content (input or output).
+            metadata: Optional metadata for policy evaluation.
+            config: Optional configuration for policy evaluation.
+            request_ids: Optional request IDs, one per content.
+            deadline: Optional Deadline, or budget in seconds, for the whole batch.
+            return_exceptions: Whether to return the exception of a failed evaluation
+              in its place instead of raising it.
+            
+        Returns:
+            PolicyResult (or exception) for each content, in order.
+        """
+        return self._evaluate_parallel(
+            [(content, policy_name) for content in contents],
+            content_type,
+            metadata,
+            config,
+            request_ids or [None] * len(contents),
+            deadline,
+            return_exceptions
+        )
+    
+    def evaluate_policies(
+        self,
+        content: str,
+        policy_names: Sequence[str],
+        content_type: ContentType = ContentType.INPUT,
+        metadata: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        request_id: Optional[str] = None,
+        deadline: Optional[DeadlineSpec] = None,
+        return_exceptions: bool = False
+    ) -> Dict[str, Union[PolicyResult, Exception]]:
+        """
+        Evaluate one content against several policies in parallel.
+        
+        Args:
+            content: Content to evaluate.
+            policy_names: Names of the policies to evaluate against.
+            content_type: Type of content (input or output).
+            metadata: Optional metadata for policy evaluation.
+            config: Optional configuration for policy evaluation.
+            request_id: Optional request ID shared by the evaluations.
+            deadline: Optional Deadline, or budget in seconds, for all evaluations.
+            return_exceptions: Whether to return the exception of a failed evaluation
+              in its place instead of raising it.
+            
+        Returns:
+            Mapping of policy names to their PolicyResult (or exception).
+        """
+        outcomes = self._evaluate_parallel(
+            [(content, policy_name) for policy_name in policy_names],
+            content_type,
+            metadata,
+            config,
+            [request_id] * len(policy_names),
+            deadline,
+            return_exceptions
+        )
+        return dict(zip(policy_names, outcomes))
+    
+    def session(
+        self,
+        request_id: str,
+        incremental_policies: Iterable[str] = (),
+        metadata: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        separator: str = "\n"
+    ) -> "ConversationSession":
+        """
+        Start a conversation session for incremental multi-turn evaluation.
+        
+        Args:
+            request_id: Request ID shared by all evaluations of the conversation.
+            incremental_policies: Names of turn-decomposable policies, for which only
+              new turns are sent and earlier per-turn verdicts are reused.
+            metadata: Optional metadata for policy evaluation.
+            config: Optional configuration for policy evaluation.
+            separator: Separator used to join turns for non-incremental policies.
+            
+        Returns:
+            ConversationSession bound to this client.
+        """
+        from tavoai.sdk.session import ConversationSession
+        
+        return ConversationSession(self, request_id, incremental_policies, metadata, config, separator)
\ No newline at end of file
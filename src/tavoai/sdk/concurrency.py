@@ -0,0 +1,179 @@
+"""Adaptive limits on the number of in-flight requests to the policy server."""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+
+class AdaptiveLimiter:
+    """
+    Additive-increase/multiplicative-decrease (AIMD) concurrency limit.
+    
+    Callers take a slot with `acquire` before sending a request and give it
+    back with `release`, reporting the request latency and whether it
+    failed. While the server keeps latency close to the lowest recently
+    observed latency, the limit grows by about one per round trip; when a
+    request fails or latency exceeds `latency_tolerance` times that
+    baseline, the server is queueing and the limit is multiplied by
+    `backoff`, at most once per round trip.
+    
+    The limit only grows while callers actually use at least half of it, so
+    an idle client does not drift to `max_limit`.
+    """
+    
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.9,
+        baseline_window: int = 200,
+        history_size: int = 256
+    ):
+        """
+        Initialize the limiter.
+        
+        Args:
+            initial_limit: Starting limit.
+            min_limit: Lowest limit.
+            max_limit: Highest limit.
+            latency_tolerance: Latency, relative to the baseline, above which the limit decreases.
+            backoff: Factor applied to the limit on each decrease.
+            baseline_window: Number of samples after which the latency baseline is refreshed,
+              so that it follows lasting changes in server latency.
+            history_size: Number of recent limit changes kept for `stats`.
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0.0 < backoff < 1.0:
+            raise ValueError("backoff must be between 0 and 1")
+        
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.baseline_window = baseline_window
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.history: "deque[Tuple[float, int]]" = deque(maxlen=history_size)
+        self.history.append((time.time(), initial_limit))
+        self._cond = threading.Condition()
+        self._reset_counters()
+    
+    def _reset_counters(self) -> None:
+        self.increases = 0
+        self.decreases = 0
+        self.rejected = 0
+        self.latency: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._window_min: Optional[float] = None
+        self._window_samples = 0
+        self._last_decrease = 0.0
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take a slot, waiting while the limit is reached.
+        
+        Args:
+            timeout: Maximum time to wait, in seconds.
+        
+        Returns:
+            True if a slot was taken, False on timeout.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.in_flight < int(self.limit), timeout):
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+    
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free, without waiting; a failure is not counted as rejected."""
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+    
+    def release(self, latency: Optional[float] = None, failed: bool = False) -> None:
+        """
+        Give a slot back and adjust the limit.
+        
+        Args:
+            latency: Duration of the request, in seconds, or None if unknown.
+            failed: Whether the request failed in a way that suggests overload
+              (connection errors, timeouts, server errors).
+        """
+        with self._cond:
+            in_use = self.in_flight
+            self.in_flight -= 1
+            
+            if latency is not None and not failed:
+                self._observe(latency)
+            
+            if failed or (self._baseline is not None and latency is not None
+                          and latency > self._baseline * self.latency_tolerance):
+                self._decrease()
+            elif latency is not None and in_use * 2 >= self.limit:
+                self._set_limit(self.limit + 1 / self.limit)
+                self.increases += 1
+            self._cond.notify()
+    
+    def _observe(self, latency: float) -> None:
+        # Must be called with the condition held
+        self.latency = latency if self.latency is None else 0.9 * self.latency + 0.1 * latency
+        self._window_min = latency if self._window_min is None else min(self._window_min, latency)
+        self._window_samples += 1
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        if self._window_samples >= self.baseline_window:
+            # Lowest latency of the last full window
+            self._baseline = self._window_min
+            self._window_min = None
+            self._window_samples = 0
+    
+    def _decrease(self) -> None:
+        # Must be called with the condition held; at most one decrease per round trip
+        now = time.monotonic()
+        if now - self._last_decrease < (self.latency or 0.0):
+            return
+        self._last_decrease = now
+        self._set_limit(self.limit * self.backoff)
+        self.decreases += 1
+    
+    def _set_limit(self, limit: float) -> None:
+        previous = int(self.limit)
+        self.limit = min(float(self.max_limit), max(float(self.min_limit), limit))
+        if int(self.limit) != previous:
+            self.history.append((time.time(), int(self.limit)))
+            self._cond.notify_all()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the limiter state.
+        
+        Returns:
+            Dictionary with the current limit, in-flight requests, latency
+            baseline and smoothed latency in seconds, the number of increases,
+            decreases and acquire timeouts, and the history of limit changes as
+            (timestamp, limit) pairs.
+        """
+        with self._cond:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "baseline_latency": self._baseline,
+                "latency": self.latency,
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "rejected": self.rejected,
+                "history": list(self.history),
+            }
+    
+    def _after_fork_in_child(self) -> None:
+        # Slots held by threads of the parent are never released in the child
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self._reset_counters()
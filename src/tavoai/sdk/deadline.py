@@ -0,0 +1,106 @@
+"""End-to-end deadlines for policy evaluations."""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Union
+
+
+class Deadline:
+    """
+    A point in time by which an evaluation must complete.
+    
+    Deadlines use the monotonic clock, so they are unaffected by changes
+    of the system time.
+    """
+    
+    __slots__ = ("expires_at",)
+    
+    def __init__(self, expires_at: float):
+        """
+        Initialize the deadline.
+        
+        Args:
+            expires_at: Expiry time on the `time.monotonic()` clock.
+        """
+        self.expires_at = expires_at
+    
+    @classmethod
+    def after(cls, budget: float) -> "Deadline":
+        """Return a deadline `budget` seconds from now."""
+        return cls(time.monotonic() + budget)
+    
+    def remaining(self) -> float:
+        """Seconds left before the deadline; negative once expired."""
+        return self.expires_at - time.monotonic()
+    
+    def expired(self) -> bool:
+        """Return whether the deadline has passed."""
+        return time.monotonic() >= self.expires_at
+    
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f}s)"
+
+
+# A deadline or a budget in seconds, counted from when it is resolved
+DeadlineSpec = Union[Deadline, float]
+
+_CURRENT_DEADLINE: "ContextVar[Optional[Deadline]]" = ContextVar("tavoai_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Return the deadline set by the innermost enclosing `deadline_scope`, if any."""
+    return _CURRENT_DEADLINE.get()
+
+
+def resolve_deadline(deadline: Optional[DeadlineSpec] = None) -> Optional[Deadline]:
+    """
+    Combine an explicit deadline with the one of the current context.
+    
+    Args:
+        deadline: Optional deadline, or budget in seconds starting now.
+    
+    Returns:
+        The earliest of the explicit and the context deadline, or None if neither is set.
+    """
+    if deadline is None:
+        return _CURRENT_DEADLINE.get()
+    return _earliest(deadline)
+
+
+def _earliest(deadline: DeadlineSpec) -> Deadline:
+    """Return the earlier of a deadline and the one of the current context."""
+    if not isinstance(deadline, Deadline):
+        deadline = Deadline.after(deadline)
+    scoped = _CURRENT_DEADLINE.get()
+    if scoped is not None and scoped.expires_at < deadline.expires_at:
+        return scoped
+    return deadline
+
+
+@contextmanager
+def deadline_scope(deadline: DeadlineSpec) -> Iterator[Deadline]:
+    """
+    Apply a deadline to every evaluation made within the block.
+    
+    Scopes nest: an inner scope can only shorten the deadline of an outer
+    one. The deadline follows the context, so it also applies within
+    asyncio tasks started in the block.
+    
+    Example:
+        with deadline_scope(0.25):
+            client.evaluate_input(query, "pii_input")
+            client.evaluate_input(query, "financial_advice_input")
+    
+    Args:
+        deadline: Deadline, or budget in seconds starting now.
+    
+    Yields:
+        The effective deadline.
+    """
+    effective = _earliest(deadline)
+    token = _CURRENT_DEADLINE.set(effective)
+    try:
+        yield effective
+    finally:
+        _CURRENT_DEADLINE.reset(token)
@@ -1,11 +1,17 @@
 """Decorators for the TavoAI SDK."""
 
+import inspect
+from contextlib import nullcontext
 from functools import wraps
-from typing import Dict, Any, Callable, Optional, Union, TypeVar
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union, TypeVar
 
 from tavoai.sdk.client import TavoAIClient
+from tavoai.sdk.deadline import deadline_scope
 from tavoai.sdk.exceptions import PolicyEvaluationError
-from tavoai.sdk.models import PolicyResult
+from tavoai.sdk.memo import REJECTION, RESPONSE, ResponseMemo
+from tavoai.sdk.models import PolicyResult, ContentType
+from tavoai.sdk.pipeline import PolicyPipeline
+from tavoai.sdk.shadow import ShadowPolicy
 
 # Type for the decorated function's result
 T = TypeVar('T')
@@ -14,6 +20,9 @@ T = TypeVar('T')
 InputRejectionHandler = Callable[[str, PolicyResult, Dict[str, Any]], Union[str, None]]
 OutputRejectionHandler = Callable[[str, T, PolicyResult, Dict[str, Any]], Union[T, None]]
 
+# A policy name or a tiered pipeline of policies
+PolicySpec = Union[str, PolicyPipeline]
+
 
 class TavoAIGuardrail:
     """
@@ -36,37 +45,156 @@ class TavoAIGuardrail:
             client: The TavoAI client to use for policy evaluation.
             metadata: Metadata for policy evaluation.
             config: Configuration for policy evaluation.
+            
+        Raises:
+            TypeError: If the client evaluates policies with coroutines, as AsyncTavoAIClient does.
         """
+        if inspect.iscoroutinefunction(client.evaluate_input):
+            raise TypeError(
+                f"TavoAIGuardrail needs a synchronous TavoAIClient, got {type(client).__name__}"
+            )
         self.client = client
         self.metadata = metadata or {}
         self.config = config or {}
     
+    def _evaluate(
+        self,
+        policy: PolicySpec,
+        content: Any,
+        content_type: ContentType,
+        request_id: str,
+        shadow: Optional[ShadowPolicy] = None
+    ) -> PolicyResult:
+        """Evaluate a query or a function's response against a policy name or pipeline."""
+        if isinstance(policy, PolicyPipeline):
+            return policy.evaluate(self.client, content, content_type, self.metadata, self.config, request_id)
+        
+        return self.client._evaluate_content(
+            content,
+            policy,
+            content_type,
+            self.metadata,
+            self.config,
+            request_id,
+            shadow=shadow
+        )
+    
+    def _policy_versions(self, policy: PolicySpec) -> List[Tuple[str, Optional[str]]]:
+        """Return the policies applied by a policy spec, with their versions known to the client."""
+        if isinstance(policy, PolicyPipeline):
+            names = [stage.policy_name or stage.name for stage in policy.stages]
+        else:
+            names = [policy]
+        return [(name, self.client.policy_versions.get(name)) for name in names]
+    
     def __call__(
         self, 
-        input_policy: str, 
-        output_policy: Optional[str] = None,
+        input_policy: PolicySpec, 
+        output_policy: Optional[PolicySpec] = None,
         on_input_rejection: Optional[InputRejectionHandler] = None,
-        on_output_rejection: Optional[OutputRejectionHandler] = None
-    ):
+        on_output_rejection: Optional[OutputRejectionHandler] = None,
+        shadow_input_policy: Optional[str] = None,
+        shadow_output_policy: Optional[str] = None,
+        shadow_sample_rate: float = 1.0,
+        deadline: Optional[float] = None,
+        memo: Optional[ResponseMemo] = None
+    ) -> Callable[[Callable[..., T]], Callable[..., T]]:
         """
         Apply the decorator with specified policies and optional rejection handlers.
         
         Args:
-            input_policy: Policy name for input validation.
-            output_policy: Policy name for output validation (defaults to input_policy).
+            input_policy: Policy name or PolicyPipeline for input validation.
+            output_policy: Policy name or PolicyPipeline for output validation (defaults to input_policy).
             on_input_rejection: Optional handler for input validation failures.
               Function receives (query, result, context) and can return modified query or None to raise default error.
             on_output_rejection: Optional handler for output validation failures.
               Function receives (query, response, result, context) and can return modified response or None to raise default error.
+            shadow_input_policy: Optional candidate policy evaluated in the background alongside the input policy.
+            shadow_output_policy: Optional candidate policy evaluated in the background alongside the output policy.
+            shadow_sample_rate: Fraction of evaluations to shadow.
+              Shadow policies only apply to the evaluations of the decorated function,
+              and never change the returned verdicts.
+            deadline: Optional budget, in seconds, for each call of the decorated function,
+              covering both evaluations and the function itself. It is applied with
+              `deadline_scope`, so it also bounds evaluations made inside the function,
+              and it never extends a deadline already set by the caller.
+            memo: Optional ResponseMemo; repeated identical calls then return the
+              memoized response without calling the function or evaluating the policies.
             
         Returns:
             Decorator function that will wrap the target function.
+            
+        Raises:
+            ValueError: If a shadow policy is given for a PolicyPipeline
         """
         effective_output_policy = output_policy or input_policy
         
+        for shadow_policy, policy in (
+            (shadow_input_policy, input_policy),
+            (shadow_output_policy, effective_output_policy),
+        ):
+            if shadow_policy and isinstance(policy, PolicyPipeline):
+                raise ValueError(
+                    "Shadow policies cannot shadow a PolicyPipeline; "
+                    "use client.add_shadow_policy for the policies of its stages"
+                )
+        input_shadow = ShadowPolicy(shadow_input_policy, shadow_sample_rate) if shadow_input_policy else None
+        output_shadow = ShadowPolicy(shadow_output_policy, shadow_sample_rate) if shadow_output_policy else None
+        if input_shadow or output_shadow:
+            self.client._shadow_evaluator()
+        
         def decorator(func: Callable[..., T]) -> Callable[..., T]:
             @wraps(func)
-            def wrapper(query: str, *args, **kwargs) -> T:
+            def wrapper(query: str, *args: Any, **kwargs: Any) -> T:
+                with deadline_scope(deadline) if deadline is not None else nullcontext():
+                    if memo is None:
+                        return guarded(None, query, *args, **kwargs)
+                    return memoized(memo, query, *args, **kwargs)
+            
+            def memoized(memo: ResponseMemo, query: str, *args: Any, **kwargs: Any) -> T:
+                key = memo.key(
+                    f"{func.__module__}.{func.__qualname__}",
+                    query,
+                    args,
+                    kwargs,
+                    self.metadata,
+                    self.config,
+                    self._policy_versions(input_policy) + self._policy_versions(effective_output_policy)
+                )
+                if key is None:
+                    memo.skip()
+                    return guarded(None, query, *args, **kwargs)
+                
+                hit = memo.get(key)
+                if hit is not None:
+                    kind, value = hit
+                    if kind == REJECTION:
+                        raise PolicyEvaluationError(value)
+                    memoized_response: T = value
+                    return memoized_response
+                
+                trace = {"handled": False, "degraded": False, "rejected": False}
+                try:
+                    response = guarded(trace, query, *args, **kwargs)
+                except PolicyEvaluationError as e:
+                    if trace["rejected"] and memo.cache_rejections and not trace["degraded"]:
+                        memo.put(key, REJECTION, str(e))
+                    else:
+                        memo.skip()
+                    raise
+                
+                if trace["degraded"] or (trace["handled"] and not memo.cache_handler_results):
+                    memo.skip()
+                else:
+                    memo.put(key, RESPONSE, response)
+                return response
+            
+            def reject(trace: Optional[Dict[str, bool]], message: str) -> PolicyEvaluationError:
+                if trace is not None:
+                    trace["rejected"] = True
+                return PolicyEvaluationError(message)
+            
+            def guarded(trace: Optional[Dict[str, bool]], query: str, *args: Any, **kwargs: Any) -> T:
                 # Generate a request ID to link input and output evaluations
                 request_id = f"req-{hash(query)}"[:16]
                 
@@ -80,13 +208,9 @@ class TavoAIGuardrail:
                 }
                 
                 # Evaluate the input query
-                input_result = self.client.evaluate_input(
-                    content=query,
-                    policy_name=input_policy,
-                    metadata=self.metadata,
-                    config=self.config,
-                    request_id=request_id
-                )
+                input_result = self._evaluate(input_policy, query, ContentType.INPUT, request_id, input_shadow)
+                if trace is not None:
+                    trace["degraded"] = input_result.degraded
                 
                 # If input validation fails, handle the rejection
                 if not input_result.allowed:
@@ -96,39 +220,39 @@ class TavoAIGuardrail:
                         if modified_query is not None:
                             # Use the modified query instead
                             query = modified_query
+                            if trace is not None:
+                                trace["handled"] = True
                         else:
                             # Handler returned None, raise the default error
-                            raise PolicyEvaluationError(f"Input validation failed: {input_result}")
+                            raise reject(trace, f"Input validation failed: {input_result}")
                     else:
                         # No custom handler, raise the default error
-                        raise PolicyEvaluationError(f"Input validation failed: {input_result}")
+                        raise reject(trace, f"Input validation failed: {input_result}")
                 
                 # Call the function with the input (possibly modified)
                 response = func(query, *args, **kwargs)
                 
                 # Evaluate the output response
-                output_result = self.client.evaluate_output(
-                    content=response,
-                    policy_name=effective_output_policy,
-                    metadata=self.metadata,
-                    config=self.config,
-                    request_id=request_id
-                )
+                output_result = self._evaluate(effective_output_policy, response, ContentType.OUTPUT, request_id, output_shadow)
+                if trace is not None:
+                    trace["degraded"] = trace["degraded"] or output_result.degraded
                 
                 # If output validation fails, handle the rejection
                 if not output_result.allowed:
                     if on_output_rejection:
                         # Call the custom handler
-                        modified_response = on_output_rejection(query, response, output_result, context)
+                        modified_response: Optional[T] = on_output_rejection(query, response, output_result, context)
                         if modified_response is not None:
                             # Use the modified response instead
+                            if trace is not None:
+                                trace["handled"] = True
                             return modified_response
                         else:
                             # Handler returned None, raise the default error
-                            raise PolicyEvaluationError(f"Output validation failed: {output_result}")
+                            raise reject(trace, f"Output validation failed: {output_result}")
                     else:
                         # No custom handler, raise the default error
-                        raise PolicyEvaluationError(f"Output validation failed: {output_result}")
+                        raise reject(trace, f"Output validation failed: {output_result}")
                 
                 # Return the validated response
                 return response
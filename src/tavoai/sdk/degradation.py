@@ -0,0 +1,195 @@
+"""Degraded-mode handling for when the policy server is unreachable."""
+
+import logging
+import threading
+from enum import Enum
+from typing import Dict, Any, Optional, Callable
+
+from tavoai.sdk.models import PolicyResult
+
+# Type for local fallback evaluators. They receive the input data that would
+# have been sent to the policy server.
+FallbackEvaluator = Callable[[Dict[str, Any]], PolicyResult]
+
+
+class DegradationMode(Enum):
+    """How to produce a verdict when the policy server is unreachable."""
+    RAISE = "raise"
+    FAIL_CLOSED = "fail_closed"
+    FAIL_OPEN = "fail_open"
+    LAST_KNOWN = "last_known"
+    FALLBACK = "fallback"
+
+
+class DegradationPolicy:
+    """
+    Describes how a policy degrades when the policy server is unreachable.
+    
+    Degraded verdicts are tagged with `degraded=True` and the mode that
+    produced them so they can be told apart from server verdicts.
+    """
+    
+    def __init__(
+        self,
+        mode: DegradationMode = DegradationMode.FAIL_CLOSED,
+        fallback: Optional[FallbackEvaluator] = None,
+        on_miss: DegradationMode = DegradationMode.FAIL_CLOSED
+    ):
+        """
+        Initialize the degradation policy.
+        
+        Args:
+            mode: Degradation mode to apply.
+            fallback: Local evaluator, required for DegradationMode.FALLBACK.
+            on_miss: Mode used by LAST_KNOWN when no cached verdict exists.
+        """
+        if on_miss == DegradationMode.LAST_KNOWN:
+            raise ValueError("on_miss cannot be DegradationMode.LAST_KNOWN")
+        needs_fallback = mode == DegradationMode.FALLBACK or (
+            mode == DegradationMode.LAST_KNOWN and on_miss == DegradationMode.FALLBACK
+        )
+        if needs_fallback and fallback is None:
+            raise ValueError("A fallback evaluator is required for DegradationMode.FALLBACK")
+        
+        self.mode = mode
+        self.fallback = fallback
+        self.on_miss = on_miss
+    
+    def resolve(
+        self,
+        policy_name: str,
+        input_data: Dict[str, Any],
+        last_known: Optional[PolicyResult] = None,
+        cause: str = "Policy server unavailable"
+    ) -> Optional[PolicyResult]:
+        """
+        Produce a degraded verdict.
+        
+        Args:
+            policy_name: Name of the policy being evaluated.
+            input_data: Input data that would have been sent to the server.
+            last_known: Last verdict the server returned for this input, if any.
+            cause: Why no server verdict is available, used in fail-closed rejection reasons.
+        
+        Returns:
+            Degraded PolicyResult, or None if the mode is RAISE.
+        """
+        mode = self.mode
+        if mode == DegradationMode.LAST_KNOWN:
+            if last_known is not None:
+                return PolicyResult(
+                    last_known.allowed,
+                    list(last_known.rejection_reasons),
+                    degraded=True,
+                    degraded_mode=mode.value
+                )
+            mode = self.on_miss
+        
+        if mode == DegradationMode.RAISE:
+            return None
+        
+        if mode == DegradationMode.FAIL_OPEN:
+            return PolicyResult(True, degraded=True, degraded_mode=mode.value)
+        
+        if mode == DegradationMode.FALLBACK and self.fallback is not None:
+            result = self.fallback(input_data)
+            return PolicyResult(
+                result.allowed,
+                list(result.rejection_reasons),
+                degraded=True,
+                degraded_mode=mode.value
+            )
+        
+        return PolicyResult(
+            False,
+            [{
+                "category": "degraded",
+                "reason": f"{cause}; '{policy_name}' failed closed"
+            }],
+            degraded=True,
+            degraded_mode=DegradationMode.FAIL_CLOSED.value
+        )
+
+
+class ServerHealthMonitor:
+    """
+    Tracks whether the policy server is reachable.
+    
+    Once marked unhealthy, a background thread probes the server at a fixed
+    interval and restores the healthy state when a probe succeeds. Reading
+    `healthy` is a plain attribute access, so callers can switch to degraded
+    mode without waiting for a connection timeout.
+    """
+    
+    def __init__(
+        self,
+        probe: Callable[[], bool],
+        probe_interval: float = 5.0,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialize the monitor.
+        
+        Args:
+            probe: Callable returning True when the server is reachable.
+            probe_interval: Seconds between probes while unhealthy.
+            logger: Optional logger for state transitions.
+        """
+        self.probe = probe
+        self.probe_interval = probe_interval
+        self.logger = logger
+        self.healthy = True
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def mark_unhealthy(self) -> None:
+        """Switch to the unhealthy state and start probing the server."""
+        with self._lock:
+            if not self.healthy:
+                return
+            self.healthy = False
+            if self.logger:
+                self.logger.warning("Policy server unreachable, switching to degraded mode")
+            
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._probe_loop,
+                    name="tavoai-health-probe",
+                    daemon=True
+                )
+                self._thread.start()
+    
+    def _probe_loop(self) -> None:
+        while not self._stop.wait(self.probe_interval):
+            try:
+                reachable = self.probe()
+            except Exception:
+                reachable = False
+            
+            if reachable:
+                with self._lock:
+                    self.healthy = True
+                    self._thread = None
+                if self.logger:
+                    self.logger.info("Policy server reachable again, leaving degraded mode")
+                return
+        
+        with self._lock:
+            self._thread = None
+    
+    def _after_fork_in_child(self) -> None:
+        # The probe thread does not exist in the child; it rediscovers the server state
+        self.healthy = True
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def close(self) -> None:
+        """Stop the background probe, if running."""
+        self._stop.set()
+        with self._lock:
+            thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
@@ -18,4 +18,19 @@ class PolicyNotFoundError(TavoAIError):
 
 class ServerConnectionError(TavoAIError):
     """Exception raised when a connection to the policy server fails."""
-    pass 
\ No newline at end of file
+    pass
+
+
+class ConcurrencyLimitError(ServerConnectionError):
+    """Exception raised when no request slot or pooled connection frees up in time."""
+    pass
+
+
+class DeadlineExceededError(TavoAIError):
+    """Exception raised when an evaluation cannot complete before its deadline."""
+    pass
+
+
+class StageTimeoutError(ServerConnectionError):
+    """Exception raised when a pipeline stage's policy misses the stage's timeout."""
+    pass
@@ -0,0 +1,223 @@
+"""Length-prefixed binary framing for policy servers on Unix domain sockets."""
+
+import io
+import json
+import socket
+import struct
+import threading
+from typing import Dict, Any, BinaryIO, List, Optional, Tuple, Union
+
+from tavoai.sdk.exceptions import ConcurrencyLimitError
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+# Codecs of a frame's payload, identified by its first byte
+MSGPACK = "msgpack"
+JSON = "json"
+
+_CODEC_TAGS = {MSGPACK: b"M", JSON: b"J"}
+_TAG_CODECS = {tag: codec for codec, tag in _CODEC_TAGS.items()}
+
+# A frame is a 4-byte big-endian length followed by that many bytes: a codec
+# tag and the encoded message
+_LENGTH = struct.Struct(">I")
+
+# Largest payload accepted, to fail fast on a corrupted stream
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+def encode_message(message: Dict[str, Any], codec: str) -> bytes:
+    """
+    Encode a message as a frame.
+    
+    Args:
+        message: JSON-compatible message.
+        codec: "msgpack" or "json".
+    
+    Returns:
+        Length prefix, codec tag and encoded message.
+    """
+    payload: bytes
+    if codec == MSGPACK:
+        payload = msgpack.packb(message, use_bin_type=True)
+    else:
+        payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    tag = _CODEC_TAGS[codec]
+    return _LENGTH.pack(len(payload) + 1) + tag + payload
+
+
+def read_message(stream: Union[BinaryIO, io.BufferedIOBase]) -> Optional[Tuple[Dict[str, Any], str]]:
+    """
+    Read and decode the next frame of a buffered stream.
+    
+    Args:
+        stream: Buffered binary stream, e.g. from `socket.makefile("rb")`.
+    
+    Returns:
+        (message, codec) tuple, or None if the stream ended between frames.
+    
+    Raises:
+        ConnectionError: If the stream ends inside a frame or carries an invalid frame.
+    """
+    header = stream.read(_LENGTH.size)
+    if not header:
+        return None
+    if len(header) < _LENGTH.size:
+        raise ConnectionError("Connection closed inside a frame header")
+    (length,) = _LENGTH.unpack(header)
+    if not 0 < length <= MAX_FRAME_SIZE:
+        raise ConnectionError(f"Invalid frame length: {length}")
+    frame = stream.read(length)
+    if len(frame) < length:
+        raise ConnectionError("Connection closed inside a frame")
+    
+    codec = _TAG_CODECS.get(frame[:1])
+    if codec == MSGPACK and HAS_MSGPACK:
+        return msgpack.unpackb(frame[1:], raw=False), codec
+    if codec == JSON:
+        return json.loads(frame[1:]), codec
+    raise ConnectionError(f"Unsupported frame codec: {frame[:1]!r}")
+
+
+class FramedResponse:
+    """Status and decoded body of a framed policy server response."""
+    
+    __slots__ = ("status_code", "body")
+    
+    def __init__(self, status_code: int, body: Any):
+        """
+        Initialize the response.
+        
+        Args:
+            status_code: HTTP status code.
+            body: Decoded response body.
+        """
+        self.status_code = status_code
+        self.body = body
+    
+    @property
+    def text(self) -> str:
+        """Response body as JSON text."""
+        return json.dumps(self.body)
+    
+    def json(self) -> Any:
+        """Decoded response body."""
+        return self.body
+
+
+class FramedTransport:
+    """
+    Compact binary protocol over a Unix domain socket.
+    
+    Each request is a single frame `{"method", "path", "body"}` answered by a
+    frame `{"status", "body"}`, on persistent connections: no HTTP request
+    line, headers or text parsing, and one write per request. Payloads are
+    msgpack-encoded when msgpack is installed and JSON otherwise; the server
+    replies with the codec of the request. Up to `pool_maxsize` connections
+    are open; further requests wait for a free one.
+    """
+    
+    def __init__(self, socket_path: str, pool_maxsize: int = 32, codec: Optional[str] = None):
+        """
+        Initialize the transport.
+        
+        Args:
+            socket_path: Path of the policy server's Unix domain socket.
+            pool_maxsize: Maximum number of connections.
+            codec: "msgpack" or "json"; defaults to msgpack when installed.
+        """
+        if codec == MSGPACK and not HAS_MSGPACK:
+            raise ImportError("The msgpack codec requires msgpack. Install it with: pip install msgpack")
+        self.socket_path = socket_path
+        self.pool_maxsize = pool_maxsize
+        self.codec = codec or (MSGPACK if HAS_MSGPACK else JSON)
+        self._idle: List[Tuple[socket.socket, BinaryIO]] = []
+        self._slots = threading.BoundedSemaphore(pool_maxsize)
+        self._lock = threading.Lock()
+    
+    def _connect(self, timeout: Optional[float]) -> Tuple[socket.socket, BinaryIO]:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            if isinstance(e, socket.timeout):
+                raise TimeoutError(f"Connecting to {self.socket_path} timed out") from e
+            raise ConnectionError(f"Could not connect to {self.socket_path}: {e}") from e
+        return sock, sock.makefile("rb")
+    
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> FramedResponse:
+        """Send a request frame and read the response frame."""
+        frame = encode_message({"method": method, "path": path, "body": body}, self.codec)
+        if not self._slots.acquire(timeout=timeout):
+            raise ConcurrencyLimitError(f"No connection to {self.socket_path} freed up within {timeout:.3f}s")
+        try:
+            with self._lock:
+                idle = self._idle.pop() if self._idle else None
+            if idle is not None:
+                try:
+                    return self._exchange(idle, frame, timeout)
+                except ConnectionError:
+                    # The server may have closed the connection while it was idle; retry once on a new one
+                    pass
+            return self._exchange(self._connect(timeout), frame, timeout)
+        finally:
+            self._slots.release()
+    
+    def _exchange(
+        self,
+        connection: Tuple[socket.socket, BinaryIO],
+        frame: bytes,
+        timeout: Optional[float]
+    ) -> FramedResponse:
+        """Send a frame on a connection and read the reply; the connection is pooled again on success."""
+        sock, stream = connection
+        try:
+            sock.settimeout(timeout)
+            sock.sendall(frame)
+            reply = read_message(stream)
+            if reply is None:
+                raise ConnectionError(f"Connection to {self.socket_path} closed")
+        except Exception as e:
+            # The stream may be left inside a frame; never reuse it
+            self._discard(connection)
+            if isinstance(e, socket.timeout):
+                raise TimeoutError(f"Request to {self.socket_path} timed out") from e
+            if isinstance(e, OSError) and not isinstance(e, ConnectionError):
+                raise ConnectionError(str(e)) from e
+            raise
+        
+        with self._lock:
+            self._idle.append(connection)
+        message = reply[0]
+        return FramedResponse(message["status"], message.get("body"))
+    
+    @staticmethod
+    def _discard(connection: Tuple[socket.socket, BinaryIO]) -> None:
+        sock, stream = connection
+        stream.close()
+        sock.close()
+    
+    def close(self) -> None:
+        """Close the idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._discard(connection)
+    
+    def _after_fork_in_child(self) -> None:
+        # The parent's sockets must not be shared; the child opens its own
+        self._idle = []
+        self._slots = threading.BoundedSemaphore(self.pool_maxsize)
+        self._lock = threading.Lock()
@@ -0,0 +1,203 @@
+"""Memoization of guarded function calls."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Iterable, Optional, Tuple
+
+from tavoai.sdk.multiprocess import register_fork_aware
+
+# Kinds of memoized outcomes
+RESPONSE = "response"
+REJECTION = "rejection"
+
+
+class ResponseMemo:
+    """
+    Bounded cache of validated responses of guarded functions.
+    
+    Used with `TavoAIGuardrail(...)(..., memo=ResponseMemo())`, a hit returns
+    the response of an earlier identical call without calling the function
+    or evaluating either policy. Calls are identified by the function, the
+    query and arguments, the guardrail's metadata and config, and the
+    versions of the input and output policies known to the client; with
+    `watch_policy_versions`, a policy change therefore invalidates the
+    memoized responses validated by its previous version. Without it, `ttl`
+    bounds how long a response outlives a policy change.
+    
+    By default only responses that passed both policies are memoized:
+    responses produced by a rejection handler and rejections themselves are
+    stored only when `cache_handler_results` or `cache_rejections` is set, and
+    calls involving degraded verdicts are never stored. Responses are
+    returned as-is, so callers must not mutate them.
+    
+    Arguments must be JSON-serializable to be part of a key; calls with other
+    arguments are not memoized, unless `key_func` maps them to a value that
+    identifies them.
+    """
+    
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: Optional[float] = 300.0,
+        cache_handler_results: bool = False,
+        cache_rejections: bool = False,
+        key_func: Optional[Callable[[Tuple[Any, ...], Dict[str, Any]], Any]] = None
+    ):
+        """
+        Initialize the memo.
+        
+        Args:
+            max_size: Maximum number of memoized calls.
+            ttl: Optional time-to-live of entries, in seconds.
+            cache_handler_results: Whether to memoize responses returned after a
+              rejection handler rewrote the query or the response.
+            cache_rejections: Whether to memoize rejections, which are raised again
+              on a hit without evaluating the policies.
+            key_func: Optional function of the extra positional and keyword arguments
+              returning a JSON-serializable value that identifies them, e.g.
+              `lambda args, kwargs: [kwargs["user"].id]`; used in place of the
+              arguments in keys.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.cache_handler_results = cache_handler_results
+        self.cache_rejections = cache_rejections
+        self.key_func = key_func
+        self._entries: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._reset_counters()
+        register_fork_aware(self)
+    
+    def _reset_counters(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.skipped = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def key(
+        self,
+        function: str,
+        query: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        metadata: Dict[str, Any],
+        config: Dict[str, Any],
+        policy_versions: Iterable[Tuple[str, Optional[str]]]
+    ) -> Optional[str]:
+        """
+        Build the key of a guarded call.
+        
+        Args:
+            function: Qualified name of the guarded function.
+            query: Query passed to the function.
+            args: Extra positional arguments.
+            kwargs: Keyword arguments.
+            metadata: Metadata of the evaluations.
+            config: Configuration of the evaluations.
+            policy_versions: (policy name, version or None) of every policy applied.
+        
+        Returns:
+            Hex digest of the call, or None if the arguments cannot be serialized.
+        """
+        # Deferred so that importing the decorators does not load hashlib and json
+        import hashlib
+        import json
+        
+        # Never fall back to repr(): distinct objects may share one and receive each other's responses
+        arguments: Any = [args, kwargs] if self.key_func is None else self.key_func(args, kwargs)
+        try:
+            encoded = json.dumps(
+                [function, query, arguments, metadata, config, list(policy_versions)],
+                sort_keys=True
+            ).encode("utf-8")
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(encoded).hexdigest()
+    
+    def get(self, key: str) -> Optional[Tuple[str, Any]]:
+        """
+        Look up a memoized call.
+        
+        Args:
+            key: Key built by `key`.
+        
+        Returns:
+            (kind, value) where kind is "response" or "rejection" (value then being
+            the error message), or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+    
+    def put(self, key: str, kind: str, value: Any) -> None:
+        """
+        Memoize the outcome of a call.
+        
+        Args:
+            key: Key built by `key`.
+            kind: "response" or "rejection".
+            value: Response, or error message of the rejection.
+        """
+        if self.max_size <= 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic(), kind, value)
+            self._entries.move_to_end(key)
+            self.stores += 1
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def skip(self) -> None:
+        """Count a call whose outcome was not eligible for memoization."""
+        with self._lock:
+            self.skipped += 1
+    
+    def clear(self) -> None:
+        """Remove all memoized calls."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return memoization statistics.
+        
+        Returns:
+            Dictionary with hits, misses, hit rate, stored and skipped outcomes,
+            evicted and expired entries, and the current size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "skipped": self.skipped,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+            }
+    
+    def _after_fork_in_child(self) -> None:
+        # Memoized responses stay valid in the child; counters start over
+        self._lock = threading.Lock()
+        self._reset_counters()
@@ -1,7 +1,7 @@
 """Models for the TavoAI SDK."""
 
 from enum import Enum
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 
 class ContentType(Enum):
@@ -13,20 +13,32 @@ class ContentType(Enum):
 class PolicyResult:
     """Represents the result of a policy evaluation."""
     
-    def __init__(self, allowed: bool, rejection_reasons: List[Dict[str, str]] = None):
+    def __init__(
+        self,
+        allowed: bool,
+        rejection_reasons: Optional[List[Dict[str, str]]] = None,
+        degraded: bool = False,
+        degraded_mode: Optional[str] = None
+    ):
         """
         Initialize a PolicyResult object.
         
         Args:
             allowed: Whether the content is allowed by the policy.
             rejection_reasons: List of rejection reasons, each with 'category' and 'reason' fields.
+            degraded: Whether the verdict was produced in degraded mode, without the policy server.
+            degraded_mode: The degradation mode that produced the verdict (e.g. "fail_open").
         """
         self.allowed = allowed
         self.rejection_reasons = rejection_reasons or []
+        self.degraded = degraded
+        self.degraded_mode = degraded_mode
     
     def __str__(self) -> str:
+        suffix = f" (degraded: {self.degraded_mode})" if self.degraded else ""
+        
         if self.allowed:
-            return "Policy evaluation passed"
+            return f"Policy evaluation passed{suffix}"
         
         reason_strs = []
         for reason_obj in self.rejection_reasons:
@@ -34,4 +46,4 @@ class PolicyResult:
             reason = reason_obj.get("reason", "No reason provided")
             reason_strs.append(f"{category}: {reason}")
         
-        return f"Policy evaluation failed: {', '.join(reason_strs)}" 
\ No newline at end of file
+        return f"Policy evaluation failed: {', '.join(reason_strs)}{suffix}" 
\ No newline at end of file
@@ -0,0 +1,315 @@
+"""Fork safety and shared-memory state for pre-fork servers."""
+
+import mmap
+import os
+import struct
+import threading
+import time
+import weakref
+from typing import Dict, Any, List, Optional, Sequence
+
+from tavoai.sdk.models import PolicyResult
+
+# Objects with an `_after_fork_in_child` method, reset in each forked child
+_FORK_AWARE: "weakref.WeakSet[Any]" = weakref.WeakSet()
+_FORK_AWARE_LOCK = threading.Lock()
+
+
+def _after_fork_in_child() -> None:
+    global _FORK_AWARE_LOCK
+    # The lock may have been held by another thread of the parent at fork time
+    _FORK_AWARE_LOCK = threading.Lock()
+    for obj in list(_FORK_AWARE):
+        obj._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def register_fork_aware(obj: Any) -> None:
+    """
+    Reset an object in every child process forked after this call.
+    
+    The object must implement `_after_fork_in_child()`, which should replace
+    locks, drop background threads and connection pools inherited from the
+    parent, and leave the object ready to lazily rebuild them.
+    
+    Args:
+        obj: Object to reset; held through a weak reference.
+    """
+    with _FORK_AWARE_LOCK:
+        _FORK_AWARE.add(obj)
+
+
+class LocalStats:
+    """In-process evaluation counters."""
+    
+    def __init__(self, fields: Sequence[str]):
+        """
+        Initialize the counters.
+        
+        Args:
+            fields: Names of the counters.
+        """
+        self.fields = tuple(fields)
+        self._counts = dict.fromkeys(self.fields, 0)
+        self._lock = threading.Lock()
+    
+    def increment(self, field: str, amount: int = 1) -> None:
+        """Add `amount` to a counter."""
+        with self._lock:
+            self._counts[field] += amount
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Return the current counter values."""
+        with self._lock:
+            return dict(self._counts)
+    
+    def _after_fork_in_child(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.fields, 0)
+
+
+class SharedStats:
+    """
+    Evaluation counters in shared memory, aggregated across forked workers.
+    
+    Create the instance in the parent before forking. Each process claims
+    its own slot on first write, so counters are updated without
+    cross-process locking; `snapshot` sums all slots. Free slots are claimed
+    first; once all are taken, a new worker reuses the slot of an exited one
+    after adding its counters to a retained total, so recycled workers
+    (e.g. gunicorn's `max_requests`) do not lose counts.
+    """
+    
+    _SLOT_HEADER = struct.Struct("q")
+    
+    def __init__(self, fields: Sequence[str], max_workers: int = 64):
+        """
+        Initialize the shared counters.
+        
+        Args:
+            fields: Names of the counters.
+            max_workers: Maximum number of processes that can record counters.
+        """
+        import multiprocessing
+        
+        self.fields = tuple(fields)
+        self.max_workers = max_workers
+        self._index = {field: i for i, field in enumerate(self.fields)}
+        self._slot_size = self._SLOT_HEADER.size + 8 * len(self.fields)
+        # One slot per worker, then the retained counters of exited workers
+        self._memory = mmap.mmap(-1, self._slot_size * (max_workers + 1))
+        self._claim_lock = multiprocessing.Lock()
+        self._write_lock = threading.Lock()
+        self._slot: Optional[int] = None
+        self._slot_pid: Optional[int] = None
+        register_fork_aware(self)
+    
+    def _own_slot(self) -> int:
+        pid = os.getpid()
+        if self._slot is not None and self._slot_pid == pid:
+            return self._slot
+        
+        with self._claim_lock:
+            owners = [
+                self._SLOT_HEADER.unpack_from(self._memory, slot * self._slot_size)[0]
+                for slot in range(self.max_workers)
+            ]
+            if pid in owners:
+                # Left by an exited worker whose PID was reused
+                slot = owners.index(pid)
+            elif 0 in owners:
+                slot = owners.index(0)
+            else:
+                exited = [slot for slot, owner in enumerate(owners) if not _pid_alive(owner)]
+                if not exited:
+                    raise RuntimeError(f"SharedStats has no free slot for more than {self.max_workers} workers")
+                slot = exited[0]
+            
+            offset = slot * self._slot_size
+            if owners[slot]:
+                self._retain(offset)
+            self._memory[offset:offset + self._slot_size] = bytes(self._slot_size)
+            self._SLOT_HEADER.pack_into(self._memory, offset, pid)
+            self._slot, self._slot_pid = slot, pid
+            return slot
+    
+    def _counters_at(self, offset: int) -> Sequence[int]:
+        return struct.unpack_from(f"{len(self.fields)}q", self._memory, offset + self._SLOT_HEADER.size)
+    
+    def _retain(self, offset: int) -> None:
+        """Add the counters of an exited worker's slot to the retained total."""
+        retained_offset = self.max_workers * self._slot_size
+        totals = [a + b for a, b in zip(self._counters_at(retained_offset), self._counters_at(offset))]
+        struct.pack_into(f"{len(self.fields)}q", self._memory, retained_offset + self._SLOT_HEADER.size, *totals)
+    
+    def increment(self, field: str, amount: int = 1) -> None:
+        """Add `amount` to a counter of the calling process."""
+        offset = self._own_slot() * self._slot_size + self._SLOT_HEADER.size + 8 * self._index[field]
+        # Only this process writes to its slot, but its threads must not interleave
+        with self._write_lock:
+            (value,) = struct.unpack_from("q", self._memory, offset)
+            struct.pack_into("q", self._memory, offset, value + amount)
+    
+    def per_worker(self) -> Dict[int, Dict[str, int]]:
+        """
+        Return the counters of each worker.
+        
+        Returns:
+            Mapping of worker PIDs to their counter values.
+        """
+        workers = {}
+        for slot in range(self.max_workers):
+            offset = slot * self._slot_size
+            (owner,) = self._SLOT_HEADER.unpack_from(self._memory, offset)
+            if owner:
+                workers[owner] = dict(zip(self.fields, self._counters_at(offset)))
+        return workers
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Return the counters summed across all workers, including those that exited."""
+        totals = dict(zip(self.fields, self._counters_at(self.max_workers * self._slot_size)))
+        for values in self.per_worker().values():
+            for field, value in values.items():
+                totals[field] += value
+        return totals
+    
+    def _after_fork_in_child(self) -> None:
+        self._write_lock = threading.Lock()
+        self._slot = self._slot_pid = None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedVerdictCache:
+    """
+    Fixed-size verdict cache in shared memory, shared by forked workers.
+    
+    Create the instance in the parent before forking and pass it to every
+    client that should share it; a verdict learned by one worker is then
+    available to all of them. It exposes the same interface as VerdictCache.
+    
+    Entries live in a hash table of `capacity` fixed-size slots. Verdicts
+    whose rejection reasons do not fit in a slot are not cached. Slots only
+    hold a digest of the key, so verdicts cannot be invalidated per policy;
+    when clients watch policy versions, keys include the version and the
+    verdicts of a replaced version are simply never looked up again.
+    """
+    
+    _ENTRY = struct.Struct("16sdBH")
+    _PROBES = 4
+    
+    def __init__(self, capacity: int = 4096, slot_size: int = 512, ttl: Optional[float] = None):
+        """
+        Initialize the shared cache.
+        
+        Args:
+            capacity: Number of slots.
+            slot_size: Size of a slot in bytes, including its header.
+            ttl: Optional time-to-live for entries, in seconds.
+        """
+        import multiprocessing
+        
+        if slot_size <= self._ENTRY.size:
+            raise ValueError(f"slot_size must be larger than {self._ENTRY.size} bytes")
+        
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self.ttl = ttl
+        self._memory = mmap.mmap(-1, capacity * slot_size)
+        self._lock = multiprocessing.Lock()
+    
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        import hashlib
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    
+    def _slots(self, digest: bytes) -> List[int]:
+        start = int.from_bytes(digest[:8], "little") % self.capacity
+        return [(start + i) % self.capacity for i in range(min(self._PROBES, self.capacity))]
+    
+    def get(self, key: str) -> Optional[PolicyResult]:
+        """
+        Look up a verdict.
+        
+        Args:
+            key: Cache key, see `verdict_cache_key`.
+        
+        Returns:
+            The cached PolicyResult, or None if missing or expired.
+        """
+        import json
+        
+        digest = self._digest(key)
+        with self._lock:
+            for slot in self._slots(digest):
+                offset = slot * self.slot_size
+                stored_digest, stored_at, allowed, length = self._ENTRY.unpack_from(self._memory, offset)
+                if stored_digest != digest:
+                    continue
+                if self.ttl is not None and time.time() - stored_at > self.ttl:
+                    return None
+                start = offset + self._ENTRY.size
+                payload = bytes(self._memory[start:start + length])
+                break
+            else:
+                return None
+        
+        return PolicyResult(bool(allowed), json.loads(payload) if payload else [])
+    
+    def put(self, key: str, result: PolicyResult) -> None:
+        """
+        Store a verdict.
+        
+        Args:
+            key: Cache key, see `verdict_cache_key`.
+            result: Verdict to store.
+        """
+        import json
+        
+        payload = json.dumps(result.rejection_reasons).encode("utf-8") if result.rejection_reasons else b""
+        if self._ENTRY.size + len(payload) > self.slot_size:
+            return
+        
+        digest = self._digest(key)
+        with self._lock:
+            # Reuse the key's slot or an empty one, otherwise evict the oldest probed entry
+            target: Optional[int] = None
+            oldest_slot, oldest_at = 0, float("inf")
+            for slot in self._slots(digest):
+                offset = slot * self.slot_size
+                stored_digest, stored_at, _, _ = self._ENTRY.unpack_from(self._memory, offset)
+                if stored_digest == digest or stored_at == 0:
+                    target = slot
+                    break
+                if stored_at < oldest_at:
+                    oldest_slot, oldest_at = slot, stored_at
+            if target is None:
+                target = oldest_slot
+            
+            offset = target * self.slot_size
+            self._ENTRY.pack_into(self._memory, offset, digest, time.time(), int(result.allowed), len(payload))
+            start = offset + self._ENTRY.size
+            self._memory[start:start + len(payload)] = payload
+    
+    def clear(self) -> None:
+        """Remove all cached verdicts."""
+        with self._lock:
+            self._memory[:] = bytes(len(self._memory))
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(
+                1 for slot in range(self.capacity)
+                if self._ENTRY.unpack_from(self._memory, slot * self.slot_size)[1] != 0
+            )
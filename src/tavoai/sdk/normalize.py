@@ -0,0 +1,387 @@
+"""Content canonicalization and near-duplicate verdict reuse."""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Any, List, Literal, Optional, Set, Tuple
+
+from tavoai.sdk.multiprocess import register_fork_aware
+
+if TYPE_CHECKING:
+    from tavoai.sdk.models import PolicyResult
+
+# Template slots masked by `ContentNormalizer(slots=COMMON_SLOTS)`; order matters,
+# as earlier patterns are replaced first
+COMMON_SLOTS: Dict[str, str] = {
+    "email": r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+",
+    "url": r"https?://\S+",
+    "uuid": r"\b[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}\b",
+    "number": r"\b\d[\d,.]*\b",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+_WORD = re.compile(r"\w+")
+
+# Bits of a SimHash fingerprint
+FINGERPRINT_BITS = 64
+
+# Unicode normalization forms accepted by `unicodedata.normalize`
+UnicodeForm = Literal["NFC", "NFD", "NFKC", "NFKD"]
+
+
+class ContentNormalizer:
+    """
+    Canonicalization applied to a policy's content before it is evaluated.
+    
+    Configured per policy with `TavoAIClient(normalizers={...})`, the
+    normalized content is what the policy server evaluates and what cache
+    keys are built from, so contents differing only in whitespace, Unicode
+    representation, casing or masked template slots share one verdict. Only
+    enable transformations that cannot change the policy's verdict: masking
+    e-mail addresses hides them from a PII policy, and casefolding hides
+    shouting from a tone policy.
+    
+    With a `near_duplicates` index, the policy declares that verdicts may
+    also be reused for content whose SimHash similarity to previously
+    evaluated content reaches the index's threshold.
+    """
+    
+    def __init__(
+        self,
+        unicode_form: Optional[UnicodeForm] = "NFKC",
+        collapse_whitespace: bool = True,
+        casefold: bool = False,
+        strip_format_characters: bool = True,
+        slots: Optional[Dict[str, str]] = None,
+        near_duplicates: Optional["NearDuplicateIndex"] = None
+    ):
+        """
+        Initialize the normalizer.
+        
+        Args:
+            unicode_form: Unicode normalization form ("NFC", "NFKC", ...), or None to keep
+              the content's representation. NFKC also folds compatibility characters
+              such as full-width letters and ligatures.
+            collapse_whitespace: Whether to replace runs of whitespace with one space and
+              strip leading and trailing whitespace.
+            casefold: Whether to casefold the content.
+            strip_format_characters: Whether to remove invisible format characters such as
+              zero-width spaces.
+            slots: Optional mapping of slot names to regular expressions; matches are
+              replaced with `<name>`, e.g. COMMON_SLOTS or {"user": r"@\\w+"}.
+            near_duplicates: Optional index reusing verdicts of similar content.
+        """
+        self.unicode_form = unicode_form
+        self.collapse_whitespace = collapse_whitespace
+        self.casefold = casefold
+        self.strip_format_characters = strip_format_characters
+        self.slots = [(name, re.compile(pattern)) for name, pattern in (slots or {}).items()]
+        self.near_duplicates = near_duplicates
+        self._lock = threading.Lock()
+        self._reset_counters()
+        register_fork_aware(self)
+    
+    def _reset_counters(self) -> None:
+        self.normalized = 0
+        self.changed = 0
+        self.masked = 0
+    
+    def normalize(self, content: str) -> str:
+        """
+        Return the canonical form of content.
+        
+        Args:
+            content: Content to normalize.
+        
+        Returns:
+            Normalized content.
+        """
+        text = content
+        if self.unicode_form:
+            text = unicodedata.normalize(self.unicode_form, text)
+        if self.strip_format_characters:
+            text = "".join(char for char in text if unicodedata.category(char) != "Cf")
+        masked = 0
+        for name, pattern in self.slots:
+            text, count = pattern.subn(f"<{name}>", text)
+            masked += count
+        if self.collapse_whitespace:
+            text = _WHITESPACE.sub(" ", text).strip()
+        if self.casefold:
+            text = text.casefold()
+        
+        with self._lock:
+            self.normalized += 1
+            self.changed += text != content
+            self.masked += masked
+        return text
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return normalization statistics.
+        
+        Returns:
+            Dictionary with the number of normalized contents, those changed by
+            normalization and the masked slots, plus the near-duplicate index
+            statistics when an index is configured.
+        """
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "normalized": self.normalized,
+                "changed": self.changed,
+                "masked_slots": self.masked,
+            }
+        if self.near_duplicates is not None:
+            stats["near_duplicates"] = self.near_duplicates.stats()
+        return stats
+    
+    def _after_fork_in_child(self) -> None:
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Compute the 64-bit SimHash fingerprint of a text.
+    
+    Word shingles are hashed and each bit of the fingerprint takes the
+    majority value of that bit across shingles, so similar texts get
+    fingerprints differing in few bits.
+    
+    Args:
+        text: Text to fingerprint.
+        shingle_size: Number of consecutive words per shingle.
+    
+    Returns:
+        Fingerprint as an unsigned 64-bit integer.
+    """
+    import hashlib
+    
+    words = _WORD.findall(text.lower())
+    if len(words) <= shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    
+    weights: Dict[int, int] = {}
+    for shingle in shingles:
+        digest = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        weights[digest] = weights.get(digest, 0) + 1
+    
+    # Weight of the shingles setting each bit, visiting set bits only
+    ones = [0] * FINGERPRINT_BITS
+    for digest, weight in weights.items():
+        while digest:
+            lowest = digest & -digest
+            ones[lowest.bit_length() - 1] += weight
+            digest ^= lowest
+    
+    total = len(shingles)
+    fingerprint = 0
+    for bit, weight in enumerate(ones):
+        if 2 * weight > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def similarity(first: int, second: int) -> float:
+    """Return the fraction of equal bits of two fingerprints."""
+    return 1.0 - bin(first ^ second).count("1") / FINGERPRINT_BITS
+
+
+class NearDuplicateIndex:
+    """
+    Verdicts of recently evaluated contents, retrievable by similar content.
+    
+    Contents are indexed by SimHash fingerprint; a lookup returns the verdict
+    of the most similar indexed content whose similarity reaches `threshold`,
+    among contents evaluated in the same context (policy, version, content
+    type, metadata and config). Fingerprints are split into bands such that
+    any fingerprint within the threshold shares at least one band exactly,
+    so lookups only compare candidates from matching bands.
+    
+    Reusing a verdict for different content is only sound for policies whose
+    verdict does not hinge on small edits. SimHash similarity of unrelated
+    texts stays below about 0.75; with the default threshold of 0.9, a
+    one-word edit is typically matched in texts of 50 words or more, and
+    short texts are only matched when (nearly) identical. Attach the index
+    to a policy's ContentNormalizer to declare that reuse safe.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        max_size: int = 10000,
+        ttl: Optional[float] = None,
+        shingle_size: int = 3
+    ):
+        """
+        Initialize the index.
+        
+        Args:
+            threshold: Smallest similarity, between 0 and 1, of reusable verdicts.
+            max_size: Maximum number of indexed contents.
+            ttl: Optional time-to-live of entries, in seconds.
+            shingle_size: Number of consecutive words per SimHash shingle.
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        self.shingle_size = shingle_size
+        self.max_distance = int((1.0 - threshold) * FINGERPRINT_BITS + 1e-9)
+        # With max_distance + 1 bands, differing bits cannot touch every band
+        bands = min(self.max_distance + 1, FINGERPRINT_BITS)
+        width, extra = divmod(FINGERPRINT_BITS, bands)
+        self._bands: List[Tuple[int, int]] = []
+        offset = 0
+        for band in range(bands):
+            size = width + (band < extra)
+            self._bands.append((offset, (1 << size) - 1))
+            offset += size
+        self._entries: "OrderedDict[int, Tuple[str, int, float, PolicyResult]]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, int], Set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._reset_counters()
+        register_fork_aware(self)
+    
+    def _reset_counters(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.exact_hits = 0
+        self.similarity_sum = 0.0
+        self.adds = 0
+        self.evictions = 0
+    
+    def _band_keys(self, context: str, fingerprint: int) -> List[Tuple[str, int, int]]:
+        return [(context, band, (fingerprint >> offset) & mask) for band, (offset, mask) in enumerate(self._bands)]
+    
+    def _remove(self, entry_id: int) -> None:
+        context, fingerprint, _, _ = self._entries.pop(entry_id)
+        for key in self._band_keys(context, fingerprint):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+    
+    def lookup(self, context: str, content: str) -> Optional[Tuple["PolicyResult", float]]:
+        """
+        Find the verdict of the most similar indexed content.
+        
+        Args:
+            context: Key of the evaluation context, starting with the policy name.
+            content: Content about to be evaluated.
+        
+        Returns:
+            (verdict, similarity) tuple, or None if no indexed content is similar enough.
+        """
+        fingerprint = simhash(content, self.shingle_size)
+        now = time.monotonic()
+        with self._lock:
+            best: Optional[Tuple[int, int]] = None
+            candidates: Set[int] = set()
+            for key in self._band_keys(context, fingerprint):
+                candidates.update(self._buckets.get(key, ()))
+            for entry_id in candidates:
+                _, indexed, added, _ = self._entries[entry_id]
+                if self.ttl is not None and now - added > self.ttl:
+                    continue
+                distance = bin(fingerprint ^ indexed).count("1")
+                if distance <= self.max_distance and (best is None or distance < best[0]):
+                    best = (distance, entry_id)
+            
+            if best is None:
+                self.misses += 1
+                return None
+            distance, entry_id = best
+            self._entries.move_to_end(entry_id)
+            score = 1.0 - distance / FINGERPRINT_BITS
+            self.hits += 1
+            self.exact_hits += distance == 0
+            self.similarity_sum += score
+            return self._entries[entry_id][3], score
+    
+    def add(self, context: str, content: str, verdict: "PolicyResult") -> None:
+        """
+        Index the verdict of evaluated content.
+        
+        Args:
+            context: Key of the evaluation context, starting with the policy name.
+            content: Evaluated content.
+            verdict: Verdict of the policy server.
+        """
+        if self.max_size <= 0:
+            return
+        fingerprint = simhash(content, self.shingle_size)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (context, fingerprint, time.monotonic(), verdict)
+            for key in self._band_keys(context, fingerprint):
+                self._buckets.setdefault(key, set()).add(entry_id)
+            self.adds += 1
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def invalidate_policy(self, policy_name: str) -> int:
+        """
+        Remove the contents indexed for a policy, e.g. after its version changed.
+        
+        Args:
+            policy_name: Name of the policy.
+        
+        Returns:
+            Number of removed contents.
+        """
+        prefixes = (policy_name + ":", policy_name + "@")
+        with self._lock:
+            stale = [entry_id for entry_id, entry in self._entries.items() if entry[0].startswith(prefixes)]
+            for entry_id in stale:
+                self._remove(entry_id)
+            return len(stale)
+    
+    def clear(self) -> None:
+        """Remove all indexed contents."""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return index statistics.
+        
+        Returns:
+            Dictionary with the similarity threshold and the matching maximum
+            number of differing fingerprint bits, hits (and those with identical
+            fingerprints), misses, hit rate, mean similarity of hits, indexed and
+            evicted contents, and the current size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "threshold": self.threshold,
+                "max_distance": self.max_distance,
+                "hits": self.hits,
+                "exact_hits": self.exact_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "mean_hit_similarity": self.similarity_sum / self.hits if self.hits else None,
+                "adds": self.adds,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+    
+    def _after_fork_in_child(self) -> None:
+        # Indexed verdicts stay valid in the child; counters start over
+        self._lock = threading.Lock()
+        self._reset_counters()
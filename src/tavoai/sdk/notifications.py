@@ -0,0 +1,255 @@
+"""Server-pushed policy version notifications."""
+
+import json
+import logging
+import random
+import socket
+import threading
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Callable, Tuple, Union
+
+# Path of the server-sent events stream of policy versions
+EVENTS_PATH = "/policies/events"
+
+# Name of the events announcing a policy version
+POLICY_VERSION_EVENT = "policy_version"
+
+
+def parse_sse(lines: Iterable[Union[str, bytes]]) -> Iterator[Tuple[str, str]]:
+    """
+    Parse a server-sent events stream.
+    
+    Args:
+        lines: Lines of the stream, without line terminators; bytes are
+          decoded as UTF-8, the only encoding of event streams.
+    
+    Yields:
+        (event name, data) for each event; the name defaults to "message".
+    """
+    event = "message"
+    data: List[str] = []
+    for raw_line in lines:
+        line = raw_line.decode("utf-8") if isinstance(raw_line, bytes) else raw_line
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+        elif line.startswith(":"):
+            # Comment, used by servers as a heartbeat
+            continue
+        else:
+            field, _, value = line.partition(":")
+            if value.startswith(" "):
+                value = value[1:]
+            if field == "event":
+                event = value
+            elif field == "data":
+                data.append(value)
+
+
+class PolicyVersionWatcher:
+    """
+    Keeps a long-lived subscription to the policy server's version events.
+    
+    A background thread reads `GET /policies/events`, a server-sent events
+    stream. On connection the server sends the current version of every
+    policy, then one event per change, each as:
+        
+        event: policy_version
+        data: {"policy": "pii_input", "version": "2024-06-01.2"}
+    
+    `on_change` is called with the policy name and its new version whenever
+    a version differs from the one last seen, including versions that
+    changed while disconnected. Lost connections are re-established with
+    exponential backoff and jitter.
+    
+    The stream goes through the `requests` session of the client's transport
+    when it has one, so it shares the client's session settings; other
+    transports cannot stream, and the watcher then opens its own session.
+    """
+    
+    def __init__(
+        self,
+        api_base_url: str,
+        on_change: Callable[[str, str], Any],
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        read_timeout: float = 60.0,
+        logger: Optional[logging.Logger] = None,
+        transport: Optional[Any] = None
+    ):
+        """
+        Initialize the watcher.
+        
+        Args:
+            api_base_url: Base URL of the policy server.
+            on_change: Callback receiving (policy_name, version), called from the watcher thread.
+            initial_backoff: Delay before the first reconnection attempt, in seconds.
+            max_backoff: Upper bound of the reconnection delay, in seconds.
+            read_timeout: Seconds without data, heartbeats included, after which
+              the connection is considered lost.
+            logger: Optional logger.
+            transport: Transport of the client, whose `session`, if any, carries the stream.
+        """
+        self.api_base_url = api_base_url
+        self.on_change = on_change
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.read_timeout = read_timeout
+        self.logger = logger
+        self.transport = transport
+        self.versions: Dict[str, str] = {}
+        self.connected = False
+        self._stop = threading.Event()
+        self._response: Optional[Any] = None
+        self._session: Optional[Any] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._reset_counters()
+    
+    def _reset_counters(self) -> None:
+        self.connections = 0
+        self.events = 0
+        self.changes = 0
+    
+    def start(self) -> "PolicyVersionWatcher":
+        """Start the watcher thread if it is not running."""
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="tavoai-policy-events", daemon=True)
+                self._thread.start()
+        return self
+    
+    def _run(self) -> None:
+        backoff = self.initial_backoff
+        while not self._stop.is_set():
+            try:
+                if self._listen():
+                    # The stream was established; start over with a short delay
+                    backoff = self.initial_backoff
+            except Exception as e:
+                if self.logger:
+                    self.logger.debug(f"Policy event stream failed: {str(e)}")
+            self.connected = False
+            
+            if self._stop.wait(backoff * random.uniform(0.5, 1.0)):
+                return
+            backoff = min(self.max_backoff, backoff * 2)
+    
+    @property
+    def session(self) -> Any:
+        """Session the stream is read with: the transport's, else one of the watcher."""
+        session = getattr(self.transport, "session", None)
+        if session is not None:
+            return session
+        if self._session is None:
+            import requests
+            
+            self._session = requests.Session()
+        return self._session
+    
+    def _listen(self) -> bool:
+        """Consume the event stream until it ends; returns whether it was established."""
+        with self.session.get(
+            f"{self.api_base_url}{EVENTS_PATH}",
+            headers={"Accept": "text/event-stream"},
+            stream=True,
+            timeout=(5.0, self.read_timeout)
+        ) as response:
+            if response.status_code != 200:
+                if self.logger:
+                    self.logger.warning(f"Policy event stream unavailable: HTTP {response.status_code}")
+                return False
+            
+            self._response = response
+            self.connected = True
+            self.connections += 1
+            try:
+                if self.stopped:
+                    return True
+                # Event streams are always UTF-8, whatever the Content-Type says
+                for event, data in parse_sse(response.iter_lines()):
+                    if event == POLICY_VERSION_EVENT:
+                        self._handle(data)
+            finally:
+                self._response = None
+        return True
+    
+    @property
+    def stopped(self) -> bool:
+        """Whether `close` was called."""
+        return self._stop.is_set()
+    
+    def _handle(self, data: str) -> None:
+        self.events += 1
+        try:
+            payload = json.loads(data)
+            policy_name, version = payload["policy"], str(payload["version"])
+        except (ValueError, KeyError, TypeError):
+            if self.logger:
+                self.logger.warning(f"Ignoring malformed policy event: {data}")
+            return
+        
+        if self.versions.get(policy_name) == version:
+            return
+        self.versions[policy_name] = version
+        self.changes += 1
+        if self.logger:
+            self.logger.info(f"Policy {policy_name} is now at version {version}")
+        try:
+            self.on_change(policy_name, version)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Policy version callback failed: {str(e)}")
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the subscription state.
+        
+        Returns:
+            Dictionary with whether the stream is connected, the number of
+            connections made, events received and version changes seen.
+        """
+        return {
+            "connected": self.connected,
+            "connections": self.connections,
+            "events": self.events,
+            "changes": self.changes,
+            "policies": len(self.versions),
+        }
+    
+    def _after_fork_in_child(self) -> None:
+        # The parent's thread and socket are gone; the child subscribes on its own
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._response = None
+        self._session = None
+        self._thread = None
+        self.connected = False
+        self._reset_counters()
+    
+    def close(self, timeout: float = 1.0) -> None:
+        """
+        Stop the watcher thread.
+        
+        Args:
+            timeout: Maximum time to wait for the thread, in seconds.
+        """
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            # Closing the response would wait for the blocked read; shutting the
+            # socket down makes that read return immediately
+            sock = getattr(getattr(response.raw, "connection", None), "sock", None)
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+        if self._session is not None:
+            self._session.close()
+            self._session = None
@@ -0,0 +1,289 @@
+"""Tiered verdict pipelines: cheap checks first, expensive policies only when needed."""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Callable
+
+from tavoai.sdk.deadline import Deadline, DeadlineSpec, resolve_deadline
+from tavoai.sdk.degradation import DegradationMode
+from tavoai.sdk.models import PolicyResult, ContentType
+
+if TYPE_CHECKING:
+    from tavoai.sdk.client import TavoAIClient
+
+# Type for local checks. They receive the content and the evaluation context
+# (content_type, metadata, config, request_id) and return a verdict, or None
+# when they cannot decide.
+LocalCheck = Callable[[str, Dict[str, Any]], Optional[PolicyResult]]
+
+# Short-circuit actions
+STOP = "stop"
+CONTINUE = "continue"
+
+# Actions when a stage fails or is over budget
+RAISE = "raise"
+ALLOW = "allow"
+DENY = "deny"
+
+
+class PipelineStage:
+    """
+    One stage of a verdict pipeline.
+    
+    A stage is either a local check or a remote policy. After the stage
+    produces a verdict, `on_allow` / `on_deny` decide whether the pipeline
+    stops with that verdict or continues with the next stage.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        policy_name: Optional[str] = None,
+        check: Optional[LocalCheck] = None,
+        on_allow: str = CONTINUE,
+        on_deny: str = STOP,
+        timeout: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        on_error: str = RAISE,
+        on_over_budget: str = DENY
+    ):
+        """
+        Initialize the stage.
+        
+        Args:
+            name: Stage name, used in statistics.
+            policy_name: Remote policy to evaluate. Exactly one of `policy_name` and `check` is required.
+            check: Local check to run.
+            on_allow: "stop" to return an allow verdict right away, "continue" to run later stages.
+            on_deny: "stop" to return a deny verdict right away, "continue" to run later stages.
+            timeout: Optional request timeout for a remote policy, in seconds. A stage that
+              times out raises StageTimeoutError and leaves the server's health untouched.
+            max_rate: Optional budget of evaluations per second.
+            on_error: "raise", "continue" (skip the stage), "allow" or "deny" when the stage fails.
+            on_over_budget: "deny" (the default), "allow" or "continue" (skip the stage) when
+              over budget.
+        """
+        if (policy_name is None) == (check is None):
+            raise ValueError("A stage needs exactly one of policy_name and check")
+        for action in (on_allow, on_deny):
+            if action not in (STOP, CONTINUE):
+                raise ValueError(f"Invalid short-circuit action: {action}")
+        if on_error not in (RAISE, CONTINUE, ALLOW, DENY):
+            raise ValueError(f"Invalid on_error action: {on_error}")
+        if on_over_budget not in (CONTINUE, ALLOW, DENY):
+            raise ValueError(f"Invalid on_over_budget action: {on_over_budget}")
+        
+        self.name = name
+        self.policy_name = policy_name
+        self.check = check
+        self.on_allow = on_allow
+        self.on_deny = on_deny
+        self.timeout = timeout
+        self.max_rate = max_rate
+        self.on_error = on_error
+        self.on_over_budget = on_over_budget
+        # Token bucket holding one second worth of evaluations, and at least one
+        # evaluation so that rates below one per second are reachable
+        self._capacity = max(1.0, max_rate or 0.0)
+        self._tokens = self._capacity
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def within_budget(self) -> bool:
+        """Consume one evaluation from the stage budget, if it has one."""
+        if self.max_rate is None:
+            return True
+        
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._refilled_at) * self.max_rate)
+            self._refilled_at = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+    
+    def run(
+        self,
+        client: "TavoAIClient",
+        content: str,
+        content_type: ContentType,
+        metadata: Dict[str, Any],
+        config: Dict[str, Any],
+        request_id: Optional[str],
+        deadline: Optional[Deadline] = None
+    ) -> Optional[PolicyResult]:
+        """
+        Run the stage.
+        
+        Returns:
+            The stage verdict, or None if a local check could not decide.
+        """
+        if self.check is not None:
+            context = {
+                "content_type": content_type,
+                "metadata": metadata,
+                "config": config,
+                "request_id": request_id,
+            }
+            return self.check(content, context)
+        
+        # __init__ guarantees a remote policy to stages without a local check
+        assert self.policy_name is not None
+        return client._evaluate_content(
+            content,
+            self.policy_name,
+            content_type,
+            metadata,
+            config,
+            request_id,
+            timeout=self.timeout,
+            deadline=deadline,
+            stage=self.name if self.timeout is not None else None
+        )
+
+
+def _forced_verdict(stage: PipelineStage, action: str, reason: str) -> PolicyResult:
+    # Marked degraded, as no policy decided it: memoization and caches skip it
+    if action == ALLOW:
+        return PolicyResult(True, degraded=True, degraded_mode=DegradationMode.FAIL_OPEN.value)
+    return PolicyResult(
+        False,
+        [{"category": "pipeline", "reason": f"Stage '{stage.name}' {reason}"}],
+        degraded=True,
+        degraded_mode=DegradationMode.FAIL_CLOSED.value
+    )
+
+
+class PolicyPipeline:
+    """
+    Ordered stages evaluated until one short-circuits.
+    
+    Typical pipelines run a local pre-check, then a fast remote policy, then
+    an expensive remote policy, stopping as soon as a stage is conclusive so
+    that most traffic finishes in the cheap tiers. A stage that continues
+    escalates the decision: when no stage stops the pipeline, the verdict
+    of the last stage that produced one is returned. If no stage produced a
+    verdict at all, `default_allow` decides.
+    
+    Example:
+        pipeline = PolicyPipeline([
+            PipelineStage("blocklist", check=blocklist_check),
+            PipelineStage("fast", policy_name="pii_fast", on_allow="stop", timeout=0.2),
+            PipelineStage("deep", policy_name="pii_classifier", max_rate=50),
+        ])
+        result = pipeline.evaluate(client, content, ContentType.INPUT)
+    """
+    
+    def __init__(self, stages: List[PipelineStage], default_allow: bool = True):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            stages: Stages in evaluation order.
+            default_allow: Verdict when no stage produced one.
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        
+        self.stages = list(stages)
+        self.default_allow = default_allow
+        self._lock = threading.Lock()
+        self._runs = 0
+        self._stage_stats = {stage.name: self._empty_stats() for stage in self.stages}
+    
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {"evaluated": 0, "allowed": 0, "denied": 0, "undecided": 0, "decided": 0, "skipped": 0, "errors": 0}
+    
+    def _record(self, stage: PipelineStage, field: str) -> None:
+        with self._lock:
+            self._stage_stats[stage.name][field] += 1
+    
+    def evaluate(
+        self,
+        client: "TavoAIClient",
+        content: str,
+        content_type: ContentType,
+        metadata: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        request_id: Optional[str] = None,
+        deadline: Optional[DeadlineSpec] = None
+    ) -> PolicyResult:
+        """
+        Evaluate content through the pipeline.
+        
+        Args:
+            client: The TavoAI client used by remote stages.
+            content: Content to evaluate.
+            content_type: Type of content (input or output).
+            metadata: Optional metadata for policy evaluation.
+            config: Optional configuration for policy evaluation.
+            request_id: Optional request ID for tracking.
+            deadline: Optional Deadline, or budget in seconds, shared by all stages.
+              Stage timeouts are further bounded by the time left.
+        
+        Returns:
+            PolicyResult of the pipeline.
+        
+        Raises:
+            The exception of a failing stage whose on_error is "raise"
+        """
+        metadata = metadata or {}
+        config = config or {}
+        deadline = resolve_deadline(deadline)
+        with self._lock:
+            self._runs += 1
+        
+        last_stage: Optional[PipelineStage] = None
+        last_result: Optional[PolicyResult] = None
+        result: Optional[PolicyResult]
+        for stage in self.stages:
+            if not stage.within_budget():
+                self._record(stage, "skipped")
+                if stage.on_over_budget == CONTINUE:
+                    continue
+                result = _forced_verdict(stage, stage.on_over_budget, "is over budget")
+            else:
+                try:
+                    result = stage.run(client, content, content_type, metadata, config, request_id, deadline)
+                except Exception:
+                    self._record(stage, "errors")
+                    if stage.on_error == RAISE:
+                        raise
+                    if stage.on_error == CONTINUE:
+                        continue
+                    result = _forced_verdict(stage, stage.on_error, "failed")
+                else:
+                    if result is None:
+                        self._record(stage, "undecided")
+                        continue
+                    self._record(stage, "evaluated")
+                    self._record(stage, "allowed" if result.allowed else "denied")
+            
+            last_stage, last_result = stage, result
+            if (stage.on_allow if result.allowed else stage.on_deny) == STOP:
+                self._record(stage, "decided")
+                return result
+        
+        if last_stage is None or last_result is None:
+            return PolicyResult(self.default_allow)
+        # Runs that fall through are decided by the last stage with a verdict
+        self._record(last_stage, "decided")
+        return last_result
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return per-stage statistics.
+        
+        Returns:
+            Dictionary with the number of pipeline runs and, for each stage, its
+            counters and `hit_rate`: the fraction of runs the stage decided.
+        """
+        with self._lock:
+            runs = self._runs
+            stages: Dict[str, Dict[str, Any]] = {name: dict(stats) for name, stats in self._stage_stats.items()}
+        
+        for stats in stages.values():
+            stats["hit_rate"] = stats["decided"] / runs if runs else 0.0
+        return {"runs": runs, "stages": stages}
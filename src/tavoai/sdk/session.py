@@ -0,0 +1,257 @@
+"""Incremental evaluation of multi-turn conversations."""
+
+import hashlib
+import threading
+from typing import TYPE_CHECKING, Dict, Any, Iterable, List, Optional, Callable, Sequence, Tuple, TypeVar, Union
+
+from tavoai.sdk.deadline import Deadline, DeadlineSpec, resolve_deadline
+from tavoai.sdk.models import PolicyResult, ContentType
+
+if TYPE_CHECKING:
+    from tavoai.sdk.client import TavoAIClient
+
+# Type of the results of rejection handlers
+R = TypeVar("R")
+
+
+class ConversationSession:
+    """
+    Evaluates a growing conversation one turn at a time.
+    
+    Policies listed in `incremental_policies` are declared turn-decomposable:
+    their verdict on a transcript is allowed only if every turn is allowed,
+    and their rejection reasons are those of the individual turns. For these
+    policies only the new turn is sent, together with a compact digest of
+    the preceding turns, and verdicts of earlier turns are reused. Each turn
+    is evaluated with its own content type, input or output, whatever the
+    call that evaluates it. The aggregated PolicyResult is the one a full
+    evaluation of the transcript would return.
+    
+    Any other policy is evaluated against the full transcript, joined with
+    `separator`, exactly as a direct client call would, with the content
+    type of the call.
+    """
+    
+    def __init__(
+        self,
+        client: "TavoAIClient",
+        request_id: str,
+        incremental_policies: Iterable[str] = (),
+        metadata: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None,
+        separator: str = "\n"
+    ):
+        """
+        Initialize the session.
+        
+        Args:
+            client: The TavoAI client to use for policy evaluation.
+            request_id: Request ID shared by all evaluations of the conversation.
+            incremental_policies: Names of turn-decomposable policies.
+            metadata: Metadata for policy evaluation.
+            config: Configuration for policy evaluation.
+            separator: Separator used to join turns into a full transcript.
+        """
+        self.client = client
+        self.request_id = request_id
+        self.incremental_policies = set(incremental_policies)
+        self.metadata = metadata or {}
+        self.config = config or {}
+        self.separator = separator
+        self.turns: List[str] = []
+        # Content type of each turn, as it was added
+        self.turn_types: List[ContentType] = []
+        # Rolling digests; _digests[i] covers turns[0..i]
+        self._digests: List[str] = []
+        self._verdicts: Dict[Tuple[str, int], PolicyResult] = {}
+        self._lock = threading.Lock()
+    
+    def context_digest(self, turn_count: Optional[int] = None) -> str:
+        """
+        Return the digest of the first `turn_count` turns (all turns by default).
+        
+        The digest chains turn hashes, so it identifies the whole prefix of the
+        conversation while staying a fixed size.
+        """
+        if turn_count is None:
+            turn_count = len(self.turns)
+        return self._digests[turn_count - 1] if turn_count else ""
+    
+    def add_turn(self, content: str, content_type: ContentType = ContentType.INPUT) -> None:
+        """
+        Append a turn to the conversation without evaluating it.
+        
+        Args:
+            content: Content of the turn.
+            content_type: Type of the turn (input or output).
+        """
+        with self._lock:
+            self._append(content, content_type)
+    
+    def _append(self, content: str, content_type: ContentType) -> None:
+        previous = self._digests[-1] if self._digests else ""
+        digest = hashlib.sha256((previous + "\0" + content).encode("utf-8")).hexdigest()
+        self.turns.append(content)
+        self.turn_types.append(content_type)
+        self._digests.append(digest)
+    
+    def evaluate_input(
+        self,
+        content: str,
+        policy_name: str,
+        on_rejection: Optional[Callable[[PolicyResult], R]] = None,
+        deadline: Optional[DeadlineSpec] = None
+    ) -> Union[PolicyResult, R]:
+        """
+        Append an input turn and evaluate the conversation against a policy.
+        
+        Args:
+            content: Content of the new turn only.
+            policy_name: Name of the policy to evaluate against.
+            on_rejection: Optional callback function called when the conversation is not allowed.
+            deadline: Optional Deadline, or budget in seconds, shared by all evaluations this call makes.
+        
+        Returns:
+            PolicyResult for the whole conversation,
+            or the result of the on_rejection callback if provided and content is not allowed.
+        """
+        with self._lock:
+            self._append(content, ContentType.INPUT)
+            return self._evaluate(policy_name, ContentType.INPUT, on_rejection, resolve_deadline(deadline))
+    
+    def evaluate_output(
+        self,
+        content: str,
+        policy_name: str,
+        on_rejection: Optional[Callable[[PolicyResult], R]] = None,
+        deadline: Optional[DeadlineSpec] = None
+    ) -> Union[PolicyResult, R]:
+        """
+        Append an output turn and evaluate the conversation against a policy.
+        
+        Args:
+            content: Content of the new turn only.
+            policy_name: Name of the policy to evaluate against.
+            on_rejection: Optional callback function called when the conversation is not allowed.
+            deadline: Optional Deadline, or budget in seconds, shared by all evaluations this call makes.
+        
+        Returns:
+            PolicyResult for the whole conversation,
+            or the result of the on_rejection callback if provided and content is not allowed.
+        """
+        with self._lock:
+            self._append(content, ContentType.OUTPUT)
+            return self._evaluate(policy_name, ContentType.OUTPUT, on_rejection, resolve_deadline(deadline))
+    
+    def evaluate_transcript(
+        self,
+        turns: Sequence[str],
+        policy_name: str,
+        content_type: ContentType = ContentType.INPUT,
+        on_rejection: Optional[Callable[[PolicyResult], R]] = None,
+        deadline: Optional[DeadlineSpec] = None
+    ) -> Union[PolicyResult, R]:
+        """
+        Evaluate a full transcript, reusing the turns this session has already seen.
+        
+        This eases migration from code that sends the whole growing transcript
+        on every turn: the turns already known to the session are skipped.
+        
+        Args:
+            turns: All turns of the conversation so far.
+            policy_name: Name of the policy to evaluate against.
+            content_type: Type of content (input or output) of the transcript, and of
+              the turns the session has not seen yet.
+            on_rejection: Optional callback function called when the conversation is not allowed.
+            deadline: Optional Deadline, or budget in seconds, shared by all evaluations this call makes.
+        
+        Returns:
+            PolicyResult for the whole conversation,
+            or the result of the on_rejection callback if provided and content is not allowed.
+        
+        Raises:
+            ValueError: If the transcript does not extend the session's conversation.
+        """
+        with self._lock:
+            known = len(self.turns)
+            if list(turns[:known]) != self.turns:
+                raise ValueError("Transcript does not extend the conversation tracked by this session")
+            for content in turns[known:]:
+                self._append(content, content_type)
+            return self._evaluate(policy_name, content_type, on_rejection, resolve_deadline(deadline))
+    
+    def _evaluate(
+        self,
+        policy_name: str,
+        content_type: ContentType,
+        on_rejection: Optional[Callable[[PolicyResult], R]],
+        deadline: Optional[Deadline]
+    ) -> Union[PolicyResult, R]:
+        # Must be called with the lock held
+        if policy_name not in self.incremental_policies:
+            result = self.client._evaluate_content(
+                self.separator.join(self.turns),
+                policy_name,
+                content_type,
+                self.metadata,
+                self.config,
+                self.request_id,
+                deadline=deadline
+            )
+        else:
+            verdicts = []
+            for index, turn in enumerate(self.turns):
+                key = (policy_name, index)
+                verdict = self._verdicts.get(key)
+                if verdict is None:
+                    verdict = self._evaluate_turn(index, turn, policy_name, self.turn_types[index], deadline)
+                    # Degraded verdicts are re-evaluated once the server is back
+                    if not verdict.degraded:
+                        self._verdicts[key] = verdict
+                verdicts.append(verdict)
+            result = _combine(verdicts)
+        
+        if not result.allowed and on_rejection:
+            return on_rejection(result)
+        return result
+    
+    def _evaluate_turn(
+        self,
+        index: int,
+        turn: str,
+        policy_name: str,
+        content_type: ContentType,
+        deadline: Optional[Deadline]
+    ) -> PolicyResult:
+        metadata = dict(self.metadata)
+        metadata["conversation"] = {
+            "session_id": self.request_id,
+            "turn_index": index,
+            "context_digest": self.context_digest(index),
+        }
+        return self.client._evaluate_content(
+            turn,
+            policy_name,
+            content_type,
+            metadata,
+            self.config,
+            self.request_id,
+            deadline=deadline
+        )
+
+
+def _combine(verdicts: List[PolicyResult]) -> PolicyResult:
+    """Combine per-turn verdicts of a turn-decomposable policy."""
+    reasons: List[Dict[str, str]] = []
+    for verdict in verdicts:
+        for reason in verdict.rejection_reasons:
+            if reason not in reasons:
+                reasons.append(reason)
+    
+    degraded = next((v for v in verdicts if v.degraded), None)
+    return PolicyResult(
+        all(v.allowed for v in verdicts),
+        reasons,
+        degraded=degraded is not None,
+        degraded_mode=degraded.degraded_mode if degraded else None
+    )
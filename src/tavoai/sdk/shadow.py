@@ -0,0 +1,261 @@
+"""Shadow evaluation of candidate policies off the request path."""
+
+import logging
+import queue
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Callable
+
+from tavoai.sdk.models import PolicyResult
+
+
+class ShadowPolicy:
+    """A candidate policy evaluated in the shadow of a primary policy."""
+    
+    def __init__(self, policy_name: str, sample_rate: float = 1.0):
+        """
+        Initialize the shadow policy.
+        
+        Args:
+            policy_name: Name of the shadow policy.
+            sample_rate: Fraction of the primary policy's evaluations to shadow.
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        
+        self.policy_name = policy_name
+        self.sample_rate = sample_rate
+    
+    def sampled(self) -> bool:
+        """Return whether the current evaluation should be shadowed."""
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+
+class ShadowDisagreement:
+    """A shadow verdict that differs from the primary verdict."""
+    
+    def __init__(
+        self,
+        primary_policy: str,
+        shadow_policy: str,
+        input_data: Dict[str, Any],
+        primary_result: PolicyResult,
+        shadow_result: PolicyResult
+    ):
+        """
+        Initialize the disagreement record.
+        
+        Args:
+            primary_policy: Name of the primary policy.
+            shadow_policy: Name of the shadow policy.
+            input_data: Input data both policies evaluated.
+            primary_result: Verdict of the primary policy.
+            shadow_result: Verdict of the shadow policy.
+        """
+        self.primary_policy = primary_policy
+        self.shadow_policy = shadow_policy
+        self.input_data = input_data
+        self.primary_result = primary_result
+        self.shadow_result = shadow_result
+        self.timestamp = time.time()
+    
+    @property
+    def request_id(self) -> Optional[str]:
+        """Request ID of the evaluation."""
+        return self.input_data.get("request_id")
+    
+    def __str__(self) -> str:
+        return (
+            f"{self.request_id}: {self.primary_policy} allowed={self.primary_result.allowed}, "
+            f"{self.shadow_policy} allowed={self.shadow_result.allowed}"
+        )
+
+
+class ShadowEvaluator:
+    """
+    Evaluates shadow policies from a bounded background queue.
+    
+    Submitting never blocks: when the queue is full the shadow evaluation is
+    dropped and counted. Shadow verdicts are only compared with the primary
+    verdict; they never change what the caller receives.
+    """
+    
+    def __init__(
+        self,
+        evaluate: Callable[[str, Dict[str, Any]], PolicyResult],
+        queue_size: int = 1000,
+        workers: int = 1,
+        max_disagreements: int = 1000,
+        on_disagreement: Optional[Callable[[ShadowDisagreement], Any]] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialize the shadow evaluator.
+        
+        Args:
+            evaluate: Function evaluating a policy against input data.
+            queue_size: Maximum number of pending shadow evaluations.
+            workers: Number of background worker threads.
+            max_disagreements: Number of recent disagreements kept in `disagreements`.
+            on_disagreement: Optional callback called from a worker for each disagreement.
+            logger: Optional logger.
+        """
+        self.evaluate = evaluate
+        self.queue_size = queue_size
+        self.workers = workers
+        self.on_disagreement = on_disagreement
+        self.logger = logger
+        self.disagreements: "deque[ShadowDisagreement]" = deque(maxlen=max_disagreements)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._counts_lock = threading.Lock()
+        self._counts = self._empty_counts()
+    
+    @staticmethod
+    def _empty_counts() -> Dict[str, int]:
+        return {"submitted": 0, "dropped": 0, "evaluated": 0, "agreed": 0, "disagreed": 0, "errors": 0}
+    
+    def _count(self, field: str) -> None:
+        with self._counts_lock:
+            self._counts[field] += 1
+    
+    def submit(
+        self,
+        primary_policy: str,
+        shadow_policy: str,
+        input_data: Dict[str, Any],
+        primary_result: PolicyResult
+    ) -> bool:
+        """
+        Queue a shadow evaluation without blocking.
+        
+        Args:
+            primary_policy: Name of the primary policy.
+            shadow_policy: Name of the shadow policy.
+            input_data: Input data the primary policy evaluated.
+            primary_result: Verdict of the primary policy.
+        
+        Returns:
+            True if queued, False if dropped because the queue is full.
+        """
+        if not self._threads:
+            self._start()
+        
+        try:
+            self._queue.put_nowait((primary_policy, shadow_policy, input_data, primary_result))
+        except queue.Full:
+            self._count("dropped")
+            return False
+        
+        self._count("submitted")
+        return True
+    
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"tavoai-shadow-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+    
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._run(*item)
+            finally:
+                self._queue.task_done()
+    
+    def _run(
+        self,
+        primary_policy: str,
+        shadow_policy: str,
+        input_data: Dict[str, Any],
+        primary_result: PolicyResult
+    ) -> None:
+        try:
+            shadow_result = self.evaluate(shadow_policy, input_data)
+        except Exception as e:
+            self._count("errors")
+            if self.logger:
+                self.logger.debug(f"Shadow evaluation of {shadow_policy} policy failed: {str(e)}")
+            return
+        
+        self._count("evaluated")
+        if shadow_result.allowed == primary_result.allowed:
+            self._count("agreed")
+            return
+        
+        self._count("disagreed")
+        disagreement = ShadowDisagreement(primary_policy, shadow_policy, input_data, primary_result, shadow_result)
+        self.disagreements.append(disagreement)
+        if self.logger:
+            self.logger.info(f"Shadow policy disagreement: {disagreement}")
+        if self.on_disagreement:
+            try:
+                self.on_disagreement(disagreement)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Shadow disagreement callback failed: {str(e)}")
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return shadow evaluation statistics.
+        
+        Returns:
+            Dictionary with submitted, dropped, evaluated, agreed, disagreed and
+            failed shadow evaluations, the disagreement rate and the queue depth.
+        """
+        with self._counts_lock:
+            stats: Dict[str, Any] = dict(self._counts)
+        stats["disagreement_rate"] = stats["disagreed"] / stats["evaluated"] if stats["evaluated"] else 0.0
+        stats["queued"] = self._queue.qsize()
+        return stats
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until queued shadow evaluations are done.
+        
+        Args:
+            timeout: Maximum time to wait, in seconds.
+        
+        Returns:
+            True if the queue was drained in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+    
+    def _after_fork_in_child(self) -> None:
+        # Queued work and worker threads belong to the parent process
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._counts_lock = threading.Lock()
+        self._counts = self._empty_counts()
+        self.disagreements.clear()
+    
+    def close(self, timeout: float = 1.0) -> None:
+        """
+        Stop the worker threads after the queued evaluations.
+        
+        Args:
+            timeout: Maximum time to wait for each worker, in seconds.
+        """
+        threads, self._threads = self._threads, []
+        for _ in threads:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                break
+        for thread in threads:
+            thread.join(timeout=timeout)
@@ -0,0 +1,627 @@
+"""In-process stub policy server for tests and benchmarks."""
+
+import json
+import os
+import queue
+import random
+import re
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Callable, Set, Tuple, Union
+
+from tavoai.sdk.notifications import EVENTS_PATH, POLICY_VERSION_EVENT
+
+# A stub verdict is either a fixed allow flag or a callable computing the raw
+# server result from the evaluation input.
+StubVerdict = Union[bool, Callable[[Dict[str, Any]], Dict[str, Any]]]
+
+_EVALUATE_PATH = re.compile(r"^/policies/(?P<policy>[^/]+)/evaluate$")
+
+
+class _ConnectionCounting(socketserver.BaseServer):
+    # Benchmarks open many connections at once
+    request_queue_size = 256
+    daemon_threads = True
+    stub: "StubPolicyServer"
+    
+    def process_request(self, request: Any, client_address: Any) -> None:
+        with self.stub._count_lock:
+            self.stub._open_sockets.add(request)
+        self.stub._connection_opened()
+        super().process_request(request, client_address)
+    
+    def shutdown_request(self, request: Any) -> None:
+        with self.stub._count_lock:
+            self.stub._open_sockets.discard(request)
+        super().shutdown_request(request)
+        self.stub._connection_closed()
+    
+    def shutdown(self) -> None:
+        super().shutdown()
+        # Keep-alive connections would otherwise outlive the server
+        with self.stub._count_lock:
+            sockets = list(self.stub._open_sockets)
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        import sys
+        # Clients that time out close their connection before the reply is written
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _StubHTTPServer(_ConnectionCounting, ThreadingHTTPServer):
+    pass
+
+
+class _StubUnixServer(_ConnectionCounting, socketserver.ThreadingUnixStreamServer):
+    pass
+
+
+class _FramedHandler(socketserver.StreamRequestHandler):
+    """Answers length-prefixed request frames on a persistent connection, see FramedTransport."""
+    
+    server: _StubUnixServer
+    
+    def handle(self) -> None:
+        from tavoai.sdk.framing import encode_message, read_message
+        
+        while True:
+            try:
+                received = read_message(self.rfile)
+            except (ConnectionError, ValueError):
+                return
+            if received is None:
+                return
+            request, codec = received
+            status, payload = self.server.stub.handle(request["method"], request["path"], request.get("body"))
+            # Replies use the codec of the request
+            self.wfile.write(encode_message({"status": status, "body": payload}, codec))
+
+
+class _StubH2Server:
+    """
+    Minimal HTTP/2 server with prior knowledge (h2c), built on the `h2` package.
+    
+    Each connection is read by its own thread, and each request is answered
+    from a thread of its own, so that concurrent streams of one connection
+    are served in parallel.
+    """
+    
+    def __init__(self, stub: "StubPolicyServer", address: Tuple[str, int]):
+        self.stub = stub
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind(address)
+        self.socket.listen(256)
+        self.server_address = self.socket.getsockname()
+        self._connections: Set[socket.socket] = set()
+    
+    def serve_forever(self) -> None:
+        while True:
+            try:
+                sock, _ = self.socket.accept()
+            except OSError:
+                # The listening socket was closed
+                return
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+    
+    def _serve(self, sock: socket.socket) -> None:
+        import h2.config
+        import h2.connection
+        import h2.events
+        import h2.exceptions
+        import h2.settings
+        
+        self.stub._connection_opened()
+        self._connections.add(sock)
+        connection = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        lock = threading.Lock()
+        pending: Dict[int, Tuple[Dict[str, str], bytearray]] = {}
+        try:
+            with lock:
+                connection.initiate_connection()
+                connection.update_settings({h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: 1000})
+                sock.sendall(connection.data_to_send())
+            
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    return
+                with lock:
+                    events = connection.receive_data(data)
+                    sock.sendall(connection.data_to_send())
+                for event in events:
+                    if isinstance(event, h2.events.RequestReceived):
+                        # Names and values arrive decoded, as header_encoding is set
+                        headers = {str(name): str(value) for name, value in event.headers}
+                        pending[event.stream_id] = (headers, bytearray())
+                    elif isinstance(event, h2.events.DataReceived):
+                        pending[event.stream_id][1].extend(event.data)
+                        with lock:
+                            connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, h2.events.StreamEnded):
+                        headers, body = pending.pop(event.stream_id)
+                        threading.Thread(
+                            target=self._respond,
+                            args=(sock, connection, lock, event.stream_id, headers, bytes(body)),
+                            daemon=True
+                        ).start()
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+        except (OSError, h2.exceptions.ProtocolError):
+            pass
+        finally:
+            self._connections.discard(sock)
+            sock.close()
+            self.stub._connection_closed()
+    
+    def _respond(
+        self,
+        sock: socket.socket,
+        connection: Any,
+        lock: threading.Lock,
+        stream_id: int,
+        headers: Dict[str, str],
+        body: bytes
+    ) -> None:
+        try:
+            decoded = json.loads(body) if body else None
+        except ValueError:
+            status, payload = 400, {"error": "Invalid JSON"}
+        else:
+            status, payload = self.stub.handle(headers[":method"], headers[":path"], decoded)
+        
+        encoded = json.dumps(payload).encode("utf-8")
+        try:
+            with lock:
+                connection.send_headers(stream_id, [
+                    (":status", str(status)),
+                    ("content-type", "application/json"),
+                    ("content-length", str(len(encoded))),
+                ])
+                frame_size = connection.max_outbound_frame_size
+                for offset in range(0, len(encoded), frame_size):
+                    connection.send_data(stream_id, encoded[offset:offset + frame_size])
+                connection.end_stream(stream_id)
+                sock.sendall(connection.data_to_send())
+        except Exception:
+            # The client reset the stream or went away
+            pass
+    
+    def shutdown(self) -> None:
+        # Closing alone would not wake the thread blocked in accept()
+        for sock in [self.socket] + list(self._connections):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    
+    def server_close(self) -> None:
+        self.socket.close()
+
+
+class StubPolicy:
+    """
+    Behaviour of a single policy served by the stub server.
+    
+    Latency is either a fixed number of seconds or a (min, max) range
+    sampled uniformly per evaluation.
+    """
+    
+    def __init__(
+        self,
+        verdict: StubVerdict = True,
+        rejection_reasons: Optional[List[Dict[str, str]]] = None,
+        latency: Union[float, Tuple[float, float]] = 0.0,
+        error_rate: float = 0.0
+    ):
+        """
+        Initialize the stub policy.
+        
+        Args:
+            verdict: Fixed allow flag, or callable returning the raw result for an input.
+            rejection_reasons: Rejection reasons returned with a fixed deny verdict.
+            latency: Seconds to wait before answering, or a (min, max) range.
+            error_rate: Fraction of evaluations answered with HTTP 500.
+        """
+        self.verdict = verdict
+        self.rejection_reasons = rejection_reasons or []
+        self.latency = latency
+        self.error_rate = error_rate
+    
+    def sample_latency(self) -> float:
+        """Return the latency to apply to one evaluation, in seconds."""
+        if isinstance(self.latency, tuple):
+            return random.uniform(*self.latency)
+        return self.latency
+    
+    def evaluate(self, input_data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Evaluate an input without applying latency.
+        
+        Args:
+            input_data: Evaluation input.
+        
+        Returns:
+            (HTTP status, response payload) tuple.
+        """
+        if self.error_rate and random.random() < self.error_rate:
+            return 500, {"error": "Injected stub error"}
+        
+        if callable(self.verdict):
+            return 200, self.verdict(input_data)
+        
+        return 200, {
+            "allow": self.verdict,
+            "rejection_reasons": [] if self.verdict else list(self.rejection_reasons),
+        }
+
+
+class StubPolicyServer:
+    """
+    Minimal policy server running in a background thread.
+    
+    Implements `POST /policies/{name}/evaluate`, `POST /batch/evaluate`,
+    `GET /health` and the `GET /policies/events` stream of policy versions,
+    with configurable per-policy latency, error rates and verdicts. Policies
+    without an explicit configuration use `default`; when `default` is None
+    they answer 404. `set_policy_version` publishes a new policy version to
+    every subscriber.
+    
+    `capacity` emulates a server with a fixed number of workers: requests
+    beyond it queue (raising their latency), and once `max_queue` requests
+    are queued, further requests are answered with HTTP 503. Capacity can be
+    changed while the server runs.
+    
+    With `http2`, the server speaks HTTP/2 with prior knowledge (h2c) instead
+    of HTTP/1.1, which requires the `h2` package; the event stream is only
+    served over HTTP/1.1. With `unix_socket`, it listens on a Unix domain
+    socket instead of TCP, and `url` is a unix:// URL; `framed` then selects
+    the binary protocol of FramedTransport instead of HTTP/1.1. `connection_count` and `peak_connections` count
+    the client connections accepted and the most open at once.
+    
+    Example:
+        with StubPolicyServer({"pii": StubPolicy(False)}) as server:
+            client = TavoAIClient(api_base_url=server.url)
+    """
+    
+    def __init__(
+        self,
+        policies: Optional[Dict[str, StubPolicy]] = None,
+        default: Optional[StubPolicy] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        capacity: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        policy_versions: Optional[Dict[str, str]] = None,
+        heartbeat_interval: float = 15.0,
+        http2: bool = False,
+        unix_socket: Optional[str] = None,
+        framed: bool = False
+    ):
+        """
+        Initialize the stub server.
+        
+        Args:
+            policies: Mapping of policy names to their stub behaviour.
+            default: Behaviour of policies missing from `policies`.
+            host: Interface to bind.
+            port: Port to bind, 0 for an ephemeral port.
+            capacity: Optional number of evaluation requests served at once.
+            max_queue: Optional number of requests allowed to wait for capacity.
+            policy_versions: Initial versions of the policies, sent to new subscribers.
+            heartbeat_interval: Seconds between heartbeats on idle event streams.
+            http2: Whether to serve HTTP/2 with prior knowledge instead of HTTP/1.1.
+            unix_socket: Optional path of a Unix domain socket to listen on instead of
+              `host` and `port`; an existing file at that path is replaced.
+            framed: Whether to serve length-prefixed binary frames on `unix_socket`
+              instead of HTTP/1.1.
+        """
+        if framed and unix_socket is None:
+            raise ValueError("The framed protocol is only served on a Unix domain socket")
+        if http2 and unix_socket is not None:
+            raise ValueError("HTTP/2 is only served over TCP")
+        self.policies = dict(policies or {})
+        self.default = default
+        self.host = host
+        self.port = port
+        self.http2 = http2
+        self.unix_socket = unix_socket
+        self.framed = framed
+        self.request_count = 0
+        self.evaluation_count = 0
+        self.connection_count = 0
+        self.open_connections = 0
+        self.peak_connections = 0
+        self.max_queue = max_queue
+        self._capacity = capacity
+        self._active = 0
+        self._queued = 0
+        self._capacity_cond = threading.Condition()
+        self._count_lock = threading.Lock()
+        self._open_sockets: Set[socket.socket] = set()
+        self.policy_versions = dict(policy_versions or {})
+        self.heartbeat_interval = heartbeat_interval
+        self._subscribers: List["queue.Queue[Optional[Tuple[str, str]]]"] = []
+        self._subscribers_lock = threading.Lock()
+        self._server: Optional[Union[ThreadingHTTPServer, _StubUnixServer, _StubH2Server]] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        if self.unix_socket is not None:
+            return f"unix://{self.unix_socket}"
+        return f"http://{self.host}:{self.port}"
+    
+    @property
+    def capacity(self) -> Optional[int]:
+        """Number of evaluation requests served at once, None for unlimited."""
+        return self._capacity
+    
+    @capacity.setter
+    def capacity(self, capacity: Optional[int]) -> None:
+        with self._capacity_cond:
+            self._capacity = capacity
+            self._capacity_cond.notify_all()
+    
+    def _enter(self) -> bool:
+        """Wait for a free worker; returns False if the queue is full."""
+        with self._capacity_cond:
+            if self._capacity is not None and self._active >= self._capacity:
+                if self.max_queue is not None and self._queued >= self.max_queue:
+                    return False
+                self._queued += 1
+                self._capacity_cond.wait_for(lambda: self._capacity is None or self._active < self._capacity)
+                self._queued -= 1
+            self._active += 1
+            return True
+    
+    def _leave(self) -> None:
+        with self._capacity_cond:
+            self._active -= 1
+            self._capacity_cond.notify()
+    
+    def _connection_opened(self) -> None:
+        with self._count_lock:
+            self.connection_count += 1
+            self.open_connections += 1
+            self.peak_connections = max(self.peak_connections, self.open_connections)
+    
+    def _connection_closed(self) -> None:
+        with self._count_lock:
+            self.open_connections -= 1
+    
+    def policy(self, policy_name: str) -> Optional[StubPolicy]:
+        """Return the stub behaviour of a policy, or None if it does not exist."""
+        return self.policies.get(policy_name, self.default)
+    
+    @property
+    def subscriber_count(self) -> int:
+        """Number of open event streams."""
+        with self._subscribers_lock:
+            return len(self._subscribers)
+    
+    def set_policy_version(self, policy_name: str, version: str, policy: Optional[StubPolicy] = None) -> None:
+        """
+        Publish a new version of a policy to every event stream.
+        
+        Args:
+            policy_name: Name of the policy.
+            version: New version.
+            policy: Optional behaviour of the new version, installed before publishing.
+        """
+        if policy is not None:
+            self.policies[policy_name] = policy
+        with self._subscribers_lock:
+            self.policy_versions[policy_name] = version
+            for events in self._subscribers:
+                events.put((policy_name, version))
+    
+    def disconnect_subscribers(self) -> None:
+        """Close every event stream, e.g. to exercise reconnection."""
+        with self._subscribers_lock:
+            for events in self._subscribers:
+                events.put(None)
+    
+    def _subscribe(self) -> "queue.Queue[Optional[Tuple[str, str]]]":
+        events: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue()
+        with self._subscribers_lock:
+            # New subscribers first receive the current version of every policy
+            for item in self.policy_versions.items():
+                events.put(item)
+            self._subscribers.append(events)
+        return events
+    
+    def _unsubscribe(self, events: "queue.Queue[Optional[Tuple[str, str]]]") -> None:
+        with self._subscribers_lock:
+            self._subscribers.remove(events)
+    
+    def handle(self, method: str, path: str, body: Optional[Dict[str, Any]]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handle one request, independently of the HTTP layer.
+        
+        Args:
+            method: HTTP method.
+            path: Request path.
+            body: Decoded JSON body, if any.
+        
+        Returns:
+            (HTTP status, response payload) tuple.
+        """
+        with self._count_lock:
+            self.request_count += 1
+        
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        
+        if method != "POST":
+            return 405, {"error": "Method not allowed"}
+        
+        if not self._enter():
+            return 503, {"error": "Server overloaded"}
+        try:
+            return self._handle_post(path, body)
+        finally:
+            self._leave()
+    
+    def _handle_post(self, path: str, body: Optional[Dict[str, Any]]) -> Tuple[int, Dict[str, Any]]:
+        match = _EVALUATE_PATH.match(path)
+        if match:
+            status, payload = self._evaluate([(match.group("policy"), (body or {}).get("input", {}))])[0]
+            return status, payload
+        
+        if path == "/batch/evaluate":
+            evaluations = [
+                (evaluation.get("policy", ""), evaluation.get("input", {}))
+                for evaluation in (body or {}).get("evaluations", [])
+            ]
+            results = []
+            for status, payload in self._evaluate(evaluations):
+                if status == 200:
+                    results.append({"status": status, "result": payload})
+                else:
+                    results.append({"status": status, "error": payload.get("error", "")})
+            return 200, {"results": results}
+        
+        return 404, {"error": f"Unknown path {path}"}
+    
+    def _evaluate(self, evaluations: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+        with self._count_lock:
+            self.evaluation_count += len(evaluations)
+        
+        outcomes = []
+        latency = 0.0
+        for policy_name, input_data in evaluations:
+            policy = self.policy(policy_name)
+            if policy is None:
+                outcomes.append((404, {"error": f"Policy '{policy_name}' not found"}))
+                continue
+            latency = max(latency, policy.sample_latency())
+            outcomes.append(policy.evaluate(input_data))
+        
+        # A batch is served in parallel on the server, so it costs its slowest item
+        if latency > 0:
+            time.sleep(latency)
+        return outcomes
+    
+    def start(self) -> "StubPolicyServer":
+        """Start serving in a background thread."""
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, Nagle's
+            # algorithm and delayed ACKs add ~40 ms to keep-alive requests
+            disable_nagle_algorithm = True
+            
+            def _reply(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    status, payload = 400, {"error": "Invalid JSON"}
+                else:
+                    status, payload = stub.handle(method, self.path, body)
+                
+                encoded = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+            
+            def _write_chunk(self, data: bytes) -> None:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            
+            def _stream_events(self) -> None:
+                with stub._count_lock:
+                    stub.request_count += 1
+                events = stub._subscribe()
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Cache-Control", "no-cache")
+                    # One chunk per event, so clients see each event as soon as it is sent
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    while True:
+                        try:
+                            item = events.get(timeout=stub.heartbeat_interval)
+                        except queue.Empty:
+                            self._write_chunk(b": heartbeat\n\n")
+                            continue
+                        if item is None:
+                            break
+                        data = json.dumps({"policy": item[0], "version": item[1]})
+                        self._write_chunk(f"event: {POLICY_VERSION_EVENT}\ndata: {data}\n\n".encode("utf-8"))
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.close_connection = True
+                finally:
+                    stub._unsubscribe(events)
+            
+            def do_GET(self) -> None:
+                if self.path == EVENTS_PATH:
+                    self._stream_events()
+                else:
+                    self._reply("GET")
+            
+            def do_POST(self) -> None:
+                self._reply("POST")
+            
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+        
+        if self.unix_socket is not None:
+            if os.path.exists(self.unix_socket):
+                os.unlink(self.unix_socket)
+            if not self.framed:
+                # TCP_NODELAY does not apply to Unix domain sockets
+                Handler.disable_nagle_algorithm = False
+            self._server = _StubUnixServer(self.unix_socket, _FramedHandler if self.framed else Handler)
+            self._server.stub = self
+        elif self.http2:
+            self._server = _StubH2Server(self, (self.host, self.port))
+            self.port = self._server.server_address[1]
+        else:
+            self._server = _StubHTTPServer((self.host, self.port), Handler)
+            self._server.stub = self
+            self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="tavoai-stub-server",
+            daemon=True
+        )
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop the server and wait for the serving thread to exit."""
+        self.disconnect_subscribers()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            if self.unix_socket is not None and os.path.exists(self.unix_socket):
+                os.unlink(self.unix_socket)
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+    
+    def __enter__(self) -> "StubPolicyServer":
+        return self.start()
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
@@ -0,0 +1,633 @@
+"""Transports carrying requests from the client to the policy server."""
+
+import importlib.util
+import json
+import socket
+import threading
+import time
+from typing import Dict, Any, Optional, Protocol, Union
+
+from tavoai.sdk.exceptions import ConcurrencyLimitError
+
+# httpx is only imported by the transports using it, as it takes tens of
+# milliseconds to load
+HAS_HTTPX = importlib.util.find_spec("httpx") is not None
+
+# Names of the built-in transports, see `create_transport`
+REQUESTS = "requests"
+HTTP1 = "http1"
+HTTP2 = "http2"
+FRAMED = "framed"
+
+# Scheme of base URLs naming a Unix domain socket, e.g. unix:///run/tavoai.sock
+UNIX_SCHEME = "unix://"
+
+
+class TransportResponse:
+    """Status and body of a policy server response."""
+    
+    __slots__ = ("status_code", "content")
+    
+    def __init__(self, status_code: int, content: bytes):
+        """
+        Initialize the response.
+        
+        Args:
+            status_code: HTTP status code.
+            content: Raw response body.
+        """
+        self.status_code = status_code
+        self.content = content
+    
+    @property
+    def text(self) -> str:
+        """Response body decoded as UTF-8."""
+        return self.content.decode("utf-8", errors="replace")
+    
+    def json(self) -> Any:
+        """Response body decoded as JSON."""
+        return json.loads(self.content)
+
+
+class Transport(Protocol):
+    """
+    Interface of the synchronous transports.
+    
+    `request` returns an object with `status_code`, `text` and `json()`, and
+    raises the built-in ConnectionError when the server cannot be reached
+    and TimeoutError when it does not answer in time. Transports with a
+    bounded connection pool raise ConcurrencyLimitError when no connection
+    frees up in time, which says nothing about the server's health.
+    Transports must be safe to use from several threads.
+    """
+    
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        ...
+    
+    def close(self) -> None:
+        ...
+
+
+class AsyncTransport(Protocol):
+    """Interface of the asynchronous transports, with the semantics of Transport."""
+    
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        ...
+    
+    async def aclose(self) -> None:
+        ...
+
+
+def _require_httpx(name: str) -> Any:
+    """Import and return httpx, which the transport called `name` requires."""
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError(
+            f"The {name} transport requires httpx. Install it with: pip install 'tavoai-sdk[http2]'"
+        ) from e
+    return httpx
+
+
+class RequestsTransport:
+    """
+    HTTP/1.1 through a pooled `requests` session.
+    
+    The pool keeps up to `pool_maxsize` keep-alive connections; requests
+    beyond that open short-lived extra connections, so the number of sockets
+    follows the number of requests in flight.
+    """
+    
+    def __init__(self, base_url: str, pool_maxsize: int = 32):
+        """
+        Initialize the transport.
+        
+        Args:
+            base_url: Base URL of the policy server.
+            pool_maxsize: Maximum number of pooled connections.
+        """
+        self.base_url = base_url
+        self.pool_maxsize = pool_maxsize
+        self._session: Optional[Any] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def session(self) -> Any:
+        """Pooled HTTP session of the current process, created on first use."""
+        if self._session is None:
+            import requests
+            
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=self.pool_maxsize
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+    
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """Send a request; returns the `requests` response."""
+        import requests
+        
+        url = f"{self.base_url}{path}"
+        try:
+            if method == "GET":
+                return self.session.get(url, timeout=timeout)
+            return self.session.post(url, json=body, timeout=timeout)
+        except requests.exceptions.ConnectionError as e:
+            raise ConnectionError(str(e)) from e
+        except requests.exceptions.Timeout as e:
+            raise TimeoutError(str(e)) from e
+    
+    def close(self) -> None:
+        """Close the pooled connections."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def _after_fork_in_child(self) -> None:
+        # Sockets of the parent's pool must not be shared; the child opens its own
+        self._session = None
+        self._lock = threading.Lock()
+
+
+class PooledHTTPTransport:
+    """
+    HTTP/1.1 through a bounded urllib3 connection pool.
+    
+    Unlike RequestsTransport, the pool never holds more than `maxsize`
+    connections: requests wait for a free connection instead of opening
+    extra ones. It also skips the per-request overhead of `requests`
+    sessions.
+    """
+    
+    def __init__(self, base_url: str, maxsize: int = 32):
+        """
+        Initialize the transport.
+        
+        Args:
+            base_url: Base URL of the policy server.
+            maxsize: Maximum number of connections.
+        """
+        self.base_url = base_url
+        self.maxsize = maxsize
+        self._pool: Optional[Any] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def pool(self) -> Any:
+        """Connection pool of the current process, created on first use."""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = self._create_pool()
+        return self._pool
+    
+    def _create_pool(self) -> Any:
+        import urllib3
+        
+        return urllib3.connection_from_url(self.base_url, maxsize=self.maxsize, block=True)
+    
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        """Send a request; waiting for a free connection counts towards the timeout."""
+        import urllib3
+        from urllib3.exceptions import EmptyPoolError, HTTPError, NewConnectionError
+        
+        payload = None if body is None else json.dumps(body).encode("utf-8")
+        try:
+            response = self.pool.urlopen(
+                method,
+                path,
+                body=payload,
+                headers={"Content-Type": "application/json"} if payload is not None else None,
+                timeout=urllib3.Timeout(connect=timeout, read=timeout),
+                pool_timeout=timeout,
+                retries=False
+            )
+        except NewConnectionError as e:
+            raise ConnectionError(str(e)) from e
+        except EmptyPoolError as e:
+            # Every pooled connection stayed busy: local saturation, not a slow server
+            raise ConcurrencyLimitError(f"No connection to {self.base_url} freed up within {timeout}s") from e
+        except urllib3.exceptions.TimeoutError as e:
+            raise TimeoutError(str(e)) from e
+        except HTTPError as e:
+            raise ConnectionError(str(e)) from e
+        return TransportResponse(response.status, response.data)
+    
+    def close(self) -> None:
+        """Close the pooled connections."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+    
+    def _after_fork_in_child(self) -> None:
+        self._pool = None
+        self._lock = threading.Lock()
+
+
+def unix_socket_path(base_url: str) -> Optional[str]:
+    """Return the socket path of a unix:// base URL, or None for other URLs."""
+    if base_url.startswith(UNIX_SCHEME):
+        return base_url[len(UNIX_SCHEME):]
+    return None
+
+
+class UnixHTTPTransport(PooledHTTPTransport):
+    """
+    HTTP/1.1 over a Unix domain socket, for policy servers running as a sidecar.
+    
+    Skips the TCP/IP stack of loopback connections; the bounded pool works
+    as with PooledHTTPTransport.
+    """
+    
+    def __init__(self, socket_path: str, maxsize: int = 32):
+        """
+        Initialize the transport.
+        
+        Args:
+            socket_path: Path of the policy server's Unix domain socket.
+            maxsize: Maximum number of connections.
+        """
+        super().__init__(f"{UNIX_SCHEME}{socket_path}", maxsize)
+        self.socket_path = socket_path
+    
+    def _create_pool(self) -> Any:
+        import urllib3
+        from urllib3.connection import HTTPConnection
+        from urllib3.exceptions import NewConnectionError
+        
+        socket_path = self.socket_path
+        
+        class UnixHTTPConnection(HTTPConnection):
+            def _new_conn(self) -> socket.socket:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(self.timeout)
+                try:
+                    sock.connect(socket_path)
+                except OSError as e:
+                    sock.close()
+                    raise NewConnectionError(self, f"Failed to connect to {socket_path}: {e}") from e
+                return sock
+        
+        class UnixHTTPConnectionPool(urllib3.HTTPConnectionPool):
+            ConnectionCls = UnixHTTPConnection
+        
+        # The host only fills the Host header
+        return UnixHTTPConnectionPool("localhost", maxsize=self.maxsize, block=True)
+
+
+def _httpx_client_options(httpx: Any, base_url: str, http2: bool, max_connections: int) -> Dict[str, Any]:
+    # Plain-text HTTP/2 has no protocol negotiation, so the client must assume it
+    prior_knowledge = http2 and base_url.startswith("http://")
+    return {
+        "base_url": base_url,
+        "http1": not prior_knowledge,
+        "http2": http2,
+        "limits": httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    }
+
+
+def _httpx_response(response: Any) -> TransportResponse:
+    return TransportResponse(response.status_code, response.content)
+
+
+class InMemoryTransport:
+    """
+    Serves requests from a StubPolicyServer in the calling thread, without sockets.
+    
+    Bodies are encoded to JSON and back as on the wire, and the stub's
+    latency and capacity apply. A request that takes longer than its timeout
+    raises TimeoutError once it completes.
+    """
+    
+    def __init__(self, server: Any):
+        """
+        Initialize the transport.
+        
+        Args:
+            server: StubPolicyServer answering the requests; it need not be started.
+        """
+        self.server = server
+    
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        """Handle a request with the stub server."""
+        started = time.monotonic()
+        decoded = None if body is None else json.loads(json.dumps(body))
+        status, payload = self.server.handle(method, path, decoded)
+        if timeout is not None and time.monotonic() - started > timeout:
+            raise TimeoutError(f"Request to {path} took longer than {timeout:.3f}s")
+        return TransportResponse(status, json.dumps(payload).encode("utf-8"))
+    
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class AsyncHTTPTransport:
+    """
+    HTTP/1.1 or HTTP/2 through an httpx AsyncClient.
+    
+    With HTTP/2, concurrent requests share `max_connections` multiplexed
+    connections; with HTTP/1.1 each request in flight holds a connection.
+    Requires httpx.
+    """
+    
+    def __init__(self, base_url: str, http2: bool = False, max_connections: Optional[int] = None):
+        """
+        Initialize the transport.
+        
+        Args:
+            base_url: Base URL of the policy server.
+            http2: Whether to use HTTP/2.
+            max_connections: Maximum number of connections; defaults to 1 with HTTP/2 and 32 otherwise.
+        """
+        self._httpx = _require_httpx("HTTP/2" if http2 else "async HTTP/1.1")
+        self.base_url = base_url
+        self.http2 = http2
+        self.max_connections = max_connections or (1 if http2 else 32)
+        self._client: Optional[Any] = None
+    
+    @property
+    def client(self) -> Any:
+        """httpx AsyncClient, created on first use."""
+        if self._client is None:
+            options = _httpx_client_options(self._httpx, self.base_url, self.http2, self.max_connections)
+            self._client = self._httpx.AsyncClient(**options)
+        return self._client
+    
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        """Send a request."""
+        try:
+            return _httpx_response(await self.client.request(method, path, json=body, timeout=timeout))
+        except self._httpx.PoolTimeout as e:
+            # Every pooled connection stayed busy: local saturation, not a slow server
+            raise ConcurrencyLimitError(f"No connection to {self.base_url} freed up within {timeout}s") from e
+        except self._httpx.TimeoutException as e:
+            raise TimeoutError(str(e)) from e
+        except self._httpx.TransportError as e:
+            raise ConnectionError(str(e)) from e
+    
+    async def aclose(self) -> None:
+        """Close the connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _after_fork_in_child(self) -> None:
+        self._client = None
+
+
+class HTTP2Transport:
+    """
+    HTTP/2 through httpx, multiplexing concurrent requests over few connections.
+    
+    Every request in flight is a stream of a shared connection, so the number
+    of sockets stays at `max_connections` (normally one) however many
+    requests are in flight. httpx's HTTP/2 connections must not be driven
+    from several threads at once, so requests are handed to an event loop
+    running in a background thread, which multiplexes them. Requires httpx
+    with HTTP/2 support (`pip install 'tavoai-sdk[http2]'`); plain `http://`
+    servers must accept HTTP/2 with prior knowledge.
+    """
+    
+    def __init__(self, base_url: str, max_connections: int = 1):
+        """
+        Initialize the transport.
+        
+        Args:
+            base_url: Base URL of the policy server.
+            max_connections: Maximum number of connections.
+        """
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.transport = AsyncHTTPTransport(base_url, http2=True, max_connections=max_connections)
+        self._loop: Optional[Any] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def loop(self) -> Any:
+        """Event loop of the current process sending the requests, started on first use."""
+        if self._loop is None:
+            import asyncio
+            
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(target=loop.run_forever, name="tavoai-http2", daemon=True)
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+    
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TransportResponse:
+        """Send a request as a stream of the shared connection."""
+        import asyncio
+        import concurrent.futures
+        
+        future = asyncio.run_coroutine_threadsafe(self.transport.request(method, path, body, timeout), self.loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError as e:
+            future.cancel()
+            raise TimeoutError(f"Request to {path} took longer than {timeout}s") from e
+    
+    def close(self) -> None:
+        """Close the connections and stop the event loop."""
+        import asyncio
+        
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.transport.aclose(), loop).result(timeout=5)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            if not loop.is_running():
+                loop.close()
+    
+    def _after_fork_in_child(self) -> None:
+        # The loop thread does not survive the fork; the child starts its own
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self.transport._after_fork_in_child()
+
+
+class ThreadedAsyncTransport:
+    """
+    Adapts a synchronous transport to asyncio by running requests in worker threads.
+    
+    Backs the "http1" and "requests" transports of AsyncTavoAIClient: urllib3
+    in worker threads costs less CPU per request than httpx's asyncio
+    HTTP/1.1, and `max_workers` bounds the requests in flight like a
+    connection pool would. Also wraps InMemoryTransport in tests.
+    """
+    
+    def __init__(self, transport: Transport, max_workers: int = 32):
+        """
+        Initialize the transport.
+        
+        Args:
+            transport: Synchronous transport sending the requests.
+            max_workers: Number of worker threads, normally the size of the
+              wrapped transport's connection pool.
+        """
+        self.transport = transport
+        self.max_workers = max_workers
+        self._executor: Optional[Any] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def executor(self) -> Any:
+        """Worker threads of the current process, created on first use."""
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="tavoai-transport"
+                    )
+        return self._executor
+    
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """Send a request from a worker thread."""
+        import asyncio
+        import functools
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            functools.partial(self.transport.request, method, path, body, timeout)
+        )
+    
+    async def aclose(self) -> None:
+        """Stop the worker threads and close the wrapped transport."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.transport.close()
+    
+    def _after_fork_in_child(self) -> None:
+        self._executor = None
+        self._lock = threading.Lock()
+        reset = getattr(self.transport, "_after_fork_in_child", None)
+        if reset is not None:
+            reset()
+
+
+def create_transport(transport: Union[str, Transport], base_url: str, pool_maxsize: int = 32) -> Transport:
+    """
+    Return the transport selected by a client's configuration.
+    
+    Args:
+        transport: "requests", "http1", "http2" or "framed", or a transport instance,
+          returned as-is. With a unix:// base URL, "requests" and "http1" send HTTP/1.1
+          over the Unix domain socket, and "framed" uses the binary FramedTransport.
+        base_url: Base URL of the policy server.
+        pool_maxsize: Maximum number of connections of the HTTP/1.1 and framed transports.
+    
+    Returns:
+        The transport.
+    """
+    if not isinstance(transport, str):
+        return transport
+    socket_path = unix_socket_path(base_url)
+    if socket_path is not None:
+        if transport in (REQUESTS, HTTP1):
+            return UnixHTTPTransport(socket_path, pool_maxsize)
+        if transport == FRAMED:
+            from tavoai.sdk.framing import FramedTransport
+            return FramedTransport(socket_path, pool_maxsize)
+        raise ValueError(f"The {transport} transport does not support Unix domain sockets")
+    if transport == FRAMED:
+        raise ValueError(f"The framed transport requires a {UNIX_SCHEME} base URL")
+    if transport == REQUESTS:
+        return RequestsTransport(base_url, pool_maxsize)
+    if transport == HTTP1:
+        return PooledHTTPTransport(base_url, pool_maxsize)
+    if transport == HTTP2:
+        return HTTP2Transport(base_url)
+    raise ValueError(f"Unknown transport: {transport}")
+
+
+def create_async_transport(
+    transport: Union[str, AsyncTransport],
+    base_url: str,
+    pool_maxsize: int = 32
+) -> AsyncTransport:
+    """
+    Return the asynchronous transport selected by a client's configuration.
+    
+    Args:
+        transport: "requests", "http1", "http2" or "framed", or a transport instance,
+          returned as-is. "http2" multiplexes requests with httpx; the others run the
+          synchronous transport in `pool_maxsize` worker threads.
+        base_url: Base URL of the policy server.
+        pool_maxsize: Maximum number of connections of the HTTP/1.1 transports.
+    
+    Returns:
+        The transport.
+    """
+    if not isinstance(transport, str):
+        return transport
+    if transport == HTTP2 and unix_socket_path(base_url) is None:
+        return AsyncHTTPTransport(base_url, http2=True)
+    return ThreadedAsyncTransport(create_transport(transport, base_url, pool_maxsize), pool_maxsize)
@@ -2,14 +2,24 @@
 
 import logging
 import sys
-from typing import Optional
+from typing import Any, Optional
 
-# Optional colorlog import - will use it if available, otherwise falls back to standard logging
-try:
-    import colorlog
-    HAS_COLORLOG = True
-except ImportError:
-    HAS_COLORLOG = False
+
+def _import_colorlog() -> Optional[Any]:
+    """
+    Import colorlog if it is installed.
+    
+    The import is deferred until a logger is configured, so colorlog stays an
+    optional dependency that costs nothing at import time.
+    
+    Returns:
+        The colorlog module, or None if it is not installed.
+    """
+    try:
+        import colorlog
+        return colorlog
+    except ImportError:
+        return None
 
 
 def configure_logger(name: str, level: int = logging.INFO) -> logging.Logger:
@@ -29,8 +39,9 @@ def configure_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     # Create a handler if there are none
     if not logger.handlers:
         handler = logging.StreamHandler(stream=sys.stdout)
+        colorlog = _import_colorlog()
         
-        if HAS_COLORLOG:
+        if colorlog is not None:
             # Color configuration
             colors = {
                 'DEBUG': 'cyan',
@@ -0,0 +1,149 @@
+"""Unit tests for columnar result analytics."""
+
+import csv
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tavoai.sdk import PolicyResult
+from tavoai.sdk import analytics
+from tavoai.sdk.analytics import ResultFrame
+
+PII = {"category": "pii", "reason": "Contains PII"}
+ADVICE = {"category": "advice", "reason": "Investment advice"}
+
+
+def sample_frame():
+    """Build a frame with two policies evaluated over three hours."""
+    frame = ResultFrame()
+    hour = 3600.0
+    verdicts = [
+        # (request, timestamp, v1 result, v2 result)
+        ("req-1", 0.5 * hour, PolicyResult(True), PolicyResult(True)),
+        ("req-2", 0.6 * hour, PolicyResult(False, [PII]), PolicyResult(False, [PII, ADVICE])),
+        ("req-3", 1.5 * hour, PolicyResult(False, [PII, ADVICE]), PolicyResult(True)),
+        ("req-4", 2.5 * hour, PolicyResult(True), PolicyResult(False, [ADVICE])),
+    ]
+    for request_id, timestamp, v1, v2 in verdicts:
+        frame.append_result("v1", v1, request_id, timestamp)
+        frame.append_result("v2", v2, request_id, timestamp)
+    frame.append_result("v1", PolicyResult(True, degraded=True, degraded_mode="fail_open"), "req-5", 2.6 * hour)
+    return frame
+
+
+def has_pyarrow():
+    """Return whether pyarrow is installed."""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class TestResultFrame(unittest.TestCase):
+    """Tests for ResultFrame aggregations and exports."""
+    
+    def check_aggregations(self):
+        frame = sample_frame()
+        self.assertEqual(len(frame), 9)
+        
+        counts = frame.counts_by_policy()
+        self.assertEqual(counts["v1"], {"evaluations": 5, "rejected": 2, "degraded": 1, "rejection_rate": 0.4})
+        self.assertEqual(counts["v2"]["rejected"], 2)
+        
+        self.assertEqual(frame.category_counts(), {"pii": 3, "advice": 3})
+        self.assertEqual(frame.category_counts(by_policy=True), {
+            ("v1", "pii"): 2, ("v1", "advice"): 1, ("v2", "pii"): 1, ("v2", "advice"): 2,
+        })
+        
+        self.assertEqual(frame.rejection_timeline(3600, policy="v1"), [
+            (0.0, 2, 1, 0.5), (3600.0, 1, 1, 1.0), (7200.0, 2, 0, 0.0),
+        ])
+        self.assertEqual([bucket[1] for bucket in frame.rejection_timeline(3600)], [4, 2, 3])
+        self.assertEqual(frame.rejection_timeline(3600, policy="unknown"), [])
+        
+        diff = frame.diff("v1", "v2")
+        self.assertEqual(diff["compared"], 4)
+        self.assertEqual(diff["agreement_rate"], 0.5)
+        self.assertEqual(diff["only_a_rejected"], ["req-3"])
+        self.assertEqual(diff["only_b_rejected"], ["req-4"])
+    
+    def test_aggregations(self):
+        """Group-by counts, timelines and diffs, with NumPy if installed."""
+        self.check_aggregations()
+    
+    def test_aggregations_without_numpy(self):
+        """The pure Python fallback computes the same aggregations."""
+        with patch.object(analytics, "HAS_NUMPY", False):
+            self.check_aggregations()
+    
+    def check_diff_uses_last_verdicts(self):
+        frame = ResultFrame()
+        frame.append("a", False, request_id="req-1")
+        frame.append("b", True, request_id="req-1")
+        frame.append("a", True, request_id="req-1")
+        frame.append("a", False, request_id="req-2")
+        frame.append("b", True)
+        frame.append("b", True, request_id="req-2")
+        frame.append("a", False)
+        diff = frame.diff("a", "b")
+        self.assertEqual((diff["compared"], diff["both_allowed"]), (2, 1))
+        self.assertEqual((diff["only_a_rejected"], diff["only_b_rejected"]), (["req-2"], []))
+        self.assertEqual(frame.diff("a", "unknown")["compared"], 0)
+        # A policy compared with itself agrees on every request
+        self.assertEqual(frame.diff("a", "a")["agreement_rate"], 1.0)
+        self.assertEqual(frame.request_ids, ["req-1", "req-1", "req-1", "req-2", None, "req-2", None])
+    
+    def test_diff_uses_last_verdicts(self):
+        """Repeated requests compare their last verdicts; results without request IDs are ignored."""
+        self.check_diff_uses_last_verdicts()
+        with patch.object(analytics, "HAS_NUMPY", False):
+            self.check_diff_uses_last_verdicts()
+    
+    def test_exports(self):
+        """Results round-trip through audit records and export to CSV and Parquet."""
+        records = [
+            {"timestamp": 1.0, "request_id": "a", "policy": "p", "allowed": False, "rejection_reasons": [PII, ADVICE]},
+            {"timestamp": 2.0, "request_id": "b", "policy": "p", "allowed": None, "error": "timeout"},
+            {"timestamp": 3.0, "request_id": "c", "policy": "p", "allowed": True, "rejection_reasons": []},
+            {"timestamp": 4.0, "policy": "p", "allowed": True, "rejection_reasons": []},
+        ]
+        frame = ResultFrame.from_records(records)
+        self.assertEqual(len(frame), 3)
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.csv")
+            for writers in ({}, {"pyarrow": None}):
+                # Without pyarrow, the columns are written by the csv module
+                with self.subTest(writers=writers), patch.dict(sys.modules, writers):
+                    frame.to_csv(path)
+                    with open(path) as f:
+                        rows = list(csv.DictReader(f))
+                    self.assertEqual(rows[0]["categories"], "pii;advice")
+                    self.assertEqual(rows[1]["allowed"], "1")
+                    self.assertEqual([row["request_id"] for row in rows], ["a", "c", ""])
+                    self.assertEqual([row["policy"] for row in rows], ["p", "p", "p"])
+                    self.assertEqual(float(rows[2]["timestamp"]), 4.0)
+            
+            if has_pyarrow():
+                import pyarrow
+                
+                # 64-bit offsets, shared with the frame rather than truncated
+                categories = frame.to_arrow().column("categories")
+                self.assertEqual(categories.type, pyarrow.large_list(categories.type.value_type))
+                self.assertEqual(categories.chunk(0).offsets.to_pylist(), list(frame.reason_offsets))
+                
+                import pyarrow.parquet
+                
+                path = os.path.join(directory, "results.parquet")
+                frame.to_parquet(path)
+                table = pyarrow.parquet.read_table(path)
+                self.assertEqual(table.column("categories").to_pylist(), [["pii", "advice"], [], []])
+                self.assertEqual(table.column("policy").to_pylist(), ["p", "p", "p"])
+                self.assertEqual(table.column("request_id").to_pylist(), ["a", "c", None])
+
+
+if __name__ == '__main__':
+    unittest.main()
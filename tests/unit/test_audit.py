@@ -0,0 +1,182 @@
+"""Unit tests for the audit sink."""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from tavoai.sdk import TavoAIClient
+from tavoai.sdk.audit import AuditSink, JsonlAuditWriter, SqliteAuditWriter
+from tavoai.sdk.exceptions import PolicyNotFoundError
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+
+
+class BlockingWriter:
+    """Writer holding every write until released."""
+    
+    def __init__(self):
+        self.release = threading.Event()
+        self.records = []
+    
+    def write(self, records):
+        self.release.wait()
+        self.records.extend(records)
+    
+    def close(self):
+        pass
+
+
+class TestAuditSink(unittest.TestCase):
+    """Tests for AuditSink and its writers."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+    
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+    
+    def test_client_records_every_evaluation(self):
+        """Allowed, rejected and failed evaluations are written to a JSONL file."""
+        sink = AuditSink(JsonlAuditWriter(self._path("audit.jsonl")))
+        policies = {"allow": StubPolicy(True), "deny": StubPolicy(False, [{"category": "pii", "reason": "PII"}])}
+        with StubPolicyServer(policies) as server:
+            client = TavoAIClient(api_base_url=server.url, log_level=logging.CRITICAL, audit_sink=sink)
+            client.evaluate_input("hello", "allow", request_id="req-1")
+            client.evaluate_output("hello", "deny", request_id="req-2")
+            with self.assertRaises(PolicyNotFoundError):
+                client.evaluate_input("hello", "missing", request_id="req-3")
+            
+            # A raising rejection handler does not turn the verdict into a failed evaluation
+            def reject(result):
+                raise ValueError("rejected")
+            with self.assertRaises(ValueError):
+                client.evaluate_input("hello", "deny", request_id="req-4", on_rejection=reject)
+            self.assertEqual(client.stats()["errors"], 1)
+            client.close()
+        sink.close()
+        
+        with open(self._path("audit.jsonl")) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record["request_id"] for record in records], ["req-1", "req-2", "req-3", "req-4"])
+        self.assertTrue(records[0]["allowed"])
+        self.assertEqual(records[1]["content_type"], "output")
+        self.assertEqual(records[1]["rejection_reasons"], [{"category": "pii", "reason": "PII"}])
+        self.assertIsNone(records[2]["allowed"])
+        self.assertIn("not found", records[2]["error"])
+        self.assertFalse(records[3]["allowed"])
+        self.assertEqual(sink.stats()["written"], 4)
+    
+    def test_jsonl_rotation(self):
+        """Full files are rotated and old ones beyond backup_count are removed."""
+        sink = AuditSink(JsonlAuditWriter(self._path("audit.jsonl"), max_bytes=200, backup_count=2), batch_size=2)
+        for i in range(20):
+            sink.record({"request_id": f"req-{i}", "policy": "policy", "allowed": True})
+        sink.close()
+        
+        files = set(os.listdir(self.directory.name))
+        self.assertEqual(files - {"audit.jsonl"}, {"audit.jsonl.1", "audit.jsonl.2"})
+        with open(self._path("audit.jsonl.1")) as f:
+            self.assertLess(len(f.read()), 400)
+    
+    def test_sqlite_writer(self):
+        """Records are inserted in batches into the audit table."""
+        sink = AuditSink(SqliteAuditWriter(self._path("audit.db")), batch_size=10)
+        for i in range(25):
+            sink.record({"request_id": f"req-{i}", "policy": "policy", "allowed": i % 2 == 0, "rejection_reasons": []})
+        self.assertTrue(sink.flush(timeout=5))
+        sink.close()
+        
+        with sqlite3.connect(self._path("audit.db")) as connection:
+            rows = connection.execute("SELECT request_id, allowed, rejection_reasons FROM audit").fetchall()
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[1], ("req-1", 0, "[]"))
+        self.assertGreaterEqual(sink.stats()["batches"], 3)
+    
+    def test_overflow_policies(self):
+        """A full queue drops the newest or the oldest record, or blocks the caller."""
+        for overflow, expected in (("drop_newest", ["a", "b"]), ("drop_oldest", ["b", "c"])):
+            writer = BlockingWriter()
+            sink = AuditSink(writer, max_queue_size=2, batch_size=1, flush_interval=60, overflow=overflow)
+            # Keep the writer thread busy with a first record
+            sink.record({"request_id": "first"})
+            sink._wakeup.set()
+            while sink.stats()["queued"]:
+                pass
+            for request_id in ("a", "b", "c"):
+                sink.record({"request_id": request_id})
+            self.assertEqual(sink.stats()["dropped"], 1)
+            writer.release.set()
+            sink.close()
+            self.assertEqual([record["request_id"] for record in writer.records], ["first"] + expected)
+        
+        writer = BlockingWriter()
+        sink = AuditSink(writer, max_queue_size=1, batch_size=1, flush_interval=60, overflow="block", block_timeout=0.05)
+        sink.record({"request_id": "a"})
+        sink._wakeup.set()
+        while sink.stats()["queued"]:
+            pass
+        sink.record({"request_id": "b"})
+        self.assertFalse(sink.record({"request_id": "c"}))
+        threading.Timer(0.05, writer.release.set).start()
+        sink.block_timeout = 5
+        self.assertTrue(sink.record({"request_id": "d"}))
+        sink.close()
+        self.assertEqual([record["request_id"] for record in writer.records], ["a", "b", "d"])
+    
+    def test_concurrent_records_respect_the_bound(self):
+        """Callers racing on a full queue never push it past max_queue_size."""
+        writer = BlockingWriter()
+        sink = AuditSink(writer, max_queue_size=10, batch_size=1, flush_interval=60)
+        sink.record({"request_id": "first"})
+        sink._wakeup.set()
+        while sink.stats()["queued"]:
+            pass
+        
+        def record_many():
+            for i in range(200):
+                sink.record({"request_id": str(i)})
+        
+        threads = [threading.Thread(target=record_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = sink.stats()
+        self.assertEqual((stats["queued"], stats["submitted"], stats["dropped"]), (10, 11, 1590))
+        writer.release.set()
+        sink.close()
+        self.assertEqual(len(writer.records), 11)
+    
+    def test_close_waits_for_the_last_write(self):
+        """A writer still busy when close() gives up is closed by its thread after the write."""
+        events = []
+        
+        class SlowWriter(BlockingWriter):
+            def write(self, records):
+                events.append("write")
+                super().write(records)
+                events.append("written")
+            
+            def close(self):
+                events.append("close")
+        
+        writer = SlowWriter()
+        sink = AuditSink(writer, flush_interval=60)
+        sink.record({"request_id": "a"})
+        sink.close(timeout=0.05)
+        self.assertNotIn("close", events)
+        self.assertFalse(sink.record({"request_id": "b"}))
+        
+        writer.release.set()
+        sink._thread.join(5)
+        self.assertEqual(events, ["write", "written", "close"])
+        self.assertEqual(writer.records, [{"request_id": "a"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
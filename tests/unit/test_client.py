@@ -1 +1,484 @@
- 
\ No newline at end of file
+"""Unit tests for the TavoAI client."""
+
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from tavoai.sdk import (
+    TavoAIClient,
+    TavoAIGuardrail,
+    PolicyResult,
+    DegradationMode,
+    DegradationPolicy,
+    PolicyPipeline,
+    PipelineStage,
+)
+from tavoai.sdk.cache import VerdictCache
+from tavoai.sdk.client import STATS_FIELDS
+from tavoai.sdk.exceptions import DeadlineExceededError, PolicyNotFoundError, ServerConnectionError
+from tavoai.sdk.models import ContentType
+from tavoai.sdk.multiprocess import SharedStats, SharedVerdictCache
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+
+
+def _response(payload, status_code=200):
+    """Build a fake requests response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    response.text = str(payload)
+    return response
+
+
+class TestDegradation(unittest.TestCase):
+    """Tests for degraded-mode evaluation."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        post_patcher = patch("requests.Session.post")
+        self.post = post_patcher.start()
+        self.addCleanup(post_patcher.stop)
+    
+    def _client(self, **kwargs):
+        client = TavoAIClient(health_probe_interval=60, **kwargs)
+        self.addCleanup(client.close)
+        return client
+    
+    def test_connection_error_raises_without_degradation(self):
+        """Without a degradation policy, connection errors propagate."""
+        self.post.side_effect = requests.exceptions.ConnectionError()
+        client = self._client()
+        
+        with self.assertRaises(ServerConnectionError):
+            client.evaluate_input("hello", "policy")
+        self.assertTrue(client.health.healthy)
+    
+    def test_fail_open_and_fail_closed(self):
+        """Fail-open and fail-closed produce tagged verdicts."""
+        self.post.side_effect = requests.exceptions.ConnectionError()
+        client = self._client(degradation={
+            "open": DegradationPolicy(DegradationMode.FAIL_OPEN),
+            "closed": DegradationPolicy(DegradationMode.FAIL_CLOSED),
+        })
+        
+        result = client.evaluate_input("hello", "open")
+        self.assertTrue(result.allowed)
+        self.assertTrue(result.degraded)
+        self.assertEqual(result.degraded_mode, "fail_open")
+        
+        result = client.evaluate_input("hello", "closed")
+        self.assertFalse(result.allowed)
+        self.assertEqual(result.degraded_mode, "fail_closed")
+    
+    def test_unhealthy_server_skips_network(self):
+        """Once the server is marked down, evaluations do not hit the network."""
+        self.post.side_effect = requests.exceptions.ConnectionError()
+        client = self._client(default_degradation=DegradationPolicy(DegradationMode.FAIL_OPEN))
+        
+        client.evaluate_input("hello", "policy")
+        self.assertFalse(client.health.healthy)
+        client.evaluate_input("hello again", "policy")
+        self.assertEqual(self.post.call_count, 1)
+    
+    def test_last_known_and_fallback(self):
+        """Last-known verdicts are reused, misses fall back to the local evaluator."""
+        self.post.return_value = _response({"allow": False, "rejection_reasons": [
+            {"category": "pii", "reason": "Contains PII"}
+        ]})
+        fallback = MagicMock(return_value=PolicyResult(True))
+        client = self._client(default_degradation=DegradationPolicy(
+            DegradationMode.LAST_KNOWN,
+            fallback=fallback,
+            on_miss=DegradationMode.FALLBACK
+        ))
+        
+        self.assertFalse(client.evaluate_input("my ssn", "policy").degraded)
+        self.post.side_effect = requests.exceptions.ConnectionError()
+        
+        result = client.evaluate_input("my ssn", "policy")
+        self.assertFalse(result.allowed)
+        self.assertEqual(result.degraded_mode, "last_known")
+        self.assertEqual(result.rejection_reasons[0]["category"], "pii")
+        
+        result = client.evaluate_input("something new", "policy")
+        self.assertTrue(result.allowed)
+        self.assertEqual(result.degraded_mode, "fallback")
+        fallback.assert_called_once()
+    
+    def test_health_probe_restores_normal_mode(self):
+        """A successful probe takes the client out of degraded mode."""
+        client = self._client(default_degradation=DegradationPolicy(DegradationMode.FAIL_OPEN))
+        client.health.probe_interval = 0.01
+        client.health.probe = lambda: True
+        
+        client.health.mark_unhealthy()
+        deadline = time.monotonic() + 1
+        while not client.health.healthy and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(client.health.healthy)
+
+
+class TestMicroBatching(unittest.TestCase):
+    """Tests for micro-batched evaluation."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        post_patcher = patch("requests.Session.post", side_effect=self._post)
+        self.post = post_patcher.start()
+        self.addCleanup(post_patcher.stop)
+        self.batch_sizes = []
+        self.client = TavoAIClient(micro_batching=True, batch_max_size=8)
+        self.addCleanup(self.client.close)
+    
+    def _post(self, url, json, timeout):
+        self.assertTrue(url.endswith("/batch/evaluate"))
+        time.sleep(0.01)
+        evaluations = json["evaluations"]
+        self.batch_sizes.append(len(evaluations))
+        results = []
+        for evaluation in evaluations:
+            if evaluation["policy"] == "missing":
+                results.append({"status": 404, "error": "not found"})
+            else:
+                content = evaluation["input"]["content"]
+                results.append({"status": 200, "result": {"allow": content.startswith("ok")}})
+        return _response({"results": results})
+    
+    def test_results_are_routed_to_callers(self):
+        """Each concurrent caller receives its own verdict."""
+        results = {}
+        
+        def call(i):
+            content = f"ok-{i}" if i % 2 else f"bad-{i}"
+            results[i] = self.client.evaluate_input(content, "policy").allowed
+        
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(32)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(results, {i: bool(i % 2) for i in range(32)})
+        self.assertEqual(sum(self.batch_sizes), 32)
+        self.assertLess(len(self.batch_sizes), 32)
+    
+    def test_per_evaluation_errors(self):
+        """Errors for one evaluation in a batch are raised to its caller only."""
+        with self.assertRaises(PolicyNotFoundError):
+            self.client.evaluate_input("ok", "missing")
+        self.assertTrue(self.client.evaluate_input("ok", "policy").allowed)
+    
+    def test_expired_in_queue(self):
+        """Evaluations that expire before their batch is sent are deadline failures, not server failures."""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        
+        def stalled_post(url, json, timeout):
+            release.wait(5)
+            return self._post(url, json, timeout)
+        
+        self.post.side_effect = stalled_post
+        self.client.batcher.dispatchers = 1
+        first = threading.Thread(target=self.client.evaluate_input, args=("ok", "policy"))
+        first.start()
+        self.addCleanup(first.join)
+        deadline = time.monotonic() + 5
+        while not self.post.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        with self.assertRaises(DeadlineExceededError):
+            self.client.evaluate_input("ok", "policy", timeout=0.05)
+        self.client.deadline_degradation = DegradationPolicy(DegradationMode.FAIL_OPEN)
+        result = self.client.evaluate_input("bad", "policy", timeout=0.05)
+        self.assertEqual((result.allowed, result.degraded_mode), (True, "fail_open"))
+        
+        self.assertTrue(self.client.health.healthy)
+        self.assertEqual(self.client.batcher.stats()["evaluations_expired"], 2)
+        release.set()
+        first.join()
+        self.assertEqual(self.batch_sizes, [1])
+    
+    def test_server_without_batch_endpoint(self):
+        """A 404 from the batch endpoint falls back to one request per evaluation."""
+        def post(url, json, timeout):
+            if url.endswith("/batch/evaluate"):
+                return _response({"error": "Unknown path"}, 404)
+            self.assertIn("/policies/", url)
+            if "/missing/" in url:
+                return _response({"error": "not found"}, 404)
+            return _response({"allow": json["input"]["content"].startswith("ok")})
+        
+        self.post.side_effect = post
+        with self.assertRaises(PolicyNotFoundError):
+            self.client.evaluate_input("ok", "missing")
+        self.assertFalse(self.client.batch_endpoint)
+        self.assertTrue(self.client.evaluate_input("ok", "policy").allowed)
+        self.assertFalse(self.client.evaluate_input("bad", "policy").allowed)
+        urls = [call.args[0] for call in self.post.call_args_list]
+        self.assertEqual(sum(url.endswith("/batch/evaluate") for url in urls), 1)
+        self.assertEqual(self.client.batcher.stats()["batches_sent"], 1)
+
+
+class TestResultCache(unittest.TestCase):
+    """Tests for result caching."""
+    
+    def test_repeated_evaluations_are_served_from_cache(self):
+        """Identical evaluations reach the server once, whatever their request ID."""
+        with StubPolicyServer(default=StubPolicy(True)) as server:
+            client = TavoAIClient(
+                api_base_url=server.url,
+                log_level=logging.WARNING,
+                result_cache=VerdictCache(ttl=60)
+            )
+            self.addCleanup(client.close)
+            
+            client.evaluate_input("hello", "policy", request_id="a")
+            client.evaluate_input("hello", "policy", request_id="b")
+            client.evaluate_input("hello", "other")
+            
+            self.assertEqual(server.evaluation_count, 2)
+            self.assertEqual(client.stats()["cache_hits"], 1)
+    
+    def test_shared_verdict_cache(self):
+        """The shared cache round-trips verdicts and rejection reasons."""
+        cache = SharedVerdictCache(capacity=8)
+        reasons = [{"category": "pii", "reason": "Contains PII"}]
+        cache.put("key", PolicyResult(False, reasons))
+        
+        result = cache.get("key")
+        self.assertFalse(result.allowed)
+        self.assertEqual(result.rejection_reasons, reasons)
+        self.assertIsNone(cache.get("other"))
+        
+        for i in range(20):
+            cache.put(f"key-{i}", PolicyResult(True))
+        self.assertEqual(len(cache), 8)
+
+
+def _banned_words(input_data):
+    """Turn-decomposable stub policy rejecting content containing 'bad'."""
+    if "bad" in input_data["content"]:
+        return {"allow": False, "rejection_reasons": [{"category": "banned", "reason": "Contains 'bad'"}]}
+    return {"allow": True, "rejection_reasons": []}
+
+
+class TestConversationSession(unittest.TestCase):
+    """Tests for incremental conversation evaluation."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.server = StubPolicyServer(default=StubPolicy(_banned_words)).start()
+        self.addCleanup(self.server.stop)
+        self.client = TavoAIClient(api_base_url=self.server.url, log_level=logging.WARNING)
+        self.addCleanup(self.client.close)
+    
+    def test_incremental_policy_matches_full_evaluation(self):
+        """Only new turns are sent, and the verdict equals the full-transcript verdict."""
+        session = self.client.session("conv-1", incremental_policies=["banned"])
+        turns = ["hello", "a bad idea", "fine", "another bad one"]
+        
+        for i, turn in enumerate(turns):
+            result = session.evaluate_input(turn, "banned")
+            full = self.client.evaluate_input("\n".join(turns[:i + 1]), "banned")
+            self.assertEqual(result.allowed, full.allowed)
+            self.assertEqual(result.rejection_reasons, full.rejection_reasons)
+        
+        # One evaluation per turn for the session, plus the full evaluations
+        self.assertEqual(self.server.evaluation_count, 2 * len(turns))
+    
+    def test_transcript_reuses_known_turns(self):
+        """Resending the growing transcript only evaluates the new turns."""
+        session = self.client.session("conv-2", incremental_policies=["banned"])
+        session.evaluate_transcript(["hi", "there"], "banned")
+        result = session.evaluate_transcript(["hi", "there", "bad"], "banned")
+        
+        self.assertFalse(result.allowed)
+        self.assertEqual(self.server.evaluation_count, 3)
+        with self.assertRaises(ValueError):
+            session.evaluate_transcript(["something", "else"], "banned")
+    
+    def test_non_incremental_policy_sends_full_transcript(self):
+        """Policies not declared incremental see the whole conversation."""
+        seen = []
+        self.server.default = StubPolicy(lambda input_data: seen.append(input_data["content"]) or {"allow": True})
+        session = self.client.session("conv-3")
+        session.evaluate_input("one", "context")
+        session.evaluate_output("two", "context")
+        
+        self.assertEqual(seen, ["one", "one\ntwo"])
+    
+    def test_turns_keep_their_content_type(self):
+        """Each turn of an incremental policy is evaluated with its own content type."""
+        seen = []
+        
+        def record(input_data):
+            seen.append((input_data["content"], input_data["content_type"]))
+            return {"allow": True}
+        
+        self.server.default = StubPolicy(record)
+        session = self.client.session("conv-4", incremental_policies=["banned", "toxicity"])
+        session.add_turn("system prompt", ContentType.OUTPUT)
+        session.evaluate_input("question", "banned")
+        # An output call evaluating earlier turns for the first time keeps their types
+        session.evaluate_output("answer", "toxicity")
+        
+        self.assertEqual(seen, [
+            ("system prompt", "output"),
+            ("question", "input"),
+            ("system prompt", "output"),
+            ("question", "input"),
+            ("answer", "output"),
+        ])
+        self.assertEqual(session.turn_types, [ContentType.OUTPUT, ContentType.INPUT, ContentType.OUTPUT])
+
+
+class TestShadowEvaluation(unittest.TestCase):
+    """Tests for shadow policies."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.server = StubPolicyServer({
+            "current": StubPolicy(True),
+            "candidate": StubPolicy(False, [{"category": "strict", "reason": "Stricter policy"}]),
+            "slow_candidate": StubPolicy(True, latency=0.05),
+        }).start()
+        self.addCleanup(self.server.stop)
+    
+    def test_guardrail_shadow_never_changes_verdict(self):
+        """Shadow disagreements are recorded while the primary verdict is returned."""
+        client = TavoAIClient(api_base_url=self.server.url, log_level=logging.WARNING)
+        self.addCleanup(client.close)
+        guardrail = TavoAIGuardrail(client=client)
+        
+        @guardrail("current", shadow_input_policy="candidate", shadow_output_policy="candidate")
+        def answer(query):
+            return "response"
+        
+        self.assertEqual(answer("question"), "response")
+        self.assertTrue(client.shadow.flush(timeout=5))
+        
+        stats = client.stats()["shadow"]
+        self.assertEqual(stats["disagreed"], 2)
+        self.assertEqual(stats["disagreement_rate"], 1.0)
+        self.assertEqual(client.shadow.disagreements[0].shadow_policy, "candidate")
+        
+        # The shadow belongs to the decorated function, not to every evaluation of the client
+        self.assertEqual(client.shadow_policies, {})
+        client.evaluate_input("question", "current")
+        self.assertTrue(client.shadow.flush(timeout=5))
+        self.assertEqual(client.stats()["shadow"]["evaluated"], 2)
+    
+    def test_guardrail_shadow_requires_policy_name(self):
+        """Shadowing a pipeline is rejected rather than silently ignored."""
+        client = TavoAIClient(api_base_url=self.server.url, log_level=logging.WARNING)
+        self.addCleanup(client.close)
+        guardrail = TavoAIGuardrail(client=client)
+        pipeline = PolicyPipeline([PipelineStage("current", policy_name="current")])
+        
+        with self.assertRaises(ValueError):
+            guardrail(pipeline, shadow_input_policy="candidate")
+        with self.assertRaises(ValueError):
+            guardrail("current", pipeline, shadow_output_policy="candidate")
+        self.assertIsNotNone(guardrail("current", pipeline, shadow_input_policy="candidate"))
+    
+    def test_queue_overflow_drops_shadow_work(self):
+        """A full shadow queue drops work instead of blocking evaluations."""
+        client = TavoAIClient(api_base_url=self.server.url, log_level=logging.WARNING, shadow_queue_size=1)
+        self.addCleanup(client.close)
+        client.add_shadow_policy("current", "slow_candidate")
+        
+        started = time.monotonic()
+        for i in range(10):
+            self.assertTrue(client.evaluate_input(f"question {i}", "current").allowed)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertGreater(client.stats()["shadow"]["dropped"], 0)
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "Requires os.fork")
+class TestForkSafety(unittest.TestCase):
+    """Tests for clients shared with forked worker processes."""
+    
+    def test_child_rebuilds_pool_and_shares_state(self):
+        """Children get their own pool and share the stats and cache areas."""
+        shared_stats = SharedStats(STATS_FIELDS)
+        shared_cache = SharedVerdictCache(capacity=64)
+        
+        with StubPolicyServer(default=StubPolicy(True)) as server:
+            client = TavoAIClient(
+                api_base_url=server.url,
+                log_level=logging.WARNING,
+                result_cache=shared_cache,
+                shared_stats=shared_stats
+            )
+            self.addCleanup(client.close)
+            client.evaluate_input("warm-up", "policy")
+            parent_session = client.http_session
+            
+            children = []
+            for i in range(2):
+                pid = os.fork()
+                if pid == 0:
+                    ok = client.transport._session is None
+                    ok = ok and client.evaluate_input("warm-up", "policy").allowed
+                    ok = ok and client.evaluate_input(f"child-{i}", "policy").allowed
+                    ok = ok and client.http_session is not parent_session
+                    os._exit(0 if ok else 1)
+                children.append(pid)
+            
+            for pid in children:
+                _, status = os.waitpid(pid, 0)
+                self.assertEqual(os.WEXITSTATUS(status), 0)
+            
+            totals = shared_stats.snapshot()
+            self.assertEqual(totals["evaluations"], 5)
+            self.assertEqual(totals["cache_hits"], 2)
+            self.assertEqual(server.evaluation_count, 3)
+            self.assertEqual(len(shared_stats.per_worker()), 3)
+    
+    def test_recycled_workers_keep_their_counts(self):
+        """Counters of exited workers survive when new workers reuse their slots."""
+        shared_stats = SharedStats(["evaluations"], max_workers=2)
+        for _ in range(3):
+            pid = os.fork()
+            if pid == 0:
+                for _ in range(100):
+                    shared_stats.increment("evaluations")
+                os._exit(0)
+            os.waitpid(pid, 0)
+        
+        self.assertEqual(shared_stats.snapshot(), {"evaluations": 300})
+        self.assertEqual(len(shared_stats.per_worker()), 2)
+
+
+class TestLazyImports(unittest.TestCase):
+    """Tests that importing the SDK leaves heavy dependencies unloaded."""
+    
+    HEAVY_MODULES = ("requests", "httpx", "colorlog", "numpy")
+    
+    def loaded_modules(self, statement):
+        """Run a statement in a fresh interpreter; return the heavy modules it loaded."""
+        check = f"import sys; {statement}; print(','.join(m for m in {self.HEAVY_MODULES!r} if m in sys.modules))"
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+        output = subprocess.run([sys.executable, "-c", check], env=env, capture_output=True, text=True, check=True)
+        return [module for module in output.stdout.strip().split(",") if module]
+    
+    def test_imports_do_not_load_dependencies(self):
+        """Dependencies are loaded by the features using them, not by imports."""
+        for statement in (
+            "import tavoai.sdk",
+            "from tavoai.sdk import TavoAIClient",
+            "from tavoai.sdk import TavoAIClient; TavoAIClient()",
+        ):
+            with self.subTest(statement=statement):
+                self.assertEqual(self.loaded_modules(statement), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
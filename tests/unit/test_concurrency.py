@@ -0,0 +1,146 @@
+"""Unit tests for adaptive concurrency."""
+
+import logging
+import threading
+import time
+import unittest
+
+from tavoai.sdk import TavoAIClient
+from tavoai.sdk.concurrency import AdaptiveLimiter
+from tavoai.sdk.degradation import DegradationMode, DegradationPolicy
+from tavoai.sdk.exceptions import ConcurrencyLimitError, PolicyNotFoundError
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+
+
+class TestAdaptiveLimiter(unittest.TestCase):
+    """Tests for AdaptiveLimiter."""
+    
+    def saturate(self, limiter, completions, latency, failed=False):
+        """Complete requests one at a time, refilling every free slot after each."""
+        held = 0
+        for _ in range(completions + 1):
+            while held < int(limiter.limit) and limiter.acquire(timeout=0):
+                held += 1
+            if held == 0:
+                break
+            limiter.release(latency, failed)
+            held -= 1
+        for _ in range(held):
+            limiter.release()
+    
+    def test_grows_while_latency_is_stable(self):
+        """The limit grows about one per round trip up to max_limit."""
+        limiter = AdaptiveLimiter(initial_limit=4, max_limit=10)
+        self.saturate(limiter, 4 + 5 + 6, 0.01)
+        self.assertIn(limiter.stats()["limit"], (6, 7))
+        self.saturate(limiter, 100, 0.01)
+        self.assertEqual(limiter.stats()["limit"], 10)
+        limits = [limit for _, limit in limiter.stats()["history"]]
+        self.assertEqual(limits, sorted(limits))
+        self.assertEqual((limits[0], limits[-1]), (4, 10))
+    
+    def test_backs_off_on_queueing_and_errors(self):
+        """Latency above the tolerance or failures shrink the limit, once per round trip."""
+        limiter = AdaptiveLimiter(initial_limit=20, backoff=0.5)
+        self.saturate(limiter, 1, 0.01)
+        self.saturate(limiter, 5, 0.05)
+        self.assertEqual(limiter.stats()["limit"], 10)
+        
+        time.sleep(0.05)
+        self.saturate(limiter, 5, None, failed=True)
+        self.assertEqual(limiter.stats()["limit"], 5)
+        self.assertEqual(limiter.stats()["decreases"], 2)
+    
+    def test_idle_client_does_not_grow(self):
+        """Requests using less than half of the limit do not raise it."""
+        limiter = AdaptiveLimiter(initial_limit=8)
+        for _ in range(100):
+            limiter.acquire()
+            limiter.release(0.01)
+        self.assertEqual(limiter.stats()["limit"], 8)
+    
+    def test_acquire_waits_for_a_slot(self):
+        """Callers beyond the limit wait, and time out if no slot frees up."""
+        limiter = AdaptiveLimiter(initial_limit=1)
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire(timeout=0.01))
+        threading.Timer(0.02, limiter.release).start()
+        self.assertTrue(limiter.acquire(timeout=1))
+        self.assertEqual(limiter.stats()["rejected"], 1)
+
+
+class TestParallelEvaluation(unittest.TestCase):
+    """Tests for the parallel evaluation methods."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.server = StubPolicyServer({
+            "length": StubPolicy(lambda input_data: {"allow": len(input_data["content"]) < 5}),
+            "slow": StubPolicy(True, latency=0.05),
+        }).start()
+        self.addCleanup(self.server.stop)
+    
+    def test_batch_and_fan_out(self):
+        """Results keep their order and errors are raised or returned."""
+        for micro_batching in (False, True):
+            client = TavoAIClient(
+                api_base_url=self.server.url,
+                log_level=logging.CRITICAL,
+                adaptive_concurrency=True,
+                micro_batching=micro_batching
+            )
+            self.addCleanup(client.close)
+            
+            results = client.evaluate_batch(["a", "long text", "b"], "length")
+            self.assertEqual([result.allowed for result in results], [True, False, True])
+            
+            results = client.evaluate_policies("hi", ["length", "slow", "missing"], return_exceptions=True)
+            self.assertTrue(results["length"].allowed)
+            self.assertTrue(results["slow"].allowed)
+            self.assertIsInstance(results["missing"], PolicyNotFoundError)
+            with self.assertRaises(PolicyNotFoundError):
+                client.evaluate_policies("hi", ["length", "missing"])
+            
+            self.assertIn("history", client.stats()["concurrency"])
+    
+    def test_fan_out_runs_in_parallel(self):
+        """Slow evaluations overlap instead of adding up."""
+        client = TavoAIClient(api_base_url=self.server.url, log_level=logging.CRITICAL)
+        self.addCleanup(client.close)
+        started = time.monotonic()
+        client.evaluate_batch([f"text {i}" for i in range(8)], "slow")
+        self.assertLess(time.monotonic() - started, 0.3)
+    
+    def test_saturation_does_not_mark_server_unhealthy(self):
+        """A caller timing out on a full limit degrades alone; later calls reach the server."""
+        client = TavoAIClient(
+            api_base_url=self.server.url,
+            log_level=logging.CRITICAL,
+            adaptive_concurrency=True,
+            max_concurrency=1,
+            default_degradation=DegradationPolicy(DegradationMode.FAIL_CLOSED)
+        )
+        self.addCleanup(client.close)
+        holder = threading.Thread(target=client.evaluate_input, args=("hi", "slow"))
+        holder.start()
+        time.sleep(0.02)
+        saturated = client.evaluate_input("hi", "length", timeout=0.001)
+        self.assertTrue(saturated.degraded)
+        self.assertFalse(saturated.allowed)
+        holder.join()
+        
+        self.assertTrue(client.health.healthy)
+        result = client.evaluate_input("hi", "length")
+        self.assertTrue(result.allowed)
+        self.assertFalse(result.degraded)
+        
+        # Without degradation, the caller sees the saturation
+        client.degradation["length"] = None
+        client.limiter.acquire()
+        self.addCleanup(client.limiter.release)
+        with self.assertRaises(ConcurrencyLimitError):
+            client.evaluate_input("hi", "length", timeout=0.001)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Unit tests for deadline propagation."""
+
+import logging
+import threading
+import time
+import unittest
+
+from tavoai.sdk import (
+    TavoAIClient,
+    TavoAIGuardrail,
+    DegradationMode,
+    DegradationPolicy,
+    Deadline,
+    deadline_scope,
+)
+from tavoai.sdk.batching import MicroBatcher
+from tavoai.sdk.deadline import current_deadline, resolve_deadline
+from tavoai.sdk.exceptions import DeadlineExceededError, PolicyEvaluationError
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+
+
+class TestDeadlines(unittest.TestCase):
+    """Tests for deadlines on evaluations."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.server = StubPolicyServer({
+            "fast": StubPolicy(True),
+            "slow": StubPolicy(True, latency=0.5),
+        }).start()
+        self.addCleanup(self.server.stop)
+    
+    def _client(self, **kwargs):
+        client = TavoAIClient(api_base_url=self.server.url, log_level=logging.CRITICAL, **kwargs)
+        self.addCleanup(client.close)
+        return client
+    
+    def test_scopes_nest_and_only_shorten(self):
+        """Inner scopes and explicit deadlines never extend the enclosing deadline."""
+        self.assertIsNone(current_deadline())
+        with deadline_scope(1.0) as outer:
+            with deadline_scope(10.0) as inner:
+                self.assertIs(inner, outer)
+            with deadline_scope(0.1) as inner:
+                self.assertLess(inner.remaining(), 0.2)
+            self.assertIs(resolve_deadline(5.0), outer)
+            self.assertLess(resolve_deadline(0.01).remaining(), 0.02)
+        self.assertIsNone(current_deadline())
+    
+    def test_expired_budget_skips_the_server(self):
+        """Without time left, no request is sent and the configured verdict is returned."""
+        client = self._client()
+        with self.assertRaises(DeadlineExceededError):
+            client.evaluate_input("hello", "fast", deadline=0)
+        
+        client = self._client(
+            deadline_degradation=DegradationPolicy(DegradationMode.FAIL_OPEN),
+            min_call_budget=0.05
+        )
+        with deadline_scope(0.01):
+            result = client.evaluate_input("hello", "fast")
+        self.assertTrue(result.allowed)
+        self.assertEqual(result.degraded_mode, "fail_open")
+        self.assertEqual(self.server.evaluation_count, 0)
+        self.assertEqual(client.stats()["deadline_exceeded"], 1)
+    
+    def test_remaining_time_bounds_the_request(self):
+        """A slow server is abandoned at the deadline without being marked unhealthy."""
+        client = self._client(
+            default_degradation=DegradationPolicy(DegradationMode.FAIL_OPEN),
+            deadline_degradation=DegradationPolicy(DegradationMode.FAIL_CLOSED)
+        )
+        started = time.monotonic()
+        result = client.evaluate_input("hello", "slow", deadline=Deadline.after(0.1))
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertFalse(result.allowed)
+        self.assertIn("Deadline exceeded", result.rejection_reasons[0]["reason"])
+        self.assertTrue(client.health.healthy)
+    
+    def test_guardrail_budget_covers_the_whole_call(self):
+        """Time spent in the decorated function reduces the budget of the output evaluation."""
+        client = self._client(deadline_degradation=DegradationPolicy(DegradationMode.FAIL_CLOSED))
+        guardrail = TavoAIGuardrail(client=client)
+        
+        @guardrail("fast", deadline=0.1)
+        def answer(query):
+            time.sleep(0.15)
+            return "answer"
+        
+        with self.assertRaises(PolicyEvaluationError):
+            answer("question")
+        self.assertEqual(self.server.evaluation_count, 1)
+    
+    def test_batcher_drops_expired_evaluations(self):
+        """Evaluations whose callers gave up while queued are never sent."""
+        release = threading.Event()
+        sent = []
+        
+        def send_batch(evaluations, timeout):
+            sent.extend(policy_name for policy_name, _ in evaluations)
+            release.wait()
+            return [{"allow": True}] * len(evaluations)
+        
+        batcher = MicroBatcher(send_batch, dispatchers=1)
+        self.addCleanup(batcher.close)
+        first = threading.Thread(target=batcher.submit, args=("first", {}))
+        first.start()
+        while not sent:
+            time.sleep(0.001)
+        with self.assertRaises(DeadlineExceededError):
+            batcher.submit("second", {}, timeout=0.05)
+        release.set()
+        first.join()
+        batcher.submit("third", {}, timeout=1.0)
+        
+        self.assertEqual(sent, ["first", "third"])
+        self.assertEqual(batcher.stats()["evaluations_expired"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""Unit tests for guarded response memoization."""
+
+import logging
+import time
+import unittest
+
+from tavoai.sdk import TavoAIClient, TavoAIGuardrail
+from tavoai.sdk.degradation import DegradationMode, DegradationPolicy
+from tavoai.sdk.exceptions import PolicyEvaluationError
+from tavoai.sdk.memo import ResponseMemo
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+
+
+def deny_secrets(input_data):
+    """Stub verdict rejecting content that mentions a secret."""
+    return {"allow": "secret" not in input_data["content"]}
+
+
+class TestResponseMemo(unittest.TestCase):
+    """Tests for ResponseMemo."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.server = StubPolicyServer({"guard": StubPolicy(deny_secrets)}).start()
+        self.addCleanup(self.server.stop)
+        self.client = TavoAIClient(api_base_url=self.server.url, log_level=logging.WARNING)
+        self.addCleanup(self.client.close)
+        self.calls = []
+    
+    def guard(self, memo, **options):
+        """Return a guarded function recording its calls."""
+        @TavoAIGuardrail(self.client)("guard", memo=memo, **options)
+        def answer(query, style="plain"):
+            self.calls.append(query)
+            return "a secret" if query == "leak" else f"{style} answer to {query}"
+        return answer
+    
+    def test_hit_skips_function_and_evaluations(self):
+        """A repeated call is served from the memo; arguments are part of the key."""
+        memo = ResponseMemo()
+        answer = self.guard(memo)
+        self.assertEqual(answer("hello"), "plain answer to hello")
+        evaluations = self.server.evaluation_count
+        
+        self.assertEqual(answer("hello"), "plain answer to hello")
+        self.assertEqual(self.calls, ["hello"])
+        self.assertEqual(self.server.evaluation_count, evaluations)
+        
+        self.assertEqual(answer("hello", style="short"), "short answer to hello")
+        self.assertEqual(len(self.calls), 2)
+        stats = memo.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 2, 2))
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 3)
+    
+    def test_unserializable_arguments(self):
+        """Arguments without a JSON form skip the memo unless key_func identifies them."""
+        class User:
+            def __init__(self, name):
+                self.name = name
+            
+            def __repr__(self):
+                return "User"
+            
+            def __str__(self):
+                return self.name
+        
+        memo = ResponseMemo()
+        answer = self.guard(memo)
+        self.assertEqual(answer("hi", User("alice")), "alice answer to hi")
+        self.assertEqual(answer("hi", User("bob")), "bob answer to hi")
+        self.assertEqual(memo.stats()["skipped"], 2)
+        
+        memo = ResponseMemo(key_func=lambda args, kwargs: [user.name for user in args])
+        answer = self.guard(memo)
+        for name in ("alice", "bob", "alice"):
+            self.assertEqual(answer("hi", User(name)), f"{name} answer to hi")
+        self.assertEqual((memo.stats()["hits"], memo.stats()["stores"]), (1, 2))
+    
+    def test_bounds(self):
+        """Entries are evicted beyond max_size and expire after the TTL."""
+        memo = ResponseMemo(max_size=2, ttl=0.05)
+        answer = self.guard(memo)
+        for query in ("a", "b", "c"):
+            answer(query)
+        self.assertEqual(memo.stats()["evictions"], 1)
+        
+        time.sleep(0.1)
+        answer("c")
+        self.assertEqual(self.calls, ["a", "b", "c", "c"])
+        self.assertEqual(memo.stats()["expirations"], 1)
+    
+    def test_rejections_and_handler_results(self):
+        """Rejections and handler-modified responses are only memoized when enabled."""
+        memo = ResponseMemo()
+        answer = self.guard(memo, on_output_rejection=lambda query, response, result, context: "[redacted]")
+        self.assertEqual(answer("leak"), "[redacted]")
+        self.assertEqual(answer("leak"), "[redacted]")
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(memo.stats()["skipped"], 2)
+        
+        memo = ResponseMemo(cache_rejections=True)
+        answer = self.guard(memo)
+        for _ in range(2):
+            with self.assertRaises(PolicyEvaluationError):
+                answer("tell me a secret")
+        self.assertEqual(memo.stats()["hits"], 1)
+    
+    def test_degraded_verdicts_are_not_memoized(self):
+        """Responses validated in degraded mode are evaluated again next time."""
+        client = TavoAIClient(
+            api_base_url="http://127.0.0.1:9",
+            log_level=logging.CRITICAL,
+            timeout=0.5,
+            default_degradation=DegradationPolicy(DegradationMode.FAIL_OPEN)
+        )
+        self.addCleanup(client.close)
+        memo = ResponseMemo()
+        
+        @TavoAIGuardrail(client)("guard", memo=memo)
+        def answer(query):
+            return query
+        
+        answer("hello")
+        answer("hello")
+        self.assertEqual(memo.stats()["stores"], 0)
+        self.assertEqual(memo.stats()["skipped"], 2)
+    
+    def test_policy_version_is_part_of_the_key(self):
+        """A new policy version invalidates the memoized responses."""
+        memo = ResponseMemo()
+        answer = self.guard(memo)
+        answer("hello")
+        self.client.policy_versions["guard"] = "2"
+        answer("hello")
+        self.assertEqual(len(self.calls), 2)
@@ -0,0 +1,151 @@
+"""Unit tests for content normalization and near-duplicate verdict reuse."""
+
+import logging
+import unittest
+
+from tavoai.sdk import TavoAIClient
+from tavoai.sdk.cache import VerdictCache
+from tavoai.sdk.models import PolicyResult
+from tavoai.sdk.normalize import COMMON_SLOTS, ContentNormalizer, NearDuplicateIndex, similarity, simhash
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+from tavoai.sdk.transport import InMemoryTransport
+
+REPORT = (
+    "Please summarize the quarterly report for the Acme account, list the three biggest risks "
+    "we identified in yesterday's meeting with the regional sales team, explain how each of them "
+    "affects the revenue forecast for the next two quarters, and suggest one concrete mitigation "
+    "for every risk together with the team that should own it and a realistic deadline for it"
+)
+
+
+class TestContentNormalizer(unittest.TestCase):
+    """Tests for ContentNormalizer."""
+    
+    def test_canonical_forms(self):
+        """Whitespace, Unicode representation and invisible characters are canonicalized."""
+        normalizer = ContentNormalizer()
+        self.assertEqual(normalizer.normalize("  hello \n\t world  "), "hello world")
+        self.assertEqual(normalizer.normalize("ﬁne ｗｏｒｋ"), "fine work")
+        self.assertEqual(normalizer.normalize("pass​word"), "password")
+        self.assertEqual(ContentNormalizer(casefold=True).normalize("Straße"), "strasse")
+        self.assertEqual(ContentNormalizer(unicode_form=None).normalize("ﬁne"), "ﬁne")
+    
+    def test_slot_masking(self):
+        """Template slots are replaced by placeholders and counted."""
+        normalizer = ContentNormalizer(slots=COMMON_SLOTS)
+        masked = normalizer.normalize(
+            "Order 1,234 for bob@example.com, see https://example.com/o?id=7 "
+            "(ref 123e4567-e89b-12d3-a456-426614174000)"
+        )
+        self.assertEqual(masked, "Order <number> for <email>, see <url> (ref <uuid>)")
+        self.assertEqual(
+            normalizer.stats(),
+            {"normalized": 1, "changed": 1, "masked_slots": 4}
+        )
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    """Tests for SimHash fingerprints and NearDuplicateIndex."""
+    
+    def test_simhash_similarity(self):
+        """Small edits keep fingerprints close; unrelated texts are far apart."""
+        edited = REPORT.replace("biggest", "largest")
+        unrelated = "Write a short poem about the sea and the wind blowing over the dunes at night"
+        self.assertEqual(simhash(REPORT), simhash(REPORT.upper()))
+        self.assertGreaterEqual(similarity(simhash(REPORT), simhash(edited)), 0.9)
+        self.assertLess(similarity(simhash(REPORT), simhash(unrelated)), 0.8)
+    
+    def test_lookup_respects_threshold_and_context(self):
+        """Lookups match similar content of the same context only."""
+        index = NearDuplicateIndex(threshold=0.9)
+        verdict = PolicyResult(False, ["risk"])
+        index.add("guard:ctx", REPORT, verdict)
+        
+        match = index.lookup("guard:ctx", REPORT.replace("biggest", "largest"))
+        self.assertIs(match[0], verdict)
+        self.assertGreaterEqual(match[1], 0.9)
+        self.assertIsNone(index.lookup("guard:other", REPORT))
+        self.assertIsNone(index.lookup("guard:ctx", "Write a short poem about the sea"))
+        self.assertIsNone(NearDuplicateIndex(threshold=1.0).lookup("guard:ctx", REPORT))
+        
+        stats = index.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["max_distance"]), (1, 2, 6))
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 3)
+        self.assertEqual(stats["mean_hit_similarity"], match[1])
+        with self.assertRaises(ValueError):
+            NearDuplicateIndex(threshold=0)
+    
+    def test_eviction_and_invalidation(self):
+        """The least recently used content is evicted, and policies can be invalidated."""
+        index = NearDuplicateIndex(max_size=2)
+        for policy in ("a", "b", "c"):
+            index.add(f"{policy}@v1:ctx", REPORT, PolicyResult(True))
+        self.assertIsNone(index.lookup("a@v1:ctx", REPORT))
+        self.assertIsNotNone(index.lookup("b@v1:ctx", REPORT))
+        self.assertEqual(index.stats()["evictions"], 1)
+        
+        self.assertEqual(index.invalidate_policy("b"), 1)
+        self.assertIsNone(index.lookup("b@v1:ctx", REPORT))
+        self.assertEqual(len(index), 1)
+
+
+class TestClientNormalization(unittest.TestCase):
+    """Tests for normalization and near-duplicate reuse in TavoAIClient."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.received = []
+        
+        def record(input_data):
+            self.received.append(input_data["content"])
+            return {"allow": "secret" not in input_data["content"]}
+        
+        self.server = StubPolicyServer({"guard": StubPolicy(record), "pii": StubPolicy(record)})
+    
+    def client(self, **options):
+        """Return a client served in memory by the stub server."""
+        client = TavoAIClient(transport=InMemoryTransport(self.server), log_level=logging.WARNING, **options)
+        self.addCleanup(client.close)
+        return client
+    
+    def test_normalized_content_shares_cached_verdicts(self):
+        """Variants of one content reach the server once; other policies are untouched."""
+        client = self.client(
+            result_cache=VerdictCache(),
+            normalizers={"guard": ContentNormalizer(slots={"user": r"@\w+"})}
+        )
+        for content in ("Hello  @alice!", "Hello @bob!\n", "hello​ @carol!"):
+            client.evaluate_input(content, "guard")
+        client.evaluate_input("Hello  @alice!", "pii")
+        self.assertEqual(self.received, ["Hello <user>!", "hello <user>!", "Hello  @alice!"])
+        
+        stats = client.stats()
+        self.assertEqual(stats["cache_hits"], 1)
+        self.assertEqual(stats["normalization"], {"guard": {"normalized": 3, "changed": 3, "masked_slots": 3}})
+    
+    def test_near_duplicates_reuse_verdicts(self):
+        """Similar content of a declaring policy reuses the verdict within the same context."""
+        index = NearDuplicateIndex(threshold=0.9)
+        client = self.client(normalizers={"guard": ContentNormalizer(near_duplicates=index)})
+        
+        self.assertFalse(client.evaluate_input(REPORT + " secret", "guard").allowed)
+        edited = REPORT.replace("biggest", "largest") + " secret"
+        self.assertFalse(client.evaluate_input(edited, "guard").allowed)
+        self.assertEqual(len(self.received), 1)
+        
+        # Different metadata, or a policy without an index, is evaluated by the server
+        client.evaluate_input(edited, "guard", metadata={"user_id": "u-1"})
+        client.evaluate_input(REPORT, "pii")
+        client.evaluate_input(REPORT, "pii")
+        self.assertEqual(len(self.received), 4)
+        
+        stats = client.stats()
+        self.assertEqual(stats["near_duplicate_hits"], 1)
+        self.assertEqual(stats["normalization"]["guard"]["near_duplicates"]["hits"], 1)
+        
+        client._on_policy_version("guard", "v2")
+        self.assertEqual(len(index), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""Unit tests for policy version notifications."""
+
+import logging
+import time
+import unittest
+
+from tavoai.sdk import TavoAIClient
+from tavoai.sdk.cache import VerdictCache, verdict_cache_key
+from tavoai.sdk.models import PolicyResult
+from tavoai.sdk.notifications import EVENTS_PATH, parse_sse
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll a condition until it holds or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestParseSSE(unittest.TestCase):
+    """Tests for the server-sent events parser."""
+    
+    def test_events(self):
+        """Fields are collected until a blank line; comments are skipped."""
+        lines = [
+            ": heartbeat",
+            "",
+            "event: policy_version",
+            'data: {"policy": "p",',
+            'data:  "version": "2"}',
+            "id: 7",
+            "",
+            "data: plain",
+            "",
+        ]
+        self.assertEqual(list(parse_sse(iter(lines))), [
+            ("policy_version", '{"policy": "p",\n "version": "2"}'),
+            ("message", "plain"),
+        ])
+    
+    def test_bytes_are_decoded(self):
+        """Undecoded lines are read as UTF-8."""
+        lines = [b"event: policy_version", 'data: {"policy": "caf\u00e9"}'.encode("utf-8"), b""]
+        self.assertEqual(list(parse_sse(iter(lines))), [
+            ("policy_version", '{"policy": "caf\u00e9"}'),
+        ])
+
+
+class TestVersionedCache(unittest.TestCase):
+    """Tests for versioned cache keys and per-policy invalidation."""
+    
+    def test_invalidate_policy(self):
+        """Only the verdicts of the given policy are removed, whatever their version."""
+        cache = VerdictCache()
+        input_data = {"content": "hello"}
+        self.assertNotEqual(verdict_cache_key("p", input_data), verdict_cache_key("p", input_data, "2"))
+        for key in (
+            verdict_cache_key("p", input_data),
+            verdict_cache_key("p", input_data, "2"),
+            verdict_cache_key("p2", input_data),
+        ):
+            cache.put(key, PolicyResult(True))
+        
+        self.assertEqual(cache.invalidate_policy("p"), 2)
+        self.assertEqual(len(cache), 1)
+        self.assertIsNotNone(cache.get(verdict_cache_key("p2", input_data)))
+
+
+class TestPolicyVersionWatching(unittest.TestCase):
+    """Tests for clients watching policy versions."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.server = StubPolicyServer(
+            {"pii": StubPolicy(True), "toxicity": StubPolicy(True)},
+            policy_versions={"pii": "1", "toxicity": "1"},
+            heartbeat_interval=0.05
+        ).start()
+        self.addCleanup(self.server.stop)
+        self.cache = VerdictCache()
+        self.client = TavoAIClient(
+            api_base_url=self.server.url,
+            log_level=logging.WARNING,
+            result_cache=self.cache,
+            watch_policy_versions=True
+        )
+        self.addCleanup(self.client.close)
+        self.client.watcher.initial_backoff = 0.01
+        self.assertTrue(wait_for(lambda: len(self.client.policy_versions) == 2))
+    
+    def test_change_invalidates_and_prewarms(self):
+        """A new version drops only its policy's verdicts and re-evaluates recent inputs."""
+        self.assertTrue(self.client.evaluate_input("hello", "pii").allowed)
+        self.assertTrue(self.client.evaluate_input("hello", "toxicity").allowed)
+        requests_before = self.client.stats()["server_requests"]
+        
+        request_ids = []
+        
+        def deny(input_data):
+            request_ids.append(input_data.get("request_id"))
+            return {"allow": False}
+        
+        self.server.set_policy_version("pii", "2", StubPolicy(deny))
+        self.assertTrue(wait_for(lambda: self.client.stats()["prewarmed"] == 1))
+        self.assertTrue(request_ids[0].startswith("req-prewarm-"))
+        self.assertEqual(self.client.policy_versions["pii"], "2")
+        
+        # Both verdicts come from the cache: pre-warmed for pii, untouched for toxicity
+        self.assertFalse(self.client.evaluate_input("hello", "pii").allowed)
+        self.assertTrue(self.client.evaluate_input("hello", "toxicity").allowed)
+        stats = self.client.stats()
+        self.assertEqual(stats["server_requests"], requests_before + 1)
+        self.assertEqual(stats["policy_versions"]["changes"], 3)
+    
+    def test_reconnects_and_catches_up(self):
+        """Versions changed while disconnected are applied on reconnection."""
+        self.assertTrue(self.client.evaluate_input("hello", "pii").allowed)
+        
+        # Change the version without publishing it, then drop the stream
+        self.server.policies["pii"] = StubPolicy(False)
+        with self.server._subscribers_lock:
+            self.server.policy_versions["pii"] = "2"
+        self.server.disconnect_subscribers()
+        
+        self.assertTrue(wait_for(lambda: self.client.policy_versions["pii"] == "2"))
+        self.assertGreaterEqual(self.client.stats()["policy_versions"]["connections"], 2)
+        self.assertFalse(self.client.evaluate_input("hello", "pii").allowed)
+    
+    def test_stream_uses_client_session(self):
+        """The subscription goes through the session of the client's transport."""
+        self.assertIs(self.client.watcher.session, self.client.http_session)
+        self.assertIsNone(self.client.watcher._session)
+        
+        # Hooks installed on the client's session see the stream on reconnection
+        urls = []
+        self.client.http_session.hooks["response"].append(lambda response, **kwargs: urls.append(response.url))
+        self.server.disconnect_subscribers()
+        self.assertTrue(wait_for(lambda: f"{self.server.url}{EVENTS_PATH}" in urls))
+    
+    def test_close_stops_watching(self):
+        """Closing the client ends its subscription promptly."""
+        self.assertTrue(wait_for(lambda: self.server.subscriber_count == 1))
+        started = time.monotonic()
+        self.client.close()
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertTrue(wait_for(lambda: self.server.subscriber_count == 0))
@@ -0,0 +1,130 @@
+"""Unit tests for tiered verdict pipelines."""
+
+import logging
+import unittest
+
+from tavoai.sdk import TavoAIClient, TavoAIGuardrail, PolicyResult, ContentType, PolicyPipeline, PipelineStage
+from tavoai.sdk.degradation import DegradationMode, DegradationPolicy
+from tavoai.sdk.exceptions import PolicyEvaluationError, StageTimeoutError
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+
+
+def blocklist(content, context):
+    """Local pre-check denying blocked words and deferring everything else."""
+    if "forbidden" in content:
+        return PolicyResult(False, [{"category": "blocklist", "reason": "Blocked word"}])
+    return None
+
+
+class TestPolicyPipeline(unittest.TestCase):
+    """Tests for PolicyPipeline."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.server = StubPolicyServer({
+            "fast": StubPolicy(lambda input_data: {"allow": "short" in input_data["content"]}),
+            "deep": StubPolicy(lambda input_data: {
+                "allow": "risky" not in input_data["content"],
+                "rejection_reasons": [{"category": "risk", "reason": "Risky"}],
+            }),
+            "slow": StubPolicy(True, latency=0.5),
+        }).start()
+        self.addCleanup(self.server.stop)
+        self.client = TavoAIClient(api_base_url=self.server.url, log_level=logging.WARNING)
+        self.addCleanup(self.client.close)
+        self.pipeline = PolicyPipeline([
+            PipelineStage("blocklist", check=blocklist),
+            PipelineStage("fast", policy_name="fast", on_allow="stop", on_deny="continue"),
+            PipelineStage("deep", policy_name="deep"),
+        ])
+    
+    def test_short_circuits(self):
+        """Each tier decides what it can and later tiers only see the rest."""
+        self.assertFalse(self.pipeline.evaluate(self.client, "forbidden", ContentType.INPUT).allowed)
+        self.assertEqual(self.server.evaluation_count, 0)
+        
+        self.assertTrue(self.pipeline.evaluate(self.client, "short", ContentType.INPUT).allowed)
+        self.assertEqual(self.server.evaluation_count, 1)
+        
+        self.assertTrue(self.pipeline.evaluate(self.client, "long but fine", ContentType.INPUT).allowed)
+        result = self.pipeline.evaluate(self.client, "long and risky", ContentType.INPUT)
+        self.assertFalse(result.allowed)
+        self.assertEqual(result.rejection_reasons, [{"category": "risk", "reason": "Risky"}])
+        self.assertEqual(self.server.evaluation_count, 5)
+        
+        stats = self.pipeline.stats()
+        self.assertEqual(stats["runs"], 4)
+        self.assertEqual(stats["stages"]["blocklist"]["hit_rate"], 0.25)
+        self.assertEqual(stats["stages"]["fast"]["decided"], 1)
+        self.assertEqual(stats["stages"]["deep"]["decided"], 2)
+    
+    def test_timeouts_and_budgets(self):
+        """Timed-out and over-budget stages follow their configured actions."""
+        pipeline = PolicyPipeline([
+            PipelineStage("slow", policy_name="slow", timeout=0.05, on_error="deny"),
+        ])
+        result = pipeline.evaluate(self.client, "text", ContentType.INPUT)
+        self.assertFalse(result.allowed)
+        self.assertTrue(result.degraded)
+        self.assertEqual(pipeline.stats()["stages"]["slow"]["errors"], 1)
+        
+        with self.assertRaises(StageTimeoutError):
+            PolicyPipeline([PipelineStage("slow", policy_name="slow", timeout=0.05)]).evaluate(
+                self.client, "text", ContentType.INPUT
+            )
+        
+        # Over budget, stages deny unless configured otherwise
+        budgeted = PolicyPipeline([PipelineStage("deep", policy_name="deep", max_rate=1)])
+        self.assertTrue(budgeted.evaluate(self.client, "fine", ContentType.INPUT).allowed)
+        result = budgeted.evaluate(self.client, "fine", ContentType.INPUT)
+        self.assertFalse(result.allowed)
+        self.assertEqual(result.degraded_mode, "fail_closed")
+        self.assertEqual(budgeted.stats()["stages"]["deep"]["skipped"], 1)
+        
+        skipped = PolicyPipeline([
+            PipelineStage("deep", policy_name="deep", max_rate=1, on_over_budget="continue")
+        ])
+        skipped.evaluate(self.client, "risky", ContentType.INPUT)
+        self.assertTrue(skipped.evaluate(self.client, "risky", ContentType.INPUT).allowed)
+    
+    def test_stage_timeout_keeps_server_healthy(self):
+        """A slow stage degrades its own verdict without putting the client in degraded mode."""
+        client = TavoAIClient(
+            api_base_url=self.server.url,
+            log_level=logging.CRITICAL,
+            default_degradation=DegradationPolicy(DegradationMode.FAIL_CLOSED)
+        )
+        self.addCleanup(client.close)
+        pipeline = PolicyPipeline([PipelineStage("slow", policy_name="slow", timeout=0.05)])
+        
+        result = pipeline.evaluate(client, "text", ContentType.INPUT)
+        self.assertFalse(result.allowed)
+        self.assertTrue(result.degraded)
+        self.assertTrue(client.health.healthy)
+        self.assertTrue(client.evaluate_input("short", "fast").allowed)
+    
+    def test_fractional_rate_budget(self):
+        """Rates below one evaluation per second allow one evaluation per period."""
+        stage = PipelineStage("rare", policy_name="deep", max_rate=0.5)
+        self.assertTrue(stage.within_budget())
+        self.assertFalse(stage.within_budget())
+        stage._refilled_at -= 1.0
+        self.assertFalse(stage.within_budget())
+        stage._refilled_at -= 1.1
+        self.assertTrue(stage.within_budget())
+    
+    def test_guardrail_accepts_pipelines(self):
+        """TavoAIGuardrail evaluates pipelines in place of policy names."""
+        guardrail = TavoAIGuardrail(client=self.client)
+        
+        @guardrail(self.pipeline, "fast")
+        def answer(query):
+            return "short answer"
+        
+        self.assertEqual(answer("short question"), "short answer")
+        with self.assertRaises(PolicyEvaluationError):
+            answer("a forbidden question")
+
+
+if __name__ == '__main__':
+    unittest.main()
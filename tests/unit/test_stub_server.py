@@ -0,0 +1,81 @@
+"""Unit tests for the stub policy server and benchmark harness."""
+
+import logging
+import unittest
+
+from tavoai.sdk import TavoAIClient
+from tavoai.sdk.benchmark import BenchmarkResult, run_benchmark, compare_results
+from tavoai.sdk.exceptions import PolicyEvaluationError, PolicyNotFoundError
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+
+
+class TestStubPolicyServer(unittest.TestCase):
+    """Tests for the stub policy server."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.server = StubPolicyServer({
+            "allow_all": StubPolicy(True),
+            "deny_all": StubPolicy(False, [{"category": "pii", "reason": "Contains PII"}]),
+            "flaky": StubPolicy(True, error_rate=1.0),
+            "echo": StubPolicy(lambda input_data: {"allow": input_data["content"] == "ok"}),
+        }).start()
+        self.addCleanup(self.server.stop)
+        self.client = TavoAIClient(api_base_url=self.server.url, log_level=logging.WARNING)
+        self.addCleanup(self.client.close)
+    
+    def test_verdicts(self):
+        """Configured verdicts are returned through the client."""
+        self.assertTrue(self.client.evaluate_input("hello", "allow_all").allowed)
+        
+        result = self.client.evaluate_output("hello", "deny_all")
+        self.assertFalse(result.allowed)
+        self.assertEqual(result.rejection_reasons[0]["category"], "pii")
+        
+        self.assertTrue(self.client.evaluate_input("ok", "echo").allowed)
+        self.assertFalse(self.client.evaluate_input("not ok", "echo").allowed)
+    
+    def test_errors(self):
+        """Unknown policies and injected errors map to SDK exceptions."""
+        with self.assertRaises(PolicyNotFoundError):
+            self.client.evaluate_input("hello", "unknown")
+        with self.assertRaises(PolicyEvaluationError):
+            self.client.evaluate_input("hello", "flaky")
+    
+    def test_batch_endpoint(self):
+        """The batch endpoint answers every evaluation in order."""
+        status, payload = self.server.handle("POST", "/batch/evaluate", {"evaluations": [
+            {"policy": "allow_all", "input": {}},
+            {"policy": "unknown", "input": {}},
+        ]})
+        self.assertEqual(status, 200)
+        self.assertEqual([r["status"] for r in payload["results"]], [200, 404])
+
+
+class TestBenchmark(unittest.TestCase):
+    """Tests for the benchmark harness."""
+    
+    def test_run_benchmark(self):
+        """All operations are timed and errors are counted."""
+        def operation(i):
+            if i % 10 == 0:
+                raise ValueError(i)
+        
+        result = run_benchmark("noop", operation, concurrency=4, operations=100, warmup=0)
+        self.assertEqual(result.operations, 100)
+        self.assertEqual(result.errors, 10)
+        self.assertGreater(result.throughput, 0)
+        self.assertLessEqual(result.p50_ms, result.p99_ms)
+    
+    def test_compare_results(self):
+        """Throughput drops and tail latency increases are reported."""
+        current = BenchmarkResult("bench", 8, [0.002] * 100, 0, 1.0)
+        baseline = {"bench@8": {"throughput": 200.0, "p99_ms": 1.0}}
+        
+        regressions = compare_results(baseline, [current])
+        self.assertEqual(len(regressions), 2)
+        self.assertEqual(compare_results({"bench@8": current.to_dict()}, [current]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
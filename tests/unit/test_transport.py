@@ -0,0 +1,402 @@
+"""Unit tests for the client transports."""
+
+import asyncio
+import io
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from tavoai.sdk import TavoAIClient, TavoAIGuardrail
+from tavoai.sdk.aio import AsyncTavoAIClient
+from tavoai.sdk.audit import AuditSink
+from tavoai.sdk.degradation import DegradationMode, DegradationPolicy
+from tavoai.sdk.exceptions import (
+    ConcurrencyLimitError,
+    PolicyNotFoundError,
+    ServerConnectionError
+)
+from tavoai.sdk.framing import (
+    HAS_MSGPACK,
+    JSON,
+    MSGPACK,
+    FramedTransport,
+    encode_message,
+    read_message
+)
+from tavoai.sdk.models import PolicyResult
+from tavoai.sdk.stub_server import StubPolicyServer, StubPolicy
+from tavoai.sdk.transport import (
+    HAS_HTTPX,
+    InMemoryTransport,
+    PooledHTTPTransport,
+    RequestsTransport,
+    ThreadedAsyncTransport,
+    UnixHTTPTransport,
+    create_transport
+)
+
+
+def deny_secrets(input_data):
+    """Stub verdict rejecting content that mentions a secret."""
+    return {
+        "allow": "secret" not in input_data["content"],
+        "rejection_reasons": ["secret"]
+    }
+
+
+def evaluate_concurrently(client, threads, requests_per_thread):
+    """Evaluate from several threads at once; return the number of errors."""
+    errors = []
+
+    def worker(slot):
+        for i in range(requests_per_thread):
+            try:
+                client.evaluate_input(f"question {slot}-{i}", "guard")
+            except Exception as e:
+                errors.append(e)
+
+    workers = [threading.Thread(target=worker, args=(slot,)) for slot in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return len(errors)
+
+
+class TestTransportSelection(unittest.TestCase):
+    """Tests for selecting transports by configuration."""
+
+    def test_create_transport(self):
+        """Names select the built-in transports; instances are used as-is."""
+        url = "http://localhost:5000"
+        self.assertIsInstance(create_transport("requests", url), RequestsTransport)
+        self.assertIsInstance(create_transport("http1", url), PooledHTTPTransport)
+        transport = InMemoryTransport(StubPolicyServer())
+        self.assertIs(create_transport(transport, "http://localhost:5000"), transport)
+        with self.assertRaises(ValueError):
+            create_transport("carrier-pigeon", "http://localhost:5000")
+
+    def test_in_memory_transport(self):
+        """The client evaluates against a stub server without opening sockets."""
+        server = StubPolicyServer({"guard": StubPolicy(deny_secrets)})
+        client = TavoAIClient(
+            transport=InMemoryTransport(server), log_level=logging.WARNING
+        )
+        self.addCleanup(client.close)
+
+        self.assertTrue(client.evaluate_input("hello", "guard").allowed)
+        result = client.evaluate_input("a secret", "guard")
+        self.assertFalse(result.allowed)
+        self.assertEqual(result.rejection_reasons, ["secret"])
+        with self.assertRaises(PolicyNotFoundError):
+            client.evaluate_input("hello", "missing")
+        self.assertEqual(server.evaluation_count, 3)
+        self.assertEqual(server.connection_count, 0)
+
+    def test_in_memory_timeout(self):
+        """A stub answering after the timeout raises, and degrades like a timeout."""
+        server = StubPolicyServer(default=StubPolicy(latency=0.1))
+        client = TavoAIClient(
+            transport=InMemoryTransport(server),
+            log_level=logging.CRITICAL,
+            timeout=0.01,
+            default_degradation=DegradationPolicy(DegradationMode.FAIL_CLOSED)
+        )
+        self.addCleanup(client.close)
+        result = client.evaluate_input("hello", "guard")
+        self.assertTrue(result.degraded)
+        self.assertFalse(result.allowed)
+
+
+class TestHTTPTransports(unittest.TestCase):
+    """Tests for the network transports against a running stub server."""
+
+    def test_connection_errors(self):
+        """Unreachable servers raise ServerConnectionError with every transport."""
+        for transport in ("requests", "http1"):
+            with self.subTest(transport=transport):
+                client = TavoAIClient(
+                    api_base_url="http://127.0.0.1:9",
+                    log_level=logging.CRITICAL,
+                    timeout=0.5,
+                    transport=transport
+                )
+                self.addCleanup(client.close)
+                with self.assertRaises(ServerConnectionError):
+                    client.evaluate_input("hello", "guard")
+
+    def test_pooled_transport_bounds_connections(self):
+        """The http1 transport never opens more connections than its pool holds."""
+        with StubPolicyServer(default=StubPolicy(latency=0.01)) as server:
+            client = TavoAIClient(
+                api_base_url=server.url,
+                log_level=logging.WARNING,
+                pool_maxsize=4,
+                transport="http1"
+            )
+            self.addCleanup(client.close)
+            self.assertEqual(evaluate_concurrently(client, 16, 5), 0)
+            self.assertEqual(server.evaluation_count, 80)
+            self.assertLessEqual(server.peak_connections, 4)
+
+    def test_pool_saturation_is_not_a_server_failure(self):
+        """A request finding no free pooled connection in time leaves the server up."""
+        with StubPolicyServer(default=StubPolicy(latency=0.5)) as server:
+            client = TavoAIClient(
+                api_base_url=server.url,
+                log_level=logging.CRITICAL,
+                pool_maxsize=1,
+                transport="http1",
+                default_degradation=DegradationPolicy(DegradationMode.FAIL_CLOSED)
+            )
+            self.addCleanup(client.close)
+            busy = threading.Thread(
+                target=client.evaluate_input, args=("slow", "guard")
+            )
+            busy.start()
+            time.sleep(0.1)
+
+            with self.assertRaises(ConcurrencyLimitError):
+                client.transport.request(
+                    "POST", "/policies/guard/evaluate", {"input": {}}, 0.05
+                )
+            result = client.evaluate_input("hello", "guard", timeout=0.05)
+            busy.join()
+            self.assertTrue(result.degraded)
+            self.assertTrue(client.health.healthy)
+
+    @unittest.skipUnless(HAS_HTTPX, "httpx is not installed")
+    def test_http2_multiplexes_one_connection(self):
+        """Concurrent evaluations over HTTP/2 share a single connection."""
+        with StubPolicyServer(default=StubPolicy(latency=0.01), http2=True) as server:
+            client = TavoAIClient(
+                api_base_url=server.url, log_level=logging.WARNING, transport="http2"
+            )
+            self.addCleanup(client.close)
+            self.assertEqual(evaluate_concurrently(client, 16, 5), 0)
+            self.assertEqual(server.evaluation_count, 80)
+            self.assertEqual(server.connection_count, 1)
+
+
+class TestUnixSocketTransports(unittest.TestCase):
+    """Tests for policy servers on Unix domain sockets."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        directory = tempfile.mkdtemp(prefix="tavoai-test-")
+        self.addCleanup(shutil.rmtree, directory, True)
+        self.socket_path = os.path.join(directory, "policy.sock")
+        self.policies = {"guard": StubPolicy(deny_secrets)}
+
+    def evaluate(self, server, transport):
+        """Check verdicts, missing policies and pooled connections over a transport."""
+        client = TavoAIClient(
+            api_base_url=server.url, log_level=logging.CRITICAL, transport=transport
+        )
+        self.addCleanup(client.close)
+        self.assertTrue(client.evaluate_input("hello", "guard").allowed)
+        result = client.evaluate_input("a secret", "guard")
+        self.assertEqual(result.rejection_reasons, ["secret"])
+        with self.assertRaises(PolicyNotFoundError):
+            client.evaluate_input("hello", "missing")
+        self.assertEqual(server.connection_count, 1)
+        return client
+
+    def test_http_over_unix_socket(self):
+        """A unix:// base URL sends HTTP over the socket with the default transport."""
+        with StubPolicyServer(self.policies, unix_socket=self.socket_path) as server:
+            self.assertEqual(server.url, f"unix://{self.socket_path}")
+            client = self.evaluate(server, "requests")
+            self.assertIsInstance(client.transport, UnixHTTPTransport)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_framed_transport(self):
+        """Framed requests work with either codec and reconnect after a restart."""
+        codecs = [JSON] + ([MSGPACK] if HAS_MSGPACK else [])
+        for codec in codecs:
+            with self.subTest(codec=codec):
+                server = StubPolicyServer(
+                    self.policies, unix_socket=self.socket_path, framed=True
+                )
+                with server:
+                    transport = FramedTransport(self.socket_path, codec=codec)
+                    client = self.evaluate(server, transport)
+
+                # The pooled connection died with the server; the next request
+                # reconnects
+                server = StubPolicyServer(
+                    self.policies, unix_socket=self.socket_path, framed=True
+                )
+                with server:
+                    self.assertTrue(client.evaluate_input("hello", "guard").allowed)
+                    self.assertEqual(server.connection_count, 1)
+
+                with self.assertRaises(ServerConnectionError):
+                    client.evaluate_input("hello", "guard")
+
+    def test_frames(self):
+        """Frames round-trip, and truncated frames are reported as connection errors."""
+        frame = encode_message({"status": 200, "body": {"allow": True}}, JSON)
+        stream = io.BytesIO(frame + frame[:-1])
+        self.assertEqual(
+            read_message(stream), ({"status": 200, "body": {"allow": True}}, JSON)
+        )
+        with self.assertRaises(ConnectionError):
+            read_message(stream)
+        self.assertIsNone(read_message(io.BytesIO()))
+
+    def test_configuration_errors(self):
+        """Transports and features that need TCP reject unix:// URLs, and vice versa."""
+        with self.assertRaises(ValueError):
+            create_transport("framed", "http://localhost:5000")
+        with self.assertRaises(ValueError):
+            create_transport("http2", f"unix://{self.socket_path}")
+        with self.assertRaises(ValueError):
+            TavoAIClient(
+                api_base_url=f"unix://{self.socket_path}", watch_policy_versions=True
+            )
+
+
+class TestAsyncTavoAIClient(unittest.TestCase):
+    """Tests for the asyncio client."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.server = StubPolicyServer(
+            {"guard": StubPolicy(deny_secrets), "pii": StubPolicy(True)}
+        )
+
+    def client(self, **options):
+        """Return an async client served in memory by the stub server."""
+        return AsyncTavoAIClient(
+            transport=ThreadedAsyncTransport(InMemoryTransport(self.server)),
+            log_level=logging.WARNING,
+            **options
+        )
+
+    def test_evaluations(self):
+        """Single, batch and multi-policy evaluations are coroutines, as sync calls."""
+        async def scenario():
+            options = {"adaptive_concurrency": True, "max_concurrency": 4}
+            async with self.client(**options) as client:
+                self.assertTrue((await client.evaluate_input("hello", "guard")).allowed)
+                rejected = await client.evaluate_output(
+                    "a secret", "guard", on_rejection=lambda result: "[redacted]"
+                )
+                self.assertEqual(rejected, "[redacted]")
+
+                contents = [f"question {i}" for i in range(20)] + ["a secret"]
+                batch = await client.evaluate_batch(contents, "guard")
+                self.assertEqual(
+                    [result.allowed for result in batch], [True] * 20 + [False]
+                )
+
+                outcomes = await client.evaluate_policies(
+                    "hello", ["guard", "pii", "missing"], return_exceptions=True
+                )
+                self.assertTrue(outcomes["pii"].allowed)
+                self.assertIsInstance(outcomes["missing"], PolicyNotFoundError)
+
+                stats = client.stats()
+                self.assertEqual(stats["evaluations"], 26)
+                self.assertEqual(stats["errors"], 1)
+                self.assertEqual(stats["concurrency"]["in_flight"], 0)
+
+        asyncio.run(scenario())
+
+    def test_degradation(self):
+        """Connection failures degrade as with the sync client."""
+        async def scenario():
+            client = AsyncTavoAIClient(
+                api_base_url="http://127.0.0.1:9",
+                transport="requests",
+                log_level=logging.CRITICAL,
+                timeout=0.5,
+                default_degradation=DegradationPolicy(DegradationMode.FAIL_OPEN)
+            )
+            try:
+                result = await client.evaluate_input("hello", "guard")
+                self.assertTrue(result.allowed)
+                self.assertTrue(result.degraded)
+            finally:
+                await client.aclose()
+
+        asyncio.run(scenario())
+
+    def test_micro_batching_is_rejected(self):
+        """Micro-batching is thread-based; the async client does not offer it."""
+        with self.assertRaises(ValueError):
+            self.client(micro_batching=True)
+
+    def test_blocking_work_runs_off_the_event_loop(self):
+        """Fallback evaluators and blocking audit sinks leave the event loop running."""
+        fallback_threads = []
+        released = threading.Event()
+
+        def fallback(input_data):
+            fallback_threads.append(threading.current_thread())
+            return PolicyResult(True)
+
+        class StalledWriter:
+            def write(self, records):
+                released.wait(5)
+
+            def close(self):
+                pass
+
+        sink = AuditSink(
+            StalledWriter(),
+            max_queue_size=1,
+            batch_size=1,
+            overflow="block",
+            block_timeout=0.5
+        )
+        self.addCleanup(sink.close)
+        self.addCleanup(released.set)
+
+        async def scenario():
+            client = AsyncTavoAIClient(
+                api_base_url="http://127.0.0.1:9",
+                transport="requests",
+                log_level=logging.CRITICAL,
+                timeout=0.5,
+                default_degradation=DegradationPolicy(
+                    DegradationMode.FALLBACK, fallback=fallback
+                ),
+                audit_sink=sink
+            )
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            ticker = asyncio.ensure_future(tick())
+            try:
+                for _ in range(3):
+                    result = await client.evaluate_input("hello", "guard")
+                    self.assertTrue(result.allowed)
+            finally:
+                ticker.cancel()
+                released.set()
+                await client.aclose()
+            return ticks
+
+        # The third audit record waits for room for block_timeout seconds
+        self.assertGreater(asyncio.run(scenario()), 20)
+        self.assertEqual(len(fallback_threads), 3)
+        self.assertNotIn(threading.main_thread(), fallback_threads)
+
+    def test_synchronous_helpers(self):
+        """TavoAIGuardrail rejects the async client; it has no "requests" session."""
+        client = self.client()
+        self.addCleanup(client.close)
+        with self.assertRaises(TypeError):
+            TavoAIGuardrail(client)
+        self.assertIsNone(client.http_session)